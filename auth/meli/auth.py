@@ -1,76 +1,203 @@
 from auth.security import TokenEncryptor
 from auth.meli.auth_status import MeliAuthStatus, ConnectionRequest, RefreshConnRequest
 from database.client import DataBaseClient
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
 from utils.exceptions import AuthenticationError, DataBaseError, NotHandledError
 import logging
 import asyncio
+import threading
 
 
 class AuthClient(MeliAuthStatus, TokenEncryptor):
     """Handles authentication with Mercado Libre API.
 
+    The decrypted access token is kept in memory together with its expiry, so once a credential has
+    been resolved every call to `_connection` is a constant-time lookup. A background timer refreshes
+    the token `REFRESH_MARGIN` before `THRESHOLD` runs out, so request paths never wait on the token
+    endpoint.
+
     Attributes:
         db (DataBaseClient): Database client for data storage.
+        REFRESH_MARGIN (timedelta): How long before expiry the token is refreshed in the background.
+        RETRY_DELAY (int): Seconds before retrying a failed background refresh.
     """
 
-    def __init__(self, db: DataBaseClient) -> None:
+    REFRESH_MARGIN: timedelta = timedelta(minutes=15)
+    RETRY_DELAY: int = 60
+
+    def __init__(self, db: DataBaseClient, background_refresh: bool = True) -> None:
         """Initializes an AuthClient instance.
 
         Args:
             db (DataBaseClient): Database client for data storage.
+            background_refresh (bool): Whether to refresh the token in the background before it expires.
         """
         self._db = db
+        self._background_refresh = background_refresh
+        self._access_token = None
+        self._expires_at = None
+        self._lock = threading.RLock()
+        self._timer = None
 
     async def start_token_encryptor(self):
         """Starts the token encryption process asynchronously."""
         await self._setup_token()
 
-    def _connection(self) -> dict:
-        """Establishes a connection and handles authentication.
+    @property
+    def expires_at(self) -> datetime or None:
+        """Expiry of the cached access token, or None if no token has been resolved."""
+        return self._expires_at
+
+    def _connection(self) -> str:
+        """Returns a valid access token, resolving or renewing the credential only when needed.
+
+        Returns:
+            str: The decrypted access token.
+        """
+        token, expires_at = self._access_token, self._expires_at
+        if token and datetime.now() < expires_at:
+            return token
+        with self._lock:
+            if self._access_token and datetime.now() < self._expires_at:
+                return self._access_token
+            return self._resolve()
+
+    def close(self) -> None:
+        """Cancels the scheduled background refresh.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _resolve(self) -> str:
+        """Finds the last stored credential and uses, refreshes or replaces it.
 
         Returns:
-            dict: Authentication data.
+            str: The decrypted access token.
         """
         try:
-            asyncio.run(self.start_token_encryptor())
+            if getattr(self, "fernet", None) is None:
+                asyncio.run(self.start_token_encryptor())
             logging.info("Searching credentials...")
             connection = self.credential(db=self._db)
             logging.info("Supervising status...")
-            supervise = self.supervise(db=self._db)
+            supervise = connection is not None and self._valid(connection["date"])
+            logging.info("Supervised.")
+            if connection and supervise:
+                logging.info("Valid credential found. Date: {}" .format(connection["date"]))
+                self._cache(self.decrypt(connection["access_token"]), connection["date"])
+                return self._access_token
+            elif connection and not supervise:
+                logging.warning("Expired token. Date: {}" .format(connection["date"]))
+                data_req = RefreshConnRequest(refresh_token=self.decrypt(connection["refresh_token"]))
+                logging.info("Trying to refresh connection.")
+            else:
+                logging.warning("No credential found.")
+                data_req = ConnectionRequest()
+                logging.info("Connecting.")
+            return self._renew(data_req, self._db)
         except DataBaseError as e:
             raise DataBaseError(e)
         except AuthenticationError as e:
             raise AuthenticationError(e)
         except Exception as e:
             raise NotHandledError(e)
+
+    def _renew(self, data_req, db: DataBaseClient) -> str:
+        """Requests a new credential, stores it encrypted and caches the access token.
+
+        Args:
+            data_req (MeliAuthRequest): The connection or refresh request to send.
+            db (DataBaseClient): Database client the new connection is saved with.
+
+        Returns:
+            str: The decrypted access token.
+        """
+        new_connection = data_req.authenticate()
+        if new_connection:
+            new_connection = self.encrypt_connection_data(new_connection)
+            new_connection.date = datetime.now()
+            logging.info("New valid connection created with date {}." .format(new_connection.date))
+        else:
+            logging.error("Connection failed.")
+            raise AuthenticationError("Connection failed.")
+        db._save(object=new_connection)
+        logging.info("Connection tested.")
+        self._cache(self.decrypt(new_connection.access_token), new_connection.date)
+        return self._access_token
+
+    def _valid(self, date: datetime) -> bool:
+        """Checks whether a credential issued at `date` is still within THRESHOLD.
+
+        Args:
+            date (datetime): Issue date of the credential.
+
+        Returns:
+            bool: True if the credential has not expired.
+        """
+        return datetime.now() < date + timedelta(hours=self.THRESHOLD)
+
+    def _cache(self, access_token: str, date: datetime) -> None:
+        """Keeps the decrypted access token in memory and schedules its refresh.
+
+        Args:
+            access_token (str): The decrypted access token.
+            date (datetime): Issue date of the credential.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._access_token = access_token
+            self._expires_at = date + timedelta(hours=self.THRESHOLD)
+            if self._background_refresh:
+                remaining = (self._expires_at - datetime.now()).total_seconds()
+                delay = remaining - self.REFRESH_MARGIN.total_seconds()
+                self._schedule(max(delay, remaining / 2, 0))
+
+    def _schedule(self, delay: float) -> None:
+        """Schedules the background refresh, replacing any pending one.
+
+        Args:
+            delay (float): Seconds until the refresh.
+
+        Returns:
+            None
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh(self) -> None:
+        """Refreshes the credential in the background.
+
+        Uses its own database session, since the main one belongs to the request path. A failed refresh
+        is retried after RETRY_DELAY while the current token keeps being served until it expires.
+
+        Returns:
+            None
+        """
+        session = Session(bind=self._db._session.get_bind())
+        try:
+            db = DataBaseClient(session=session)
+            connection = self.credential(db=db)
+            if connection is None:
+                data_req = ConnectionRequest()
+            else:
+                data_req = RefreshConnRequest(refresh_token=self.decrypt(connection["refresh_token"]))
+            with self._lock:
+                self._renew(data_req, db)
+            logging.info("Credential refreshed in the background. Expires at {}." .format(self._expires_at))
+        except Exception as e:
+            logging.error("Background credential refresh failed: {}" .format(e))
+            with self._lock:
+                self._schedule(self.RETRY_DELAY)
         finally:
-            try:
-                logging.info("Supervised.")
-                if connection and supervise:
-                    logging.info("Valid credential found. Date: {}" .format(connection["date"]))
-                    return self.decrypt(connection["access_token"])
-                elif connection and not supervise:
-                    logging.warning("Expired token. Date: {}" .format(connection["date"]))
-                    data_req = RefreshConnRequest(refresh_token=self.decrypt(connection["refresh_token"]))
-                    logging.info("Trying to refresh connection.")
-                elif not connection:
-                    logging.warning("No credential found.")
-                    data_req = ConnectionRequest()
-                    logging.info("Connecting.")
-                new_connection = self.encrypt_connection_data(data_req.authenticate())
-                if new_connection:
-                    time = datetime.now()
-                    logging.info("New valid connection created with date {}." .format(time))
-                else:
-                    logging.error("Connection failed.")
-                    raise AuthenticationError("Connection failed.")
-                self._db._save(object=new_connection)
-                logging.info("Connection tested.")
-                return self.decrypt(new_connection.access_token)
-            except DataBaseError as e:
-                raise DataBaseError(e)
-            except AuthenticationError as e:
-                raise AuthenticationError(e)
-            except Exception as e:
-                raise NotHandledError(e)
+            session.close()
@@ -2,11 +2,13 @@ from auth.meli.auth_config import ConnectionConfig, RefreshConfig
 from auth.auth_base import Authentication, AuthStatusBase
 from database.client import DataBaseClient
 from database.models.connection import Connection
+from request.request_moderator import get_moderator
+from request.request_transport import get_transport
 from datetime import datetime, timedelta
+from utils.config import Config
 from utils.exceptions import AuthenticationError, DataBaseError
 from utils.http_request import validate
 from utils.time import _exceeded
-import requests
 
 class MeliAuthStatus(AuthStatusBase):
     """Handles Mercado Libre authentication status.
@@ -41,6 +43,8 @@ class MeliAuthStatus(AuthStatusBase):
     def credential(auth: Authentication, db: DataBaseClient) -> dict:
         """Retrieves authentication credentials.
 
+        Only the most recent connection is read, so the lookup does not depend on the size of the table.
+
         Args:
             auth (Authentication): Authentication object.
             db (DataBaseClient): Database client for data storage.
@@ -49,9 +53,8 @@ class MeliAuthStatus(AuthStatusBase):
             dict | None: Authentication credentials if available, None otherwise.
         """
         try:
-            _all = db._get_all(object=Connection)
-            if len(_all) > 0:
-                _last = db._last(object=Connection)
+            _last = db._last(object=Connection)
+            if _last is not None:
                 return {
                     "date": _last.date,
                     "access_token": _last.access_token,
@@ -78,11 +81,14 @@ class MeliAuthentication(Authentication):
             dict | None: Authentication credentials if available, None otherwise.
         """
         try:
-            req = requests.post(
+            get_moderator().acquire(self.url, self.headers)
+            req = get_transport().post(
                 url=self.url, data=self.data, headers=self.headers)
+            get_moderator().observe(self.url, self.headers, req)
             if validate(req):
-                access_token = req.json().get("access_token", "")
-                refresh_token = req.json().get("refresh_token", "")
+                payload = req.json()
+                access_token = payload.get("access_token", "")
+                refresh_token = payload.get("refresh_token", "")
                 data = Connection(access_token=access_token,
                                   refresh_token=refresh_token)
                 return data
@@ -93,17 +99,22 @@ class MeliAuthentication(Authentication):
 class MeliAuthRequest(MeliAuthentication):
     """Handles Mercado Libre authentication requests.
 
+    The URL and the configuration are read when a request is built, not when the module is imported.
+
     Attributes:
         url (str): URL for authentication.
         headers (dict): Request headers.
     """
 
-    url: str = "https://api.mercadolibre.com/oauth/token"
     headers: dict = {
         "accept": "application/json",
         "content-type": "application/x-www-form-urlencoded"
     }
 
+    def __init__(self) -> None:
+        """Initializes a MeliAuthRequest."""
+        self.url = Config.api_url("/oauth/token")
+
 class ConnectionRequest(MeliAuthRequest):
     """Handles connection requests for authentication.
 
@@ -112,8 +123,15 @@ class ConnectionRequest(MeliAuthRequest):
         data (dict): Request data.
     """
 
-    config: ConnectionConfig = ConnectionConfig()
-    data: dict = config.get_data()
+    def __init__(self) -> None:
+        """Initializes a ConnectionRequest.
+
+        Raises:
+            ConfigError: If an authentication variable is not set.
+        """
+        super().__init__()
+        self.config = ConnectionConfig()
+        self.data = self.config.get_data()
 
 class RefreshConnRequest(MeliAuthRequest):
     """Handles refresh connection requests for authentication.
@@ -123,13 +141,16 @@ class RefreshConnRequest(MeliAuthRequest):
         data (dict): Request data.
     """
 
-    config: RefreshConfig = RefreshConfig()
-    data: dict = config.get_data()
-
     def __init__(self, refresh_token: str) -> None:
         """Initializes a RefreshConnRequest.
 
         Args:
             refresh_token (str): Refresh token for authentication.
+
+        Raises:
+            ConfigError: If an authentication variable is not set.
         """
+        super().__init__()
+        self.config = RefreshConfig()
+        self.data = self.config.get_data()
         self.data["refresh_token"] = refresh_token
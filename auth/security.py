@@ -1,9 +1,12 @@
-from cryptography.fernet import Fernet
+from __future__ import annotations
 from database.models.connection import Connection
 from utils.config import Config
 from utils.exceptions import ConfigError, VariableNotFound
+from utils.lazy import lazy_import
 import asyncio
 
+crypto = lazy_import("cryptography.fernet")
+
 class TokenEncryptor(Config):
     """Class for encrypting and decrypting tokens.
 
@@ -15,7 +18,7 @@ class TokenEncryptor(Config):
     """
 
     key: str
-    fernet: Fernet
+    fernet: crypto.Fernet
 
     async def _setup_token(self) -> None:
         """Set up the encryption key and Fernet cipher.
@@ -31,7 +34,7 @@ class TokenEncryptor(Config):
             await self._set_secret_key()
         finally:
             try:
-                self.fernet = Fernet(self.key)
+                self.fernet = crypto.Fernet(self.key)
             except ValueError:
                 raise ConfigError("SECRET_KEY WITH INVALID FORMAT")
 
@@ -82,6 +85,6 @@ class TokenEncryptor(Config):
         Returns:
             None
         """
-        key = Fernet.generate_key()
+        key = crypto.Fernet.generate_key()
         encoded_key = key.decode()
         await self._append_encoded_key(encoded_key)
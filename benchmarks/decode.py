@@ -0,0 +1,127 @@
+"""Benchmark JSON decoding of large search and attributes payloads.
+
+Compares the standard library decoder with the decoder selected by `utils.json_decoder`, decoding a body
+twice against decoding it once through ParsedResponse, and the typed search decoding.
+
+Usage:
+    python -m benchmarks.decode --pages 200 --attributes 40
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+
+def search_page(results: int, attributes: int, seed: int = 0) -> bytes:
+    """Generate the raw body of a search page.
+
+    Args:
+        results (int): Results in the page.
+        attributes (int): Attributes per result.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        bytes: The JSON body.
+    """
+    rnd = random.Random(seed)
+    return json.dumps({
+        "site_id": "MLA",
+        "paging": {"total": 1000, "primary_results": 1000, "offset": 0, "limit": results},
+        "results": [{
+            "id": "MLA{}".format(1000000000 + number),
+            "title": "Item {}".format(number),
+            "condition": rnd.choice(["new", "used"]),
+            "thumbnail_id": "{}-MLA{}_0000".format(rnd.randint(600000, 999999), number),
+            "price": rnd.randint(1000, 900000),
+            "permalink": "https://articulo.mercadolibre.com.ar/MLA-{}".format(number),
+            "seller": {"id": rnd.randint(1, 10 ** 8), "nickname": "SELLER{}".format(rnd.randint(1, 999))},
+            "attributes": [{
+                "id": "ATTR_{}".format(name),
+                "name": "Attribute {}".format(name),
+                "value_id": str(rnd.randint(1, 50)),
+                "value_name": "Value {}".format(rnd.randint(1, 50)),
+                "values": [{"id": str(name), "name": "Value {}".format(name), "struct": None}]
+            } for name in rnd.sample(range(200), attributes)]
+        } for number in range(results)]
+    }).encode()
+
+
+def attributes_payload(filters: int, values: int) -> bytes:
+    """Generate the raw body of a category attributes response.
+
+    Args:
+        filters (int): Filters of the category.
+        values (int): Options per filter.
+
+    Returns:
+        bytes: The JSON body.
+    """
+    return json.dumps([{
+        "id": "ATTR_{}".format(number),
+        "name": "Attribute {}".format(number),
+        "tags": {"catalog_required": True},
+        "values": [{"id": str(value), "name": "Value {}".format(value)} for value in range(values)]
+    } for number in range(filters)]).encode()
+
+
+def measure(label: str, function, bodies: list, baseline: float = None) -> float:
+    """Time a decoding function over every body and print the result.
+
+    Args:
+        label (str): Name of the measurement.
+        function: Callable applied to each body.
+        bodies (list): The raw bodies.
+        baseline (float, optional): Seconds of the reference measurement.
+
+    Returns:
+        float: Seconds taken.
+    """
+    started = time.perf_counter()
+    for body in bodies:
+        function(body)
+    elapsed = time.perf_counter() - started
+    size = sum(len(body) for body in bodies) / 1024 / 1024
+    speedup = "  x{:.1f}".format(baseline / elapsed) if baseline else ""
+    print("  {:<34} {:>8.3f}s  {:>7.1f} MB/s{}".format(label, elapsed, size / elapsed, speedup))
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200, help="Search pages to decode.")
+    parser.add_argument("--attributes", type=int, default=40, help="Attributes per result.")
+    parser.add_argument("--filters", type=int, default=60, help="Filters of the attributes payload.")
+    parser.add_argument("--values", type=int, default=200, help="Options per filter.")
+    args = parser.parse_args()
+
+    from request.meli.search_types import decode_search
+    from request.request_async import AsyncResponse
+    from utils.json_decoder import DECODER, loads
+
+    def parse_twice(body: bytes) -> None:
+        json.loads(body)
+        json.loads(body)
+
+    def parse_once(body: bytes) -> None:
+        response = AsyncResponse(status_code=200, headers={}, content=body, url="")
+        response.json()
+        response.json()
+
+    pages = [search_page(50, args.attributes, seed) for seed in range(args.pages)]
+    attributes = [attributes_payload(args.filters, args.values)] * max(1, args.pages // 10)
+    print("Decoder: {}".format(DECODER))
+    print("Search pages: {} x {:.0f} KB".format(len(pages), len(pages[0]) / 1024))
+    reference = measure("json.loads", json.loads, pages)
+    measure("{}".format(DECODER), loads, pages, reference)
+    measure("typed search structs", decode_search, pages, reference)
+    twice = measure("json.loads twice per body", parse_twice, pages)
+    measure("ParsedResponse, json() twice", parse_once, pages, twice)
+    print("Attributes payloads: {} x {:.0f} KB".format(len(attributes), len(attributes[0]) / 1024))
+    reference = measure("json.loads", json.loads, attributes)
+    measure("{}".format(DECODER), loads, attributes, reference)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Benchmark the whole ETL through MeliClient against a local mock of the MercadoLibre API.
+
+The mock server runs in its own process so its work does not count towards the client's time or memory.
+The client authenticates, resolves the category and filters of every job, and runs the jobs as a batch.
+The report gives items/sec, requests/sec, the wall time of each stage and the peak RSS.
+
+Results can be saved as a baseline, and later runs compared against it. The run fails when items/sec
+drops by more than the tolerance.
+
+Usage:
+    python -m benchmarks.etl --jobs 8 --total 1000 --latency 20
+    python -m benchmarks.etl --save-baseline benchmarks/baselines/etl.json
+    python -m benchmarks.etl --baseline benchmarks/baselines/etl.json --tolerance 0.1
+
+Use a dedicated database: a fresh SQLite file is created when --url is omitted.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.mock_api import add_arguments, serve, settings_from
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process, in megabytes.
+
+    Returns:
+        float: The peak RSS, or 0 where the `resource` module is not available.
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def compare(result: dict, path: str, tolerance: float) -> bool:
+    """Compare a result with a saved baseline and print the differences.
+
+    Args:
+        result (dict): The result of this run.
+        path (str): Path of the baseline file.
+        tolerance (float): Allowed relative drop of items/sec.
+
+    Returns:
+        bool: True if items/sec did not regress beyond the tolerance.
+    """
+    with open(path) as file:
+        baseline = json.load(file)
+    print("\nCompared with baseline {}:".format(path))
+    for key in ("items_per_second", "requests_per_second", "peak_rss_mb"):
+        before, after = baseline.get(key), result[key]
+        if before:
+            print("  {:<20} {:>10.1f} -> {:>10.1f}  ({:+.1%})".format(key, before, after, after / before - 1))
+    before = baseline.get("items_per_second") or 0
+    return result["items_per_second"] >= before * (1 - tolerance)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Database URL to load into. A temporary SQLite file by default.")
+    parser.add_argument("--jobs", type=int, default=4, help="Number of search jobs.")
+    parser.add_argument("--workers", type=int, default=2, help="Jobs run at the same time.")
+    parser.add_argument("--max-workers", type=int, default=4, help="Pages fetched at the same time per job.")
+    parser.add_argument("--rate", type=float, help="Requests/sec allowed by the request moderator. Client default if omitted.")
+    parser.add_argument("--save-baseline", help="Write the result to this file.")
+    parser.add_argument("--baseline", help="Compare the result with this file.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed relative drop of items/sec.")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(0, settings_from(args), ready), daemon=True)
+    server.start()
+    workdir = tempfile.mkdtemp(prefix="meli_bench_")
+    try:
+        from cryptography.fernet import Fernet
+        os.environ["MELI_API_URL"] = ready.get(timeout=10)
+        os.environ["DATABASE_URL"] = args.url or "sqlite:///{}".format(os.path.join(workdir, "bench.db"))
+        os.environ["SECRET_KEY"] = os.environ.get("SECRET_KEY") or Fernet.generate_key().decode()
+        for name in ("CLIENT_ID", "CLIENT_SECRET", "CODE", "REDIRECT_URI"):
+            os.environ[name] = "bench"
+
+        from database.db import Base, engine
+        from database.models import (category_attributes, category_prediction, connection, delta, item,
+                                     request)
+        from etl.etl_client import MeliClient
+        from request.meli.request_settings import Credential
+        from request.request_moderator import Moderator, set_moderator
+        from request.request_transport import get_transport
+        from sqlalchemy.orm import sessionmaker
+
+        Base.metadata.create_all(engine)
+        if args.rate:
+            set_moderator(Moderator(rate=args.rate, max_rate=args.rate))
+        keywords = ["bench item {}".format(number) for number in range(args.jobs)]
+        jobs_path = os.path.join(workdir, "jobs.jsonl")
+        with open(jobs_path, "w") as file:
+            for keyword in keywords:
+                file.write(json.dumps({"keyword": keyword}) + "\n")
+
+        stages = {}
+        started = time.perf_counter()
+        meli = MeliClient(session=sessionmaker(engine)(), max_workers=args.max_workers)
+
+        stage = time.perf_counter()
+        access_token = meli._auth._connection()
+        stages["auth"] = time.perf_counter() - stage
+
+        stage = time.perf_counter()
+        credential = Credential(access_token).generate()
+        for keyword in keywords:
+            category = meli.request_client.category_cache.predict(keyword, credential)
+            meli.request_client.attributes_cache.get(category[0]["category_id"], credential)
+        stages["discovery"] = time.perf_counter() - stage
+
+        stage = time.perf_counter()
+        results = meli.run_batch(jobs_path, workers=args.workers)
+        stages["batch"] = time.perf_counter() - stage
+        stages["search (sum over jobs)"] = sum(result["search_time"] for result in results)
+        stages["load (sum over jobs)"] = sum(result["load_time"] for result in results)
+        elapsed = time.perf_counter() - started
+        meli._auth.close()
+    finally:
+        server.terminate()
+        server.join()
+
+    items = sum(result["rows"] for result in results)
+    requests_sent = get_transport().stats()["requests"]
+    result = {
+        "jobs": args.jobs,
+        "failed_jobs": sum(1 for result in results if result["status"] == "failed"),
+        "items": items,
+        "requests": requests_sent,
+        "seconds": elapsed,
+        "items_per_second": items / elapsed,
+        "requests_per_second": requests_sent / elapsed,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stages
+    }
+    print("\n{:>8} items  {:>6} requests  {:>7.2f}s".format(items, requests_sent, elapsed))
+    print("{:>8.0f} items/sec  {:>6.1f} requests/sec  peak RSS {:.1f} MB".format(
+        result["items_per_second"], result["requests_per_second"], result["peak_rss_mb"]))
+    for name, seconds in stages.items():
+        print("  {:<24} {:>7.2f}s".format(name, seconds))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w") as file:
+            json.dump(result, file, indent=2)
+        print("\nBaseline saved to {}".format(args.save_baseline))
+    if result["failed_jobs"]:
+        return 1
+    if args.baseline and not compare(result, args.baseline, args.tolerance):
+        print("Regression: items/sec dropped more than {:.0%}.".format(args.tolerance))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
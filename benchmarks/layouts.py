@@ -0,0 +1,67 @@
+"""Benchmark the memory and build time of the Transformer attribute layouts.
+
+Usage:
+    python -m benchmarks.layouts --items 50000 --attributes 20
+"""
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.decode import search_page
+
+PAGE_SIZE = 50
+
+
+def pages(items: int, attributes: int) -> list:
+    """Decoded search pages with unique item IDs.
+
+    Args:
+        items (int): Number of items.
+        attributes (int): Attributes per item.
+
+    Returns:
+        list: The decoded pages.
+    """
+    bodies = [search_page(PAGE_SIZE, attributes, seed) for seed in range(16)]
+    decoded = []
+    for number in range(items // PAGE_SIZE):
+        page = json.loads(bodies[number % len(bodies)])
+        for result in page["results"]:
+            result["id"] = "{}-{}".format(result["id"], number)
+        decoded.append(page)
+    return decoded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50000, help="Number of items.")
+    parser.add_argument("--attributes", type=int, default=20, help="Attributes per item.")
+    args = parser.parse_args()
+
+    from etl.transform import Transformer
+
+    decoded = pages(args.items, args.attributes)
+    print("{} items, {} attributes each".format(len(decoded) * PAGE_SIZE, args.attributes))
+    reference = None
+    for layout in Transformer.LAYOUTS:
+        started = time.perf_counter()
+        transformer = Transformer(layout=layout)
+        for page in decoded:
+            transformer.feed(page)
+        frame = transformer.df
+        build = time.perf_counter() - started
+        memory = frame.memory_usage(deep=True).sum()
+        if layout == "long":
+            memory += transformer.items.memory_usage(deep=True).sum()
+        started = time.perf_counter()
+        wide = transformer.to_wide()
+        pivot = time.perf_counter() - started
+        reference = reference if reference is not None else memory
+        print("  {:<7} build {:>6.2f}s  {:>8.1f} MB ({:>4.1f}x smaller)  to_wide {:>6.2f}s  -> {} x {}".format(
+            layout, build, memory / 1024 / 1024, reference / memory, pivot, *wide.shape))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""Local stand-in for the MercadoLibre API endpoints used by the client.
+
+Serves `/oauth/token`, `/sites/MLA/domain_discovery/search`, `/categories/{id}/attributes` and
+`/sites/MLA/search` with generated, deterministic payloads. Latency and error rates can be injected to
+exercise the request moderator and the pagination under adverse conditions.
+
+Searches honour `ATTR_<n>=<value>[,<value>...]` filters. Every item takes one value of each filter, with a
+skewed (Zipf) distribution, and `available_filters` reports the count of each value among the matches,
+so the shard planner can be exercised against searches larger than the offset cap.
+
+Usage:
+    python -m benchmarks.mock_api --port 8765 --total 1000 --latency 50 --error-rate 0.01
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class MockSettings:
+    """Payload and fault settings of the mock server.
+
+    Attributes:
+        total (int): Items reported by every unfiltered search.
+        attributes (int): Attributes per item.
+        vocabulary (int): Distinct attribute names items draw from.
+        filters (int): Filters returned for a category, each with `values` options.
+        values (int): Options per filter.
+        padding (int): Extra bytes of description per item, to tune the payload size.
+        latency (float): Mean latency added to every response, in milliseconds.
+        jitter (float): Maximum random latency added on top of `latency`, in milliseconds.
+        error_rate (float): Fraction of responses replaced by a 429 or 503 error.
+        seed (int): Seed of the fault injection.
+    """
+
+    def __init__(self, total: int = 1000, attributes: int = 15, vocabulary: int = 80, filters: int = 20,
+                 values: int = 30, padding: int = 200, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0) -> None:
+        self.total = total
+        self.attributes = attributes
+        self.vocabulary = vocabulary
+        self.filters = filters
+        self.values = values
+        self.padding = padding
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.seed = seed
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Request handler of the mock server. Settings are read from `server.settings`."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        segments = [segment for segment in url.path.split("/") if segment]
+        if segments[:3] == ["sites", "MLA", "search"]:
+            self._reply(self._search(query))
+        elif segments[:3] == ["sites", "MLA", "domain_discovery"]:
+            self._reply(self._domain_discovery(query.get("q", "")))
+        elif len(segments) == 3 and segments[0] == "categories" and segments[2] == "attributes":
+            self._reply(self._attributes(segments[1]), conditional=True)
+        else:
+            self._reply({"message": "not found"}, status=404)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        if urlparse(self.path).path.rstrip("/") == "/oauth/token":
+            token = hashlib.sha256(str(time.time()).encode()).hexdigest()
+            self._reply({"access_token": "APP_USR-" + token, "token_type": "Bearer", "expires_in": 21600,
+                         "refresh_token": "TG-" + token[::-1]})
+        else:
+            self._reply({"message": "not found"}, status=404)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _reply(self, payload, status: int = 200, conditional: bool = False) -> None:
+        """Send a JSON payload after the configured latency, or an injected error."""
+        settings = self.server.settings
+        delay = settings.latency + self.server.random(settings.jitter)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        headers = {"Content-Type": "application/json"}
+        if status == 200 and settings.error_rate and self.server.random(1.0) < settings.error_rate:
+            status = 429 if self.server.random(1.0) < 0.5 else 503
+            payload = {"message": "injected error", "status": status}
+            headers["Retry-After"] = "0"
+        body = json.dumps(payload).encode()
+        if status == 200 and conditional:
+            headers["ETag"] = '"{}"'.format(hashlib.md5(body).hexdigest())
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                status, body = 304, b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _search(self, query: dict) -> dict:
+        settings = self.server.settings
+        offset = int(query.get("offset", 0))
+        limit = min(int(query.get("limit", 50)), 50)
+        keyword = query.get("q", "")
+        base = zlib.crc32(keyword.encode()) % 100000 * 100000
+        applied = {key: value.split(",") for key, value in query.items() if key.startswith("ATTR_")}
+        matches = self.server.matches(applied)
+        results = [self._item(base + index, keyword) for index in matches[offset:offset + limit]]
+        return {
+            "site_id": "MLA",
+            "query": keyword,
+            "paging": {"total": len(matches), "primary_results": len(matches), "offset": offset,
+                       "limit": limit},
+            "results": results,
+            "filters": [{"id": key, "values": [{"id": value} for value in values]}
+                        for key, values in applied.items()],
+            "available_filters": self.server.available_filters(applied)
+        }
+
+    def _item(self, number: int, keyword: str) -> dict:
+        settings = self.server.settings
+        rnd = random.Random(number)
+        names = rnd.sample(range(settings.vocabulary), min(settings.attributes, settings.vocabulary))
+        return {
+            "id": "MLA{}".format(1000000000 + number),
+            "title": "{} {}".format(keyword, number).strip(),
+            "condition": rnd.choice(["new", "used"]),
+            "thumbnail_id": "{}-MLA{}_0000".format(rnd.randint(600000, 999999), number),
+            "price": rnd.randint(1000, 900000),
+            "currency_id": "ARS",
+            "permalink": "https://articulo.mercadolibre.com.ar/MLA-{}".format(number),
+            "seller": {"id": rnd.randint(1, 10 ** 8), "nickname": "SELLER{}".format(rnd.randint(1, 999))},
+            "description": "x" * settings.padding,
+            "attributes": [{
+                "id": "ATTR_{}".format(name),
+                "name": "Attribute {}".format(name),
+                "value_id": str(rnd.randint(1, settings.values)),
+                "value_name": "Value {}".format(rnd.randint(1, settings.values))
+            } for name in names]
+        }
+
+    def _domain_discovery(self, keyword: str) -> list:
+        number = zlib.crc32(keyword.encode()) % 1000
+        return [{
+            "domain_id": "MLA-DOMAIN_{}".format(number),
+            "domain_name": "Domain {}".format(number),
+            "category_id": "MLA{}".format(1000 + number),
+            "category_name": "Category {}".format(number),
+            "attributes": []
+        }]
+
+    def _attributes(self, category_id: str) -> list:
+        return [self._filter(number) for number in range(self.server.settings.filters)]
+
+    def _filter(self, number: int) -> dict:
+        return {
+            "id": "ATTR_{}".format(number),
+            "name": "Attribute {}".format(number),
+            "type": "string",
+            "tags": {},
+            "values": [{"id": str(value), "name": "Value {}".format(value), "results": 100 - value}
+                       for value in range(1, self.server.settings.values + 1)]
+        }
+
+
+class MockServer(ThreadingHTTPServer):
+    """Threaded HTTP server with the mock settings and a shared, lock-protected random generator."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, settings: MockSettings) -> None:
+        super().__init__(address, MockHandler)
+        self.settings = settings
+        self._random = random.Random(settings.seed)
+        self._lock = threading.Lock()
+        self._cumulative = []
+        self._matches = {}
+        self._available = {}
+
+    @property
+    def url(self) -> str:
+        return "http://{}:{}".format(*self.server_address[:2])
+
+    def random(self, scale: float) -> float:
+        with self._lock:
+            return self._random.random() * scale
+
+    def value(self, index: int, number: int) -> int:
+        """The value item `index` takes for filter `number`, drawn from a Zipf distribution."""
+        settings = self.settings
+        if len(self._cumulative) != settings.values:
+            weights = [1 / value for value in range(1, settings.values + 1)]
+            total = sum(weights)
+            self._cumulative = [sum(weights[:value + 1]) / total for value in range(settings.values)]
+        return min(bisect.bisect(self._cumulative, zlib.crc32(b"%d:%d" % (index, number)) / 4294967296),
+                   settings.values - 1) + 1
+
+    def matches(self, applied: dict) -> list or range:
+        """Indices of the items matching the applied filters, each filter holding a list of values."""
+        if not applied:
+            return range(self.settings.total)
+        key = (self.settings.total, self.settings.values, tuple(sorted((k, tuple(v)) for k, v in applied.items())))
+        with self._lock:
+            cached = self._matches.get(key)
+        if cached is None:
+            wanted = [(int(name[5:]), {int(value) for value in values}) for name, values in applied.items()]
+            cached = [index for index in range(self.settings.total)
+                      if all(self.value(index, number) in values for number, values in wanted)]
+            with self._lock:
+                self._matches[key] = cached
+        return cached
+
+    def available_filters(self, applied: dict) -> list:
+        """The first filters not applied yet, with the count of each value among the matches."""
+        key = (self.settings.total, self.settings.values, tuple(sorted((k, tuple(v)) for k, v in applied.items())))
+        with self._lock:
+            cached = self._available.get(key)
+        if cached is not None:
+            return cached
+        matches = self.matches(applied)
+        available = []
+        for number in range(min(self.settings.filters, 5 + len(applied))):
+            if "ATTR_{}".format(number) in applied:
+                continue
+            counts = [0] * self.settings.values
+            for index in matches:
+                counts[self.value(index, number) - 1] += 1
+            available.append({
+                "id": "ATTR_{}".format(number),
+                "name": "Attribute {}".format(number),
+                "type": "STRING",
+                "values": [{"id": str(value), "name": "Value {}".format(value), "results": count}
+                           for value, count in enumerate(counts, 1) if count]
+            })
+        with self._lock:
+            self._available[key] = available
+        return available
+
+
+def serve(port: int, settings: MockSettings, ready=None) -> None:
+    """Run a mock server until interrupted.
+
+    Args:
+        port (int): Port to listen on, 0 for any free port.
+        settings (MockSettings): Payload and fault settings.
+        ready (multiprocessing.Queue, optional): Queue the server URL is put on once listening.
+    """
+    server = MockServer(("127.0.0.1", port), settings)
+    if ready is not None:
+        ready.put(server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the mock server settings to a command line parser."""
+    defaults = MockSettings()
+    parser.add_argument("--total", type=int, default=defaults.total, help="Items reported by every search.")
+    parser.add_argument("--attributes", type=int, default=defaults.attributes, help="Attributes per item.")
+    parser.add_argument("--vocabulary", type=int, default=defaults.vocabulary, help="Distinct attribute names.")
+    parser.add_argument("--filters", type=int, default=defaults.filters, help="Filters per category.")
+    parser.add_argument("--values", type=int, default=defaults.values, help="Options per filter.")
+    parser.add_argument("--padding", type=int, default=defaults.padding, help="Extra bytes per item.")
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="Latency per response, in ms.")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter, help="Random extra latency, in ms.")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Fraction of 429/503 replies.")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Seed of the fault injection.")
+
+
+def settings_from(args: argparse.Namespace) -> MockSettings:
+    """Build the mock settings from parsed command line arguments."""
+    return MockSettings(total=args.total, attributes=args.attributes, vocabulary=args.vocabulary,
+                        filters=args.filters, values=args.values, padding=args.padding, latency=args.latency,
+                        jitter=args.jitter, error_rate=args.error_rate, seed=args.seed)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    add_arguments(parser)
+    args = parser.parse_args()
+    print("Serving the mock MercadoLibre API on http://127.0.0.1:{}".format(args.port))
+    serve(args.port, settings_from(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
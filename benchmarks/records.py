@@ -0,0 +1,82 @@
+"""Benchmark the memory per item of decoded search results against compact ItemRecords.
+
+Usage:
+    python -m benchmarks.records --items 100000
+    python -m benchmarks.records --items 1000000 --attributes 30
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from benchmarks.decode import search_page
+
+PAGE_SIZE = 50
+
+
+def hold(items: int, attributes: int, build) -> tuple:
+    """Decode search pages and keep what `build` makes of each one, measuring the memory held.
+
+    Args:
+        items (int): Number of items.
+        attributes (int): Attributes per item.
+        build: Callable turning a decoded page into the objects kept.
+
+    Returns:
+        tuple: The objects kept, the bytes they hold and the seconds taken.
+    """
+    from utils.json_decoder import loads
+    bodies = [search_page(PAGE_SIZE, attributes, seed) for seed in range(16)]
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    kept = []
+    for page in range(items // PAGE_SIZE):
+        kept.extend(build(loads(bodies[page % len(bodies)]), page))
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return kept, held, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000, help="Number of items held in memory.")
+    parser.add_argument("--attributes", type=int, default=20, help="Attributes per item.")
+    args = parser.parse_args()
+
+    from etl.records import ItemRecord
+    from etl.transform import Transformer
+
+    def as_dicts(page: dict, number: int) -> list:
+        for result in page["results"]:
+            result["id"] = "{}-{}".format(result["id"], number)
+        return page["results"]
+
+    def as_records(page: dict, number: int) -> list:
+        return [ItemRecord.from_result(dict(result, id="{}-{}".format(result["id"], number)))
+                for result in page["results"]]
+
+    print("{} items, {} attributes each".format(args.items, args.attributes))
+    dicts, dict_bytes, dict_seconds = hold(args.items, args.attributes, as_dicts)
+    print("  {:<16} {:>8.0f} bytes/item  {:>8.1f} MB  {:>6.2f}s".format(
+        "dicts", dict_bytes / args.items, dict_bytes / 1024 / 1024, dict_seconds))
+    del dicts
+    records, record_bytes, record_seconds = hold(args.items, args.attributes, as_records)
+    print("  {:<16} {:>8.0f} bytes/item  {:>8.1f} MB  {:>6.2f}s  ({:.1f}x smaller)".format(
+        "ItemRecords", record_bytes / args.items, record_bytes / 1024 / 1024, record_seconds,
+        dict_bytes / record_bytes))
+
+    started = time.perf_counter()
+    transformer = Transformer()
+    transformer.feed(records)
+    frame = transformer.df
+    print("  Transformer from records: {} rows x {} columns in {:.2f}s".format(
+        len(frame), len(frame.columns), time.perf_counter() - started))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
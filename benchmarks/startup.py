@@ -0,0 +1,78 @@
+"""Check the import-time budget of the CLI with `python -X importtime`.
+
+Imports the entry module in a fresh interpreter, reports the slowest imports, and fails when the cumulative
+import time is over budget or when a module that should only load on first use (pandas, pyarrow, aiohttp,
+...) is imported at startup. The best of several runs is kept, to smooth out a cold disk cache.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget 600 --runs 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+DEFERRED = ("pandas", "numpy", "pyarrow", "aiohttp", "cryptography", "requests")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str) -> list:
+    """Import a module in a fresh interpreter and parse its `-X importtime` report.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        list: (cumulative microseconds, depth, module name) of every import, in report order.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", "import {}".format(module)],
+                             cwd=ROOT, capture_output=True, text=True)
+    if process.returncode:
+        raise RuntimeError("Importing {} failed:\n{}".format(module, process.stderr[-2000:]))
+    rows = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        stripped = name.lstrip()
+        rows.append((int(cumulative), (len(name) - len(stripped) - 1) // 2, stripped.rstrip()))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main", help="Entry module to import.")
+    parser.add_argument("--budget", type=float, default=800, help="Maximum cumulative import time, in ms.")
+    parser.add_argument("--runs", type=int, default=3, help="Imports measured; the fastest one is kept.")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports listed.")
+    args = parser.parse_args()
+
+    best = None
+    for _ in range(args.runs):
+        rows = import_times(args.module)
+        total = sum(cumulative for cumulative, depth, _ in rows if depth == 0)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+    print("import {}: {:.0f} ms (budget {:.0f} ms)".format(args.module, total / 1000, args.budget))
+    for cumulative, depth, name in sorted((row for row in rows if row[1] <= 2), reverse=True)[:args.top]:
+        print("  {:>8.1f} ms  {}{}".format(cumulative / 1000, "  " * depth, name))
+
+    imported = {name for _, _, name in rows}
+    eager = [name for name in DEFERRED if name in imported]
+    failed = False
+    if eager:
+        print("FAIL: imported at startup, expected on first use: {}".format(", ".join(eager)))
+        failed = True
+    if total / 1000 > args.budget:
+        print("FAIL: import time over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Benchmark the serial Transformer against the ParallelTransformer on generated search pages.
+
+Pages are handed to the parallel transformer as raw bodies, as `RequestClient.search_pages(raw=True)`
+yields them, and the merged DataFrame is checked against the serial one, dtypes included. The exit status
+is 1 if any differs.
+
+Usage:
+    python -m benchmarks.transform --items 100000 --workers 1 2 4 8 16
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.decode import search_page
+
+PAGE_SIZE = 50
+
+
+def bodies(items: int, attributes: int) -> list:
+    """Raw search pages with unique item IDs.
+
+    Items of the first page also carry an attribute without value, whose column is all missing and
+    must come out as float64 from both transformers.
+
+    Args:
+        items (int): Number of items.
+        attributes (int): Attributes per item.
+
+    Returns:
+        list: The raw bodies, as bytes.
+    """
+    import json
+    pages = []
+    for number in range(items // PAGE_SIZE):
+        page = json.loads(search_page(PAGE_SIZE, attributes, number % 64))
+        for result in page["results"]:
+            result["id"] = "{}-{}".format(result["id"], number)
+            if not number:
+                result["attributes"].append({"id": "UNSET", "name": "Unset", "value_id": None, "value_name": None})
+        pages.append(json.dumps(page).encode())
+    return pages
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000, help="Number of items.")
+    parser.add_argument("--attributes", type=int, default=20, help="Attributes per item.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to run.")
+    parser.add_argument("--pages-per-task", type=int, default=20, help="Pages sent to a worker at a time.")
+    args = parser.parse_args()
+
+    import pandas as pd
+    from etl.parallel import ParallelTransformer
+    from etl.transform import Transformer
+    from utils.json_decoder import loads
+
+    raw = bodies(args.items, args.attributes)
+    print("{} items, {} attributes each".format(len(raw) * PAGE_SIZE, args.attributes))
+    started = time.perf_counter()
+    transformer = Transformer()
+    for body in raw:
+        transformer.feed(loads(body))
+    serial = transformer.df
+    reference = time.perf_counter() - started
+    print("  {:<12} {:>6.2f}s  {:>9.0f} items/s".format("serial", reference, len(serial) / reference))
+    failed = False
+    for workers in args.workers:
+        started = time.perf_counter()
+        frame = ParallelTransformer(workers=workers, pages_per_task=args.pages_per_task).transform(iter(raw))
+        elapsed = time.perf_counter() - started
+        try:
+            pd.testing.assert_frame_equal(frame, serial)
+            same = True
+        except AssertionError:
+            same = False
+            failed = True
+        print("  {:<12} {:>6.2f}s  {:>9.0f} items/s  {:>4.1f}x  {}".format(
+            "{} workers".format(workers), elapsed, len(frame) / elapsed, reference / elapsed,
+            "same frame" if same else "FRAME DIFFERS"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
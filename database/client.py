@@ -1,4 +1,5 @@
-from sqlalchemy import func
+from contextlib import contextmanager
+from sqlalchemy import and_, bindparam, func, insert, select, tuple_, update
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import NoResultFound
 from utils.exceptions import DataBaseError
@@ -8,6 +9,7 @@ class DataBaseClient:
     """Database client for managing database interactions.
 
     This class is responsible for interacting with the database, including saving, querying, and committing transactions.
+    Reads never commit. Writes commit once per call, or once for the whole block when made inside `unit_of_work`.
 
     Attributes:
         session (Session): The SQLAlchemy session used for database operations.
@@ -20,6 +22,104 @@ class DataBaseClient:
             session (Session): The SQLAlchemy session to use for database operations.
         """
         self._session = session
+        self._units = []
+
+    @contextmanager
+    def unit_of_work(self):
+        """Group writes into a single transaction, committed once when the outermost block exits.
+
+        A nested unit of work runs in a SAVEPOINT: if it raises, only the writes made in it are rolled back,
+        and the enclosing block may catch the DataBaseError and go on. If the outermost block raises, every
+        write made in it is rolled back. A unit in which a write failed never commits, even if the block
+        caught the error: its writes are rolled back and it exits with a DataBaseError.
+
+        Yields:
+            DataBaseClient: This client.
+
+        Raises:
+            DataBaseError: If an error occurs during the database operation.
+        """
+        try:
+            unit = {"savepoint": self._savepoint() if self._units else None, "failed": False}
+        except Exception as e:
+            self._rollback()
+            raise DataBaseError(e)
+        self._units.append(unit)
+        try:
+            yield self
+        except Exception as e:
+            self._units.pop()
+            self._end(unit, commit=False)
+            if isinstance(e, DataBaseError):
+                raise
+            raise DataBaseError(e)
+        else:
+            self._units.pop()
+            self._end(unit, commit=True)
+
+    def _end(self, unit: dict, commit: bool) -> None:
+        """Commit or roll back a unit of work that has just been closed.
+
+        Args:
+            unit (dict): The unit, with its savepoint, None for the outermost one, and whether a write failed.
+            commit (bool): Whether the block completed without raising.
+
+        Raises:
+            DataBaseError: If the unit had a failed write, or committing it fails.
+        """
+        savepoint = unit["savepoint"]
+        try:
+            if commit and not unit["failed"]:
+                if savepoint is None:
+                    self._session.commit()
+                else:
+                    savepoint.commit()
+                return
+            if savepoint is None:
+                self._session.rollback()
+            elif savepoint.is_active:
+                savepoint.rollback()
+        except Exception as e:
+            self._rollback()
+            raise DataBaseError(e)
+        if commit:
+            raise DataBaseError("Unit of work rolled back after a failed write.")
+
+    def _rollback(self) -> None:
+        """Roll back a failed write.
+
+        Outside a unit of work the session is rolled back. Inside one, only the innermost unit is: its
+        savepoint, or the whole transaction for the outermost unit. The unit is marked as failed, and a new
+        savepoint isolates the writes it still makes, so that they are rolled back with it.
+
+        Returns:
+            None
+        """
+        if not self._units:
+            self._session.rollback()
+            return
+        unit = self._units[-1]
+        unit["failed"] = True
+        if unit["savepoint"] is None:
+            self._session.rollback()
+            return
+        if unit["savepoint"].is_active:
+            unit["savepoint"].rollback()
+        unit["savepoint"] = self._savepoint()
+
+    def _savepoint(self):
+        """Open a SAVEPOINT in the current transaction.
+
+        pysqlite only begins a transaction before a write statement, and a SAVEPOINT opened outside one is
+        committed when it is released, so the transaction is begun first when the driver reports none.
+
+        Returns:
+            SessionTransaction: The nested transaction.
+        """
+        connection = self._session.connection()
+        if getattr(connection.connection.dbapi_connection, "in_transaction", True) is False:
+            connection.exec_driver_sql("BEGIN")
+        return self._session.begin_nested()
 
     def _save(self, object) -> None:
         """Save an object to the database.
@@ -32,8 +132,80 @@ class DataBaseClient:
         """
         try:
             self._session.add(object)
-            self._session.commit()
+            self._commit()
+        except Exception as e:
+            self._rollback()
+            raise DataBaseError(e)
+
+    def save_many(self, objects: list) -> None:
+        """Save several objects to the database with a single commit.
+
+        Args:
+            objects (list): The objects to be saved to the database.
+
+        Raises:
+            DataBaseError: If an error occurs during the database operation.
+        """
+        try:
+            self._session.add_all(objects)
+            self._commit()
         except Exception as e:
+            self._rollback()
+            raise DataBaseError(e)
+
+    def bulk_insert(self, object, rows: list) -> int:
+        """Insert a batch of rows with a single executemany-style statement and commit once.
+
+        Unlike `save_many`, rows are plain dictionaries and no ORM objects are built or tracked.
+
+        Args:
+            object: The model class of the rows.
+            rows (list): The rows to insert, as dictionaries of column name to value.
+
+        Returns:
+            int: The number of rows inserted.
+
+        Raises:
+            DataBaseError: If an error occurs during the database operation.
+        """
+        if not rows:
+            return 0
+        try:
+            self._session.execute(insert(object.__table__), rows)
+            self._commit()
+            return len(rows)
+        except Exception as e:
+            self._rollback()
+            raise DataBaseError(e)
+
+    def bulk_update(self, object, rows: list, key: str or tuple) -> int:
+        """Update a batch of existing rows with a single executemany-style statement and commit once.
+
+        Only the columns present in the rows are written. Rows whose key does not exist are ignored.
+
+        Args:
+            object: The model class of the rows.
+            rows (list): The rows to update, as dictionaries of column name to value, including the key.
+            key (str or tuple): The unique column identifying a row, or the columns of a composite key.
+
+        Returns:
+            int: The number of rows sent.
+
+        Raises:
+            DataBaseError: If an error occurs during the database operation.
+        """
+        if not rows:
+            return 0
+        table = object.__table__
+        keys = (key,) if isinstance(key, str) else tuple(key)
+        try:
+            self._session.execute(
+                update(table).where(and_(*(table.c[name] == bindparam("_" + name) for name in keys))),
+                [dict(row, **{"_" + name: row[name] for name in keys}) for row in rows])
+            self._commit()
+            return len(rows)
+        except Exception as e:
+            self._rollback()
             raise DataBaseError(e)
 
     def _last(self, object):
@@ -50,7 +222,6 @@ class DataBaseClient:
         """
         try:
             data = self._session.query(object).order_by(object.id.desc()).first()
-            self.session_commit()
             return data
         except Exception as e:
             raise DataBaseError(e)
@@ -94,6 +265,50 @@ class DataBaseClient:
         except Exception as e:
             raise DataBaseError(e)
 
+    def _get_by_key(self, object, **key):
+        """Retrieve an object of a specific type by the value of its key columns.
+
+        Args:
+            object: The type of object to retrieve.
+            **key: Column names and values identifying the object.
+
+        Returns:
+            object: The object matching the key, or None if not found.
+
+        Raises:
+            DataBaseError: If an error occurs during the database operation.
+        """
+        try:
+            data = self._session.query(object).filter_by(**key).one()
+            return data
+        except NoResultFound:
+            return None
+        except Exception as e:
+            raise DataBaseError(e)
+
+    def _get_columns(self, object, columns: list, **key) -> list:
+        """Retrieve only some columns of every object of a specific type matching the given column values.
+
+        No ORM objects are built, so this is the cheap way to read a large set of rows.
+
+        Args:
+            object: The type of object to retrieve.
+            columns (list): Names of the columns to read.
+            **key: Column names and values the objects must match.
+
+        Returns:
+            list: One tuple of column values per matching object.
+
+        Raises:
+            DataBaseError: If an error occurs during the database operation.
+        """
+        try:
+            table = object.__table__
+            statement = select(*(table.c[name] for name in columns)).filter_by(**key)
+            return [tuple(row) for row in self._session.execute(statement)]
+        except Exception as e:
+            raise DataBaseError(e)
+
     def _get_filter_by_code(self, filter: FilterBase, category):
         """Retrieve a filter by its code and category.
 
@@ -115,6 +330,74 @@ class DataBaseClient:
         except Exception as e:
             raise DataBaseError(e)
 
+    def upsert(self, object, rows: list, key: str or tuple) -> int:
+        """Insert or update a batch of rows keyed on a unique column, or a unique set of columns, committing once.
+
+        Rows are sent as a single executemany-style statement. On PostgreSQL and SQLite this is an
+        `INSERT ... ON CONFLICT DO UPDATE`; other dialects fall back to one lookup of the existing
+        keys followed by a bulk insert and a bulk update. Every row must have the same columns.
+
+        Args:
+            object: The model class of the rows.
+            rows (list): The rows to write, as dictionaries of column name to value.
+            key (str or tuple): The unique column identifying a row, or the columns of a composite key.
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            DataBaseError: If an error occurs during the database operation.
+        """
+        if not rows:
+            return 0
+        table = object.__table__
+        keys = (key,) if isinstance(key, str) else tuple(key)
+        try:
+            dialect = self._session.get_bind().dialect.name
+            if dialect in ("postgresql", "sqlite"):
+                if dialect == "postgresql":
+                    from sqlalchemy.dialects.postgresql import insert as dialect_insert
+                else:
+                    from sqlalchemy.dialects.sqlite import insert as dialect_insert
+                statement = dialect_insert(table)
+                statement = statement.on_conflict_do_update(
+                    index_elements=list(keys),
+                    set_={name: statement.excluded[name] for name in rows[0] if name not in keys})
+                self._session.execute(statement, rows)
+            else:
+                columns = [table.c[name] for name in keys]
+                identities = [tuple(row[name] for name in keys) for row in rows]
+                if len(keys) == 1:
+                    condition = columns[0].in_([identity[0] for identity in identities])
+                else:
+                    condition = tuple_(*columns).in_(identities)
+                existing = set(tuple(found) for found in self._session.execute(select(*columns).where(condition)))
+                inserts = [row for row, identity in zip(rows, identities) if identity not in existing]
+                updates = [dict(row, **{"_" + name: row[name] for name in keys})
+                           for row, identity in zip(rows, identities) if identity in existing]
+                if inserts:
+                    self._session.execute(insert(table), inserts)
+                if updates:
+                    self._session.execute(
+                        update(table).where(and_(*(table.c[name] == bindparam("_" + name) for name in keys))),
+                        updates)
+            self._commit()
+            return len(rows)
+        except Exception as e:
+            self._rollback()
+            raise DataBaseError(e)
+
+    def _commit(self) -> None:
+        """Commit the session, unless a unit of work is open, in which case the changes are only flushed.
+
+        Returns:
+            None
+        """
+        if self._units:
+            self._session.flush()
+        else:
+            self._session.commit()
+
     def session_commit(self) -> None:
         """Commit the current database session.
 
@@ -124,3 +407,13 @@ class DataBaseClient:
             None
         """
         self._session.commit()
+
+    def session_rollback(self) -> None:
+        """Roll back the current database session.
+
+        This method discards any pending database changes, leaving the session usable after a failed operation.
+
+        Returns:
+            None
+        """
+        self._session.rollback()
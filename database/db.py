@@ -1,15 +1,52 @@
 import os
+import threading
 
 from dotenv import load_dotenv
 load_dotenv()
 
 from utils.exceptions import DataBaseError
 
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import create_engine
+from sqlalchemy.orm import declarative_base
 
-try:
-    engine = create_engine(os.getenv("DATABASE_URL"))
-except:
-    raise DataBaseError("Failed creating engine")
 Base = declarative_base()
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """The database engine, created from `DATABASE_URL` the first time it is needed.
+
+    Returns:
+        Engine: The shared SQLAlchemy engine.
+
+    Raises:
+        DataBaseError: If the engine cannot be created.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                from sqlalchemy import create_engine
+                try:
+                    _engine = create_engine(os.getenv("DATABASE_URL"))
+                except Exception:
+                    raise DataBaseError("Failed creating engine")
+    return _engine
+
+def set_engine(engine) -> None:
+    """Replace the shared database engine, e.g. with one bound to another database.
+
+    Args:
+        engine (Engine): The engine.
+
+    Returns:
+        None
+    """
+    global _engine
+    _engine = engine
+
+def __getattr__(name: str):
+    # `from database.db import engine` keeps working, and creates the engine on first use
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
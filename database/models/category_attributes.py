@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, Column, String, DateTime, JSON
+
+from database.db import Base
+
+class CategoryAttributesEntry(Base):
+    __tablename__ = "category_attributes"
+
+    category_id = Column(String(30), primary_key=True)
+    date = Column(DateTime(), default=datetime.now)
+    etag = Column(String(200), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    size = Column(Integer, nullable=True)
+    payload = Column(JSON, nullable=True)
@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from sqlalchemy import Column, String, DateTime, JSON
+
+from database.db import Base
+
+class CategoryPrediction(Base):
+    __tablename__ = "category_prediction"
+
+    keyword = Column(String(200), primary_key=True)
+    date = Column(DateTime(), default=datetime.now)
+    payload = Column(JSON, nullable=True)
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, Column, String, DateTime
+
+from database.db import Base
+
+class DeltaQuery(Base):
+    __tablename__ = "delta_query"
+
+    query = Column(String(64), primary_key=True)
+    url = Column(String(1000), nullable=True)
+    last_run = Column(DateTime(), default=datetime.now)
+    items = Column(Integer, nullable=True)
+    new = Column(Integer, nullable=True)
+    changed = Column(Integer, nullable=True)
+    disappeared = Column(Integer, nullable=True)
+
+class DeltaItem(Base):
+    __tablename__ = "delta_item"
+
+    query = Column(String(64), primary_key=True)
+    item_id = Column(String(30), primary_key=True)
+    content_hash = Column(String(32), nullable=False)
+    first_seen = Column(DateTime(), default=datetime.now)
+    last_seen = Column(DateTime(), default=datetime.now)
+    disappeared = Column(DateTime(), nullable=True)
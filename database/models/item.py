@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, Column, String, DateTime, JSON
+
+from database.db import Base
+
+class ItemModel(Base):
+    __tablename__ = "item"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    item_id = Column(String(30), unique=True, nullable=False)
+    date = Column(DateTime(), default=datetime.now)
+    title = Column(String(300), nullable=True)
+    condition = Column(String(30), nullable=True)
+    thumbnail_id = Column(String(100), nullable=True)
+    attributes = Column(JSON, nullable=True)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Integer, Column, String, DateTime
+from sqlalchemy import Integer, Column, String, DateTime, Float
 
 from database.db import Base
 
@@ -9,6 +9,9 @@ class RequestModel(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(DateTime(), default=datetime.now())    
-    url = Column(String(200), nullable=True)
+    url = Column(String(1000), nullable=True)
     session = Column(String(200), nullable=True)
-    status_code = Column(Integer, nullable=True)
\ No newline at end of file
+    status_code = Column(Integer, nullable=True)
+    endpoint = Column(String(50), nullable=True, index=True)
+    latency_ms = Column(Float, nullable=True)
+    response_bytes = Column(Integer, nullable=True)
@@ -0,0 +1,148 @@
+from database.client import DataBaseClient
+from database.models.request import RequestModel
+from database.schema import add_missing_columns
+from datetime import datetime
+from request.request_moderator import endpoint_family
+from utils.exceptions import DataBaseError
+from sqlalchemy.orm import Session
+import logging
+import queue
+import threading
+import time
+
+class RequestLog:
+    """Write-behind log of the requests sent to the MercadoLibre API.
+
+    Records are queued by the request path without touching the database and written in bulk by a
+    background worker, with its own session, whenever `FLUSH_SIZE` records are pending or
+    `FLUSH_INTERVAL` seconds have passed since the last write. Besides the URL and status code, each
+    record stores the endpoint family, the wall-clock latency and the size of the response body.
+    The telemetry columns are added to a `request` table created before they existed, and the log
+    refuses to start if that fails, rather than dropping every record.
+
+    Attributes:
+        FLUSH_SIZE (int): Default number of pending records that triggers a write.
+        FLUSH_INTERVAL (float): Default seconds between writes of pending records.
+        written (int): Number of records written so far.
+
+    Methods:
+        record(url: str, response, session) -> None: Queue a request record.
+        flush() -> None: Wait until every queued record has been written.
+        close() -> None: Write pending records and stop the worker.
+    """
+
+    FLUSH_SIZE: int = 200
+    FLUSH_INTERVAL: float = 2.0
+
+    def __init__(self, db: DataBaseClient, flush_size: int = None, flush_interval: float = None) -> None:
+        """Initialize the RequestLog and start its worker.
+
+        Args:
+            db (DataBaseClient): Database client whose engine the worker writes to.
+            flush_size (int, optional): Number of pending records that triggers a write.
+            flush_interval (float, optional): Seconds between writes of pending records.
+
+        Raises:
+            DataBaseError: If the `request` table lacks telemetry columns that cannot be added.
+        """
+        self._bind = db._session.get_bind()
+        add_missing_columns(self._bind, RequestModel)
+        self.flush_size = flush_size or self.FLUSH_SIZE
+        self.flush_interval = flush_interval or self.FLUSH_INTERVAL
+        self.written = 0
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._flushing = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="request-log", daemon=True)
+        self._worker.start()
+
+    def record(self, url: str, response, session) -> None:
+        """Queue a request record.
+
+        Args:
+            url (str): The URL used for the request.
+            response (Response or AsyncResponse): The response received from the API.
+            session: The ID of the connection the request was made with.
+
+        Returns:
+            None
+        """
+        latency = getattr(response, "latency", None)
+        self._queue.put({
+            "date": datetime.now(),
+            "url": url,
+            "session": session,
+            "status_code": response.status_code,
+            "endpoint": endpoint_family(url),
+            "latency_ms": latency * 1000 if latency is not None else None,
+            "response_bytes": len(response.content)
+        })
+
+    def flush(self) -> None:
+        """Wait until every queued record has been written.
+
+        Returns:
+            None
+        """
+        self._flushing.set()
+        try:
+            self._queue.join()
+        finally:
+            self._flushing.clear()
+
+    def close(self) -> None:
+        """Write pending records and stop the worker.
+
+        Returns:
+            None
+        """
+        self._stop.set()
+        self._worker.join()
+
+    def _run(self) -> None:
+        """Collect queued records and write them in batches until stopped.
+
+        Returns:
+            None
+        """
+        session = Session(bind=self._bind)
+        db = DataBaseClient(session=session)
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        try:
+            while True:
+                try:
+                    batch.append(self._queue.get(timeout=min(max(deadline - time.monotonic(), 0.0), 0.1)))
+                    while len(batch) < self.flush_size:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+                now = time.monotonic()
+                if batch and (len(batch) >= self.flush_size or now >= deadline
+                              or self._flushing.is_set() or self._stop.is_set()):
+                    self._write(db, batch)
+                    batch = []
+                if now >= deadline:
+                    deadline = now + self.flush_interval
+                if self._stop.is_set() and not batch and self._queue.empty():
+                    break
+        finally:
+            session.close()
+
+    def _write(self, db: DataBaseClient, batch: list) -> None:
+        """Write a batch of records with a single statement and commit.
+
+        Args:
+            db (DataBaseClient): The worker's database client.
+            batch (list): The records to write.
+
+        Returns:
+            None
+        """
+        try:
+            self.written += db.bulk_insert(RequestModel, batch)
+        except DataBaseError as e:
+            logging.error("Failed writing {} request records: {}".format(len(batch), e))
+        finally:
+            for _ in batch:
+                self._queue.task_done()
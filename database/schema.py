@@ -0,0 +1,50 @@
+from sqlalchemy import inspect, text
+from utils.exceptions import DataBaseError
+import logging
+
+def add_missing_columns(bind, model) -> list:
+    """Add the nullable columns a model declares but its existing table lacks.
+
+    `Base.metadata.create_all` creates missing tables but never alters existing ones, so a database
+    created before a column was added to a model would reject every write of it. New nullable columns,
+    and the indexes on them, are added with `ALTER TABLE`; a missing column that is not nullable cannot
+    be added this way and is reported instead.
+
+    Args:
+        bind (Engine): The engine of the database.
+        model: The declarative model, e.g. RequestModel.
+
+    Returns:
+        list: Names of the columns added. Empty if the table does not exist yet or is up to date.
+
+    Raises:
+        DataBaseError: If a missing column cannot be added.
+    """
+    table = model.__table__
+    inspector = inspect(bind)
+    if not inspector.has_table(table.name):
+        return []
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    missing = [column for column in table.columns if column.name not in existing]
+    if not missing:
+        return []
+    preparer = bind.dialect.identifier_preparer
+    try:
+        with bind.begin() as connection:
+            for column in missing:
+                if not column.nullable:
+                    raise DataBaseError("Column {}.{} is missing and not nullable; migrate the table by hand."
+                                        .format(table.name, column.name))
+                connection.execute(text("ALTER TABLE {} ADD COLUMN {} {}".format(
+                    preparer.format_table(table), preparer.format_column(column),
+                    column.type.compile(dialect=bind.dialect))))
+            for index in table.indexes:
+                if any(column in missing for column in index.columns):
+                    index.create(connection, checkfirst=True)
+    except DataBaseError:
+        raise
+    except Exception as e:
+        raise DataBaseError("Failed adding columns {} to table {}: {}".format(
+            [column.name for column in missing], table.name, e))
+    logging.warning("Added columns {} to table {}.".format([column.name for column in missing], table.name))
+    return [column.name for column in missing]
@@ -0,0 +1,188 @@
+from database.client import DataBaseClient
+from database.models.delta import DeltaItem, DeltaQuery
+from datetime import datetime
+from etl.records import ItemRecord, records
+from request.meli.request_paginator import Paginator
+from typing import List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from utils.metrics import get_metrics
+import hashlib
+import json
+import logging
+
+class SearchDelta:
+    """Incremental extraction state of a single search.
+
+    The state is kept per canonical search URL: the ID and content hash of every item seen so far. Each page
+    of a new run is reduced to the items that are new or whose content changed, so the Transformer and the
+    Loader only handle the churn. When the run ends, `finish` writes the hashes of those items and flags the
+    items that are no longer returned. Unchanged items are not written at all.
+
+    Disappeared items are only flagged when every page of the search was received and the search fits within
+    the offsets the API serves; otherwise an item missing from the run may simply not have been reached.
+
+    Attributes:
+        EXCLUDED_PARAMS (tuple): Query parameters that do not identify a search.
+        query (str): Hash of the canonical URL of the search, once `begin` is called.
+        url (str): Canonical URL of the search.
+        new (int): Items of this run not seen before.
+        changed (int): Items of this run whose content changed, or that had disappeared and are back.
+        unchanged (int): Items of this run with the same content as before.
+        disappeared (int): Items flagged by `finish` as no longer returned.
+
+    Methods:
+        canonical_url(url: str) -> str: The URL of a search without paging parameters, with sorted parameters.
+        content_hash(record: ItemRecord) -> str: Hash of the content of an item, as the Transformer sees it.
+        begin(url: str) -> None: Load the state of a search.
+        filter(page) -> List[ItemRecord]: The new and changed items of a search page.
+        finish() -> dict: Store the state of the run and flag disappeared items.
+    """
+
+    EXCLUDED_PARAMS: tuple = ("offset", "limit", "access_token")
+
+    def __init__(self, db: DataBaseClient) -> None:
+        """Initialize the SearchDelta.
+
+        Args:
+            db (DataBaseClient): Database client the state is read from and written to.
+        """
+        self._db = db
+        self.query = None
+        self.url = None
+        self.new = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.disappeared = 0
+        self._known = {}
+        self._gone = set()
+        self._current = set()
+        self._writes = {}
+        self._pages = 0
+        self._expected = None
+
+    @classmethod
+    def canonical_url(cls, url: str) -> str:
+        """The URL of a search without paging parameters, with its parameters sorted.
+
+        Args:
+            url (str): The search URL, as built by the user control.
+
+        Returns:
+            str: The canonical URL.
+        """
+        parts = urlsplit(url)
+        params = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                        if name not in cls.EXCLUDED_PARAMS)
+        return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(params), ""))
+
+    @staticmethod
+    def content_hash(record: ItemRecord) -> str:
+        """Hash of the content of an item, as the Transformer sees it.
+
+        Args:
+            record (ItemRecord): The item.
+
+        Returns:
+            str: Hexadecimal digest of the item row.
+        """
+        content = json.dumps(record.row(), sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+    def begin(self, url: str) -> None:
+        """Load the state of a search: the IDs and content hashes of the items seen by earlier runs.
+
+        Args:
+            url (str): The search URL, as built by the user control.
+
+        Returns:
+            None
+
+        Raises:
+            DataBaseError: If an error occurs during the database operation.
+        """
+        self.url = self.canonical_url(url)
+        self.query = hashlib.sha256(self.url.encode("utf-8")).hexdigest()
+        for item_id, content_hash, disappeared in self._db._get_columns(
+                DeltaItem, ["item_id", "content_hash", "disappeared"], query=self.query):
+            self._known[item_id] = content_hash
+            if disappeared is not None:
+                self._gone.add(item_id)
+        logging.info("Incremental search {}: {} items known.".format(self.url, len(self._known)))
+
+    def filter(self, page) -> List[ItemRecord]:
+        """The items of a search page that are new or changed since the last run.
+
+        Args:
+            page (dict or SearchPage): A decoded search page.
+
+        Returns:
+            List[ItemRecord]: The records of the new and changed items, ready to be fed to the Transformer.
+        """
+        if self._expected is None:
+            paging = (page.get("paging") or {}) if isinstance(page, dict) else _paging(page.paging)
+            self._expected = (1 + len(Paginator.offsets(paging))
+                              if paging.get("total", 0) <= Paginator.MAX_OFFSET else None)
+        self._pages += 1
+        delta = []
+        for record in records(page):
+            if record.id in self._current:
+                continue
+            self._current.add(record.id)
+            content_hash = self.content_hash(record)
+            known = self._known.get(record.id)
+            if known is None:
+                self.new += 1
+            elif known != content_hash or record.id in self._gone:
+                self.changed += 1
+            else:
+                self.unchanged += 1
+                continue
+            self._writes[record.id] = (content_hash, known is None)
+            delta.append(record)
+        return delta
+
+    def finish(self) -> dict:
+        """Store the state of the run and flag the known items it did not return.
+
+        Call it once the items returned by `filter` are loaded, so a failed load is retried by the next run.
+
+        Returns:
+            dict: The number of new, changed, unchanged and disappeared items.
+
+        Raises:
+            DataBaseError: If an error occurs during the database operation.
+        """
+        now = datetime.now()
+        complete = self._expected is not None and self._pages >= self._expected
+        gone = [item_id for item_id in self._known
+                if item_id not in self._current and item_id not in self._gone] if complete else []
+        with self._db.unit_of_work():
+            self._db.upsert(DeltaItem, [
+                {"query": self.query, "item_id": item_id, "content_hash": content_hash,
+                 "first_seen": now, "last_seen": now, "disappeared": None}
+                for item_id, (content_hash, new) in self._writes.items() if new], key=("query", "item_id"))
+            self._db.upsert(DeltaItem, [
+                {"query": self.query, "item_id": item_id, "content_hash": content_hash,
+                 "last_seen": now, "disappeared": None}
+                for item_id, (content_hash, new) in self._writes.items() if not new], key=("query", "item_id"))
+            self._db.bulk_update(DeltaItem, [
+                {"query": self.query, "item_id": item_id, "disappeared": now} for item_id in gone],
+                key=("query", "item_id"))
+            self.disappeared = len(gone)
+            self._db.upsert(DeltaQuery, [
+                {"query": self.query, "url": self.url, "last_run": now, "items": len(self._current),
+                 "new": self.new, "changed": self.changed, "disappeared": self.disappeared}], key="query")
+        stats = {"new": self.new, "changed": self.changed, "unchanged": self.unchanged,
+                 "disappeared": self.disappeared}
+        metrics = get_metrics()
+        for status, count in stats.items():
+            metrics.inc("delta_items_total", count, status=status)
+        if not complete:
+            logging.info("Incremental search {}: not every page was received, disappeared items not flagged."
+                         .format(self.url))
+        logging.info("Incremental search {}: {}".format(self.url, stats))
+        return stats
+
+def _paging(paging) -> dict:
+    """The paging of a typed search page as a dictionary."""
+    return {"total": paging.total, "offset": paging.offset, "limit": paging.limit}
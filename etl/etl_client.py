@@ -1,18 +1,36 @@
 ## TODO:
 ##  - Analysis
-##  - Request density per session (Moderator)
-##  - Load (Loader)
 ##  - Comments, docs, ...
 ##  - Logging / tests
-##  - Execution time control (Timing)
 ##  - Error handling
 
 from auth.meli.auth import AuthClient
+from concurrent.futures import ThreadPoolExecutor
 from database.client import DataBaseClient
+from datetime import datetime
+from etl.delta import SearchDelta
+from etl.load import Loader
+from etl.parallel import ParallelTransformer
+from etl.sinks import ColumnarSink
 from etl.transform import Transformer
 from request.meli.request_client import RequestClient
+from request.meli.request_settings import Credential
+from request.meli.search_cache import get_search_cache
+from request.meli.shard_planner import ShardPlanner
+from request.meli.request_user_control import UserControl
+from request.meli.user_controls.batch_uc import BatchUserControl
+from request.response_archive import ResponseArchive
+from request.request_moderator import get_moderator
+from request.request_transport import get_transport
 from sqlalchemy.orm import Session
+from typing import Iterator, List
+from utils.exceptions import ConfigError
+from utils.metrics import get_metrics
+import asyncio
+import json
 import logging
+import os
+import time
 
 class MeliClient:
     """Main class responsible for orchestrating the MercadoLibre client application.
@@ -23,27 +41,340 @@ class MeliClient:
         session (Session): SQLAlchemy session for database operations.
     """
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, max_workers: int = 4, chunk_size: int = None, batch_size: int = 500,
+                 archive_path: str = None, sink: ColumnarSink = None, incremental: bool = False,
+                 transform_workers: int = None) -> None:
         """Initialize the MeliClient.
 
         Args:
             session (Session): SQLAlchemy session for database operations.
+            max_workers (int): Number of search pages fetched at the same time.
+            chunk_size (int, optional): Rows per transformed chunk. When set, the search is streamed
+                through the transformer in chunks instead of being held in a single DataFrame.
+            batch_size (int): Rows written per batch by the loader.
+            archive_path (str, optional): Directory of a ResponseArchive the raw search and attributes
+                responses are written to.
+            sink (ColumnarSink, optional): Columnar sink every transformed batch is also written to.
+            incremental (bool): Only transform and load the items that are new or changed since the last
+                run of the same search, and flag the items that disappeared.
+            transform_workers (int, optional): When set, `start` transforms the pages on a ParallelTransformer
+                with this many processes. Ignored when `chunk_size` is set.
         """
         self._db = DataBaseClient(session=session)
         self._auth = AuthClient(db=self._db)
-        self.request_client = RequestClient(db=self._db)
+        self.archive = ResponseArchive(archive_path) if archive_path else None
+        self.request_client = RequestClient(db=self._db, max_workers=max_workers, archive=self.archive)
         self.transformer = Transformer()
+        self.loader = Loader(db=self._db, batch_size=batch_size)
+        self.chunk_size = chunk_size
+        self.sink = sink
+        self.incremental = incremental
+        self.transform_workers = transform_workers
 
     def start(self):
         """Start the MercadoLibre client application.
 
-        This method initiates the application, performs authentication, retrieves data using request client, and transforms the data.
+        This method initiates the application, performs authentication, retrieves every page of the search using request client, and transforms the pages and loads them into the database.
 
         Returns:
             None
         """
-        access_token = self._auth._connection()
-        response = self.request_client.search(access_token)
-        if response:
-            self.transformer.transform(response)
-        # self.loader.load(transformation)
+        metrics = get_metrics()
+        with metrics.timer("stage_seconds", stage="auth"):
+            access_token = self._auth._connection()
+        parallel = bool(self.transform_workers) and not self.chunk_size
+        pages = self.request_client.search_pages(access_token, raw=parallel and not self.incremental)
+        delta = SearchDelta(self._db) if self.incremental else None
+        if delta is not None:
+            pages = self._delta(pages, delta)
+        pages = metrics.timed(pages, "stage_seconds", stage="search")
+        if self.chunk_size:
+            rows = 0
+            chunks = metrics.timed(self.transformer.stream(pages, chunk_size=self.chunk_size),
+                                   "stage_seconds", exclude=pages, stage="transform")
+            for chunk in chunks:
+                with metrics.timer("stage_seconds", stage="load"):
+                    rows += self.loader.load(chunk)
+                self._write(chunk, self._category())
+                logging.info("Transformed and loaded chunk of {} rows ({} so far).".format(len(chunk), rows))
+            logging.info("Loaded {} rows with {} columns.".format(rows, len(self.transformer.schema)))
+        elif parallel:
+            started = time.perf_counter()
+            transformation = ParallelTransformer(workers=self.transform_workers).transform(pages)
+            metrics.observe("stage_seconds", time.perf_counter() - started - getattr(pages, "elapsed", 0.0),
+                            stage="transform")
+            with metrics.timer("stage_seconds", stage="load"):
+                self.loader.load(transformation)
+            self._write(transformation, self._category())
+        else:
+            for response in pages:
+                with metrics.timer("stage_seconds", stage="transform"):
+                    self.transformer.feed(response)
+            with metrics.timer("stage_seconds", stage="transform"):
+                transformation = self.transformer.transform()
+            with metrics.timer("stage_seconds", stage="load"):
+                self.loader.load(transformation)
+            self._write(transformation, self._category())
+        if delta is not None and delta.query is not None:
+            delta.finish()
+        self._report()
+
+    async def start_async(self, concurrency: int = None):
+        """Start the MercadoLibre client application on an event loop.
+
+        Same as start, but the pages of the search are fetched through the asynchronous request backend.
+        Authentication blocks on the database and the token endpoint, and sets up the token encryptor with
+        its own event loop on a first run, so it runs on a worker thread instead of on the running loop.
+
+        Args:
+            concurrency (int, optional): Maximum number of in-flight requests.
+
+        Returns:
+            None
+        """
+        metrics = get_metrics()
+        with metrics.timer("stage_seconds", stage="auth"):
+            access_token = await asyncio.to_thread(self._auth._connection)
+        with metrics.timer("stage_seconds", stage="search"):
+            async for response in self.request_client.search_pages_async(access_token, concurrency=concurrency):
+                self.transformer.feed(response)
+        with metrics.timer("stage_seconds", stage="transform"):
+            transformation = self.transformer.transform()
+        with metrics.timer("stage_seconds", stage="load"):
+            self.loader.load(transformation)
+        self._write(transformation, self._category())
+        self._report()
+
+    def replay(self, archive_path: str = None, since: datetime = None, until: datetime = None) -> int:
+        """Transform and load archived search responses without contacting the API.
+
+        The most recent response of each archived search URL is fed to the transformer, in chunks when
+        `chunk_size` is set, and loaded into the database.
+
+        Args:
+            archive_path (str, optional): Directory of the archive. The archive of this client if omitted.
+            since (datetime, optional): Only responses archived at or after this time.
+            until (datetime, optional): Only responses archived before this time.
+
+        Returns:
+            int: The number of rows loaded.
+
+        Raises:
+            ConfigError: If no archive path is given and the client has no archive.
+        """
+        archive = ResponseArchive(archive_path) if archive_path else self.archive
+        if archive is None:
+            raise ConfigError("An archive path is required to replay: none was given and the client has no archive.")
+        metrics = get_metrics()
+        pages = metrics.timed(archive.replay("search", since=since, until=until), "stage_seconds", stage="replay")
+        rows = 0
+        if self.chunk_size:
+            chunks = metrics.timed(self.transformer.stream(pages, chunk_size=self.chunk_size),
+                                   "stage_seconds", exclude=pages, stage="transform")
+            for chunk in chunks:
+                with metrics.timer("stage_seconds", stage="load"):
+                    rows += self.loader.load(chunk)
+                self._write(chunk)
+        else:
+            for response in pages:
+                with metrics.timer("stage_seconds", stage="transform"):
+                    self.transformer.feed(response)
+            with metrics.timer("stage_seconds", stage="load"):
+                rows = self.loader.load(self.transformer.df)
+            self._write(self.transformer.df)
+        logging.info("Replayed {} rows from {}.".format(rows, archive.root))
+        return rows
+
+    def run_batch(self, jobs_path: str, workers: int = 2) -> List[dict]:
+        """Run every search job of a JSONL file without user interaction.
+
+        Jobs run in parallel, `workers` at a time. Each job has its own transformer and its own database
+        session for loading, while the HTTP transport, the request moderator and the request log are
+        shared. A failed job is reported and does not stop the others.
+
+        Args:
+            jobs_path (str): Path of the JSONL job file.
+            workers (int): Number of jobs run at the same time.
+
+        Returns:
+            List[dict]: The status, pages, rows and timings of each job, in file order.
+        """
+        controls = BatchUserControl.from_file(jobs_path)
+        with get_metrics().timer("stage_seconds", stage="auth"):
+            access_token = self._auth._connection()
+        results = self._run_controls(controls, access_token, workers)
+        self._report()
+        return results
+
+    def run_sharded(self, keyword: str, workers: int = 2, filters: dict = None) -> List[dict]:
+        """Extract every result of a search larger than the offset cap of the search endpoint.
+
+        The search is split by a ShardPlanner into disjoint sub-queries, built from the filters of its
+        category, that can each be paged fully. The shards run as batch jobs, largest first, so the pool
+        schedules them longest-processing-time-first and no worker is left with a long tail.
+
+        Args:
+            keyword (str): The keyword of the search.
+            workers (int): Number of shards run at the same time.
+            filters (dict, optional): Filters of the search, as a mapping of filter ID to value IDs.
+
+        Returns:
+            List[dict]: The status, pages, rows and timings of each shard, largest first.
+        """
+        metrics = get_metrics()
+        with metrics.timer("stage_seconds", stage="auth"):
+            access_token = self._auth._connection()
+        with metrics.timer("stage_seconds", stage="plan"):
+            credential = Credential(access_token).generate()
+            category = self.request_client.category_cache.predict(keyword, credential)
+            category_id = category[0].get("category_id") if category else None
+            attributes = self.request_client.attributes_cache.get(category_id, credential) if category_id else None
+            planner = ShardPlanner(lambda job: self.request_client.probe(access_token, BatchUserControl(job)),
+                                   attributes=attributes)
+            shards = planner.plan(keyword, filters=filters, category_id=category_id)
+        loads = [sum(shard.size for shard in assigned) for assigned in planner.schedule(shards, workers)]
+        logging.info("Shard plan for '{}': {} shards, {} results, {} not covered, expected worker loads {}.".format(
+            keyword, len(shards), sum(shard.size for shard in shards), planner.uncovered, loads))
+        controls = [BatchUserControl(shard.job(keyword, category_id)) for shard in shards]
+        results = self._run_controls(controls, access_token, workers)
+        self._report()
+        return results
+
+    def _run_controls(self, controls: List[BatchUserControl], access_token: str, workers: int) -> List[dict]:
+        """Run batch jobs on a pool of `workers` threads, in the given order.
+
+        Args:
+            controls (List[BatchUserControl]): The user controls of the jobs.
+            access_token (str): The access token used for authentication.
+            workers (int): Number of jobs run at the same time.
+
+        Returns:
+            List[dict]: The status, pages, rows and timings of each job, in the given order.
+        """
+        self.request_client.connection()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._run_job, enumerate(controls, 1), [access_token] * len(controls)))
+        elapsed = time.perf_counter() - started
+        failed = sum(1 for result in results if result["status"] == "failed")
+        logging.info("Batch finished: {} jobs, {} failed, {} rows in {:.2f}s.".format(
+            len(results), failed, sum(result["rows"] for result in results), elapsed))
+        return results
+
+    def _run_job(self, job: tuple, access_token: str) -> dict:
+        """Search, transform and load a single batch job.
+
+        Args:
+            job (tuple): The position of the job in the file and its user control.
+            access_token (str): The access token used for authentication.
+
+        Returns:
+            dict: The status, pages, rows and timings of the job.
+        """
+        number, control = job
+        metrics = get_metrics()
+        result = {"job": number, "keyword": control.job["keyword"], "status": "ok",
+                  "pages": 0, "rows": 0, "search_time": 0.0, "load_time": 0.0, "error": None}
+        session = Session(bind=self._db._session.get_bind())
+        try:
+            db = DataBaseClient(session=session)
+            transformer = Transformer()
+            delta = SearchDelta(db) if self.incremental else None
+            started = time.perf_counter()
+            pages = self.request_client.search_pages(access_token, user_control=control)
+            if delta is not None:
+                pages = self._delta(pages, delta, control)
+            for response in metrics.timed(pages, "stage_seconds", stage="search"):
+                with metrics.timer("stage_seconds", stage="transform"):
+                    transformer.feed(response)
+                result["pages"] += 1
+            result["search_time"] = time.perf_counter() - started
+            if not result["pages"]:
+                result["status"] = "empty"
+            else:
+                started = time.perf_counter()
+                with metrics.timer("stage_seconds", stage="load"):
+                    result["rows"] = Loader(db=db, batch_size=self.loader.batch_size).load(transformer.df)
+                result["load_time"] = time.perf_counter() - started
+                self._write(transformer.df, control.category_id)
+                if delta is not None:
+                    delta.finish()
+            metrics.inc("jobs_total", status=result["status"])
+        except Exception as e:
+            session.rollback()
+            result["status"] = "failed"
+            result["error"] = str(e)
+            metrics.inc("jobs_total", status="failed")
+        finally:
+            session.close()
+        logging.info("Job {job} '{keyword}': {status}, {pages} pages, {rows} rows, "
+                     "search {search_time:.2f}s, load {load_time:.2f}s.".format(**result))
+        if result["error"]:
+            logging.error("Job {} failed: {}".format(number, result["error"]))
+        return result
+
+    def _delta(self, pages: Iterator, delta: SearchDelta, control: UserControl = None) -> Iterator[list]:
+        """Reduce every search page to its new and changed items.
+
+        The state of the search is loaded when the first page arrives, since the search URL is only known
+        once the user control has built it.
+
+        Args:
+            pages (Iterator): The decoded search pages.
+            delta (SearchDelta): The incremental state of the search.
+            control (UserControl, optional): The user control of the search. The control of the latest
+                search of the request client if omitted.
+
+        Yields:
+            list: The ItemRecords of the new and changed items of each page.
+        """
+        for page in pages:
+            if delta.query is None:
+                delta.begin((control or self.request_client.user_control).url)
+            yield delta.filter(page)
+
+    def _write(self, df, category: str = None) -> None:
+        """Write a transformed batch to the columnar sink, if one is configured.
+
+        Args:
+            df (DataFrame): The transformed batch.
+            category (str, optional): Predicted category of the batch.
+
+        Returns:
+            None
+        """
+        if self.sink is None:
+            return
+        with get_metrics().timer("stage_seconds", stage="sink"):
+            self.sink.write(df, category=category)
+
+    def _category(self) -> str or None:
+        """Category predicted for the latest search, if any."""
+        return getattr(self.request_client.user_control, "category_id", None)
+
+    def _report(self) -> None:
+        """Write pending request records and log the statistics of the run.
+
+        The metrics are logged as a JSON summary and, when the `METRICS_PATH` environment variable is set,
+        written to that file, in the Prometheus text format unless the path ends in `.json`.
+
+        Returns:
+            None
+        """
+        self.request_client.request_log.flush()
+        logging.info("HTTP connection pool: {}".format(get_transport().stats()))
+        logging.info("Request moderator: {}".format(get_moderator().stats()))
+        logging.info("Category cache: {}".format(self.request_client.category_cache.stats()))
+        logging.info("Attributes cache: {}".format(self.request_client.attributes_cache.stats()))
+        logging.info("Search cache: {}".format(get_search_cache().stats()))
+        if self.archive is not None:
+            logging.info("Response archive: {}".format(self.archive.stats()))
+        if self.sink is not None:
+            logging.info("Columnar sink: {} rows in {} files under {}.".format(self.sink.rows, self.sink.files, self.sink.root))
+        metrics = get_metrics()
+        if metrics.enabled:
+            logging.info("Metrics: {}".format(json.dumps(metrics.summary())))
+            path = os.getenv("METRICS_PATH")
+            if path:
+                metrics.write(path)
+                logging.info("Metrics written to {}.".format(path))
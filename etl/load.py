@@ -0,0 +1,96 @@
+from __future__ import annotations
+from database.client import DataBaseClient
+from database.models.item import ItemModel
+from datetime import datetime
+from etl.transform import Transformer
+from typing import Iterator
+from utils.lazy import lazy_import
+import logging
+import time
+
+pd = lazy_import("pandas")
+
+class Loader:
+    """Data loading class responsible for persisting transformed MercadoLibre items.
+
+    This class takes the DataFrames produced by the Transformer and upserts them into the `item` table
+    in batches, keyed on the MercadoLibre item id. Each batch is written with a single statement and
+    committed once; an item repeated within a batch is written once, with its latest values.
+
+    Attributes:
+        TARGET_ROWS_PER_SECOND (int): Throughput the loader is expected to sustain.
+        batch_size (int): Number of rows written per statement and commit.
+        rows_per_second (float): Throughput of the last load.
+
+    Methods:
+        load(df): Upsert the rows of a transformed DataFrame.
+    """
+
+    TARGET_ROWS_PER_SECOND: int = 5000
+
+    def __init__(self, db: DataBaseClient, batch_size: int = 500) -> None:
+        """Initialize the Loader.
+
+        Args:
+            db (DataBaseClient): Database client for data storage.
+            batch_size (int): Number of rows written per statement and commit.
+        """
+        self._db = db
+        self.batch_size = batch_size
+        self.rows_per_second = 0.0
+
+    def load(self, df: pd.DataFrame) -> int:
+        """Upsert the rows of a transformed DataFrame.
+
+        Args:
+            df (DataFrame): A DataFrame produced by the Transformer.
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            DataBaseError: If an error occurs during the database operation.
+        """
+        started = time.perf_counter()
+        loaded = 0
+        batch = {}
+        for row in self._rows(df):
+            batch[row["item_id"]] = row
+            if len(batch) >= self.batch_size:
+                loaded += self._db.upsert(ItemModel, list(batch.values()), key="item_id")
+                batch = {}
+        if batch:
+            loaded += self._db.upsert(ItemModel, list(batch.values()), key="item_id")
+        elapsed = time.perf_counter() - started
+        self.rows_per_second = loaded / elapsed if elapsed > 0 else 0.0
+        logging.info("Loaded {} rows in {:.2f}s ({:.0f} rows/sec)."
+                     .format(loaded, elapsed, self.rows_per_second))
+        if loaded >= self.batch_size and self.rows_per_second < self.TARGET_ROWS_PER_SECOND:
+            logging.warning("Load throughput below target of {} rows/sec."
+                            .format(self.TARGET_ROWS_PER_SECOND))
+        return loaded
+
+    def _rows(self, df: pd.DataFrame) -> Iterator[dict]:
+        """Convert a transformed DataFrame into `item` rows.
+
+        The fixed columns map to their own fields and every other column is collected into the
+        `attributes` field, skipping missing values.
+
+        Args:
+            df (DataFrame): A DataFrame produced by the Transformer.
+
+        Yields:
+            dict: Mapping of `item` column name to value for each row.
+        """
+        now = datetime.now()
+        isna = pd.isna
+        attributes = [name for name in df.columns if name not in Transformer.COLUMNS]
+        for record in df.to_dict("records"):
+            yield {
+                "item_id": record["id"],
+                "date": now,
+                "title": record["title"],
+                "condition": record["condition"],
+                "thumbnail_id": record["thumbnail_id"],
+                "attributes": {name: record[name] for name in attributes if not isna(record[name])}
+            }
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from etl.transform import ColumnRegistry, Transformer
+from typing import Iterable, List
+from utils.json_decoder import loads
+from utils.lazy import lazy_import
+import os
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+class ParallelTransformer:
+    """Transforms search pages on a pool of worker processes.
+
+    Flattening the attributes of every result is pure Python and bound to one core by the GIL. This
+    transformer hands batches of `pages_per_task` pages to a process pool instead. Each worker flattens its
+    batch and sends back compact column buffers, not a DataFrame: per column, the distinct values of the
+    batch and an int32 array of codes into them, -1 standing for a missing value. The parent merges the
+    buffers into one DataFrame whose columns are the fixed columns followed by every attribute in
+    first-seen order, with the same dtypes, exactly as the serial wide Transformer builds it.
+
+    Pages can be decoded search pages, typed SearchPages, lists of ItemRecords, or raw response bodies as
+    bytes, which are the cheapest to send to a worker and are decoded there.
+
+    Attributes:
+        workers (int): Number of worker processes.
+        pages_per_task (int): Pages sent to a worker at a time.
+        schema (dict): Every column of the last transform, in order.
+        rows (int): Rows of the last transform.
+
+    Methods:
+        transform(responses: Iterable) -> DataFrame: Transform search pages in parallel.
+    """
+
+    def __init__(self, workers: int = None, pages_per_task: int = 20) -> None:
+        """Initialize the ParallelTransformer.
+
+        Args:
+            workers (int, optional): Number of worker processes. The number of CPUs if omitted.
+            pages_per_task (int): Pages sent to a worker at a time.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.schema = dict.fromkeys(Transformer.COLUMNS)
+        self.rows = 0
+
+    def transform(self, responses: Iterable) -> pd.DataFrame:
+        """Transform search pages in parallel.
+
+        Pages are consumed lazily and sent to the workers as soon as a batch is complete, so the transform
+        overlaps with the extraction that produces them.
+
+        Args:
+            responses (Iterable): The search pages, typically a generator.
+
+        Returns:
+            DataFrame: The transformed rows, in page order.
+        """
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = []
+            batch = []
+            for response in responses:
+                batch.append(response)
+                if len(batch) >= self.pages_per_task:
+                    futures.append(executor.submit(_flatten, batch))
+                    batch = []
+            if batch:
+                futures.append(executor.submit(_flatten, batch))
+            return self._merge([future.result() for future in futures])
+
+    def _merge(self, buffers: List[tuple]) -> pd.DataFrame:
+        """Merge the column buffers of every batch into a single DataFrame.
+
+        Args:
+            buffers (List[tuple]): The row count and column buffers of each batch, in page order.
+
+        Returns:
+            DataFrame: The merged rows.
+        """
+        self.schema = dict.fromkeys(Transformer.COLUMNS)
+        for _, columns in buffers:
+            for name in columns:
+                self.schema.setdefault(name)
+        self.rows = sum(rows for rows, _ in buffers)
+        data = {}
+        for name in self.schema:
+            pieces = []
+            for rows, columns in buffers:
+                if name in columns:
+                    uniques, codes = columns[name]
+                    pieces.append(np.append(uniques, ColumnRegistry.MISSING)[codes])
+                else:
+                    pieces.append(np.full(rows, ColumnRegistry.MISSING, dtype=object))
+            column = np.concatenate(pieces) if pieces else np.empty(0, dtype=object)
+            if not any(isinstance(value, str) for _, columns in buffers if name in columns
+                       for value in columns[name][0]):
+                # No text values, e.g. only None: let pandas infer the dtype from a list, as the serial
+                # ColumnRegistry does, so that an all-missing column is float64 in both
+                column = column.tolist()
+            data[name] = column
+        return pd.DataFrame(data, columns=list(self.schema))
+
+def _flatten(responses: list) -> tuple:
+    """Flatten a batch of search pages into compact column buffers. Runs in a worker process.
+
+    Values are dictionary-encoded as they are read, and each column only records the rows that have it,
+    so a batch with many distinct attributes costs no padding.
+
+    Args:
+        responses (list): The search pages of the batch.
+
+    Returns:
+        tuple: The number of rows and, per column, its distinct values and the int32 codes of its rows.
+    """
+    transformer = Transformer()
+    columns = {name: ({}, [], []) for name in Transformer.COLUMNS}
+    rows = 0
+    for response in responses:
+        if isinstance(response, (bytes, bytearray, str)):
+            response = loads(response)
+        for record in transformer._records(response):
+            for name, value in record.items():
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = ({}, [], [])
+                uniques, positions, codes = column
+                code = uniques.get(value)
+                if code is None:
+                    code = uniques[value] = len(uniques)
+                positions.append(rows)
+                codes.append(code)
+            rows += 1
+    buffers = {}
+    for name, (uniques, positions, codes) in columns.items():
+        values = np.empty(len(uniques), dtype=object)
+        values[:] = list(uniques)
+        encoded = np.full(rows, -1, dtype=np.int32)
+        encoded[positions] = codes
+        buffers[name] = (values, encoded)
+    return rows, buffers
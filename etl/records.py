@@ -0,0 +1,181 @@
+from typing import Iterable, Iterator, List
+import sys
+
+class AttributeRecord:
+    """Compact record of an attribute of a search result.
+
+    Names and values are interned, and records are shared: `of` returns the same instance for the same
+    name and value pair, so an attribute repeated across thousands of items is stored once.
+
+    Attributes:
+        MAX_SHARED (int): Maximum number of distinct pairs kept for sharing.
+        name (str): Name of the attribute, e.g. "Marca".
+        value (str): Value name of the attribute, e.g. "Samsung".
+
+    Methods:
+        of(name: str, value: str) -> AttributeRecord: The shared record of a name and value pair.
+        to_dict() -> dict: Converts the record to a dictionary.
+    """
+
+    __slots__ = ("name", "value")
+
+    MAX_SHARED: int = 200000
+    _shared: dict = {}
+
+    def __init__(self, name: str, value: str = None) -> None:
+        """Initialize an AttributeRecord object.
+
+        Args:
+            name (str): Name of the attribute.
+            value (str, optional): Value name of the attribute.
+        """
+        self.name = _intern(name)
+        self.value = _intern(value)
+
+    @classmethod
+    def of(cls, name: str, value: str = None) -> "AttributeRecord":
+        """The shared record of a name and value pair, created on first use.
+
+        Args:
+            name (str): Name of the attribute.
+            value (str, optional): Value name of the attribute.
+
+        Returns:
+            AttributeRecord: The record.
+        """
+        key = (name, value)
+        record = cls._shared.get(key)
+        if record is None:
+            record = cls(name, value)
+            if len(cls._shared) < cls.MAX_SHARED:
+                cls._shared[key] = record
+        return record
+
+    def to_dict(self) -> dict:
+        """Convert the record to a dictionary.
+
+        Returns:
+            dict: Dictionary with the name and value of the attribute.
+        """
+        return {'name': self.name, 'value_name': self.value}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r}, {self.value!r})"
+
+
+class ItemRecord:
+    """Compact record of a search result.
+
+    Keeps only the fields the Transformer reads, with its attributes as a tuple of shared AttributeRecords.
+
+    Attributes:
+        id (str): MercadoLibre item ID.
+        title (str): Title of the item.
+        condition (str): Condition of the item, interned.
+        thumbnail_id (str): Thumbnail ID of the item.
+        attributes (tuple): The AttributeRecords of the item.
+
+    Methods:
+        from_result(result) -> ItemRecord: Build a record from a search result.
+        row() -> dict: The item as a Transformer row.
+        to_dict() -> dict: Converts the record to a dictionary.
+    """
+
+    __slots__ = ("id", "title", "condition", "thumbnail_id", "attributes")
+
+    def __init__(self, id: str, title: str, condition: str = None, thumbnail_id: str = None,
+                 attributes: tuple = ()) -> None:
+        """Initialize an ItemRecord object.
+
+        Args:
+            id (str): MercadoLibre item ID.
+            title (str): Title of the item.
+            condition (str, optional): Condition of the item.
+            thumbnail_id (str, optional): Thumbnail ID of the item.
+            attributes (tuple, optional): The AttributeRecords of the item.
+        """
+        self.id = id
+        self.title = title
+        self.condition = _intern(condition)
+        self.thumbnail_id = thumbnail_id
+        self.attributes = attributes
+
+    @classmethod
+    def from_result(cls, result) -> "ItemRecord":
+        """Build a record from a search result.
+
+        Args:
+            result (dict or SearchResult): A result of a decoded search page, as a dict or a typed struct.
+
+        Returns:
+            ItemRecord: The record.
+        """
+        if isinstance(result, dict):
+            return cls(result['id'], result['title'], result.get('condition'), result.get('thumbnail_id'),
+                       tuple(AttributeRecord.of(attribute['name'], attribute.get('value_name'))
+                             for attribute in result.get('attributes', ())))
+        return cls(result.id, result.title, result.condition, result.thumbnail_id,
+                   tuple(AttributeRecord.of(attribute.name, attribute.value_name)
+                         for attribute in result.attributes))
+
+    def row(self) -> dict:
+        """The item as a Transformer row: the fixed columns plus one column per attribute name.
+
+        Returns:
+            dict: Mapping of column name to value.
+        """
+        row = {
+            'id': self.id,
+            'title': self.title,
+            'condition': self.condition,
+            'thumbnail_id': self.thumbnail_id
+        }
+        for attribute in self.attributes:
+            row[attribute.name] = attribute.value
+        return row
+
+    def to_dict(self) -> dict:
+        """Convert the record to a dictionary.
+
+        Returns:
+            dict: Dictionary containing the item fields and its attributes.
+        """
+        return {
+            'id': self.id,
+            'title': self.title,
+            'condition': self.condition,
+            'thumbnail_id': self.thumbnail_id,
+            'attributes': [attribute.to_dict() for attribute in self.attributes]
+        }
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.id!r}, {self.title!r})"
+
+
+def records(response) -> List[ItemRecord]:
+    """Build the records of every result of a search page.
+
+    Args:
+        response (dict or SearchPage): A decoded search page.
+
+    Returns:
+        List[ItemRecord]: One record per result.
+    """
+    results = response['results'] if isinstance(response, dict) else response.results
+    return [ItemRecord.from_result(result) for result in results]
+
+def iter_records(responses: Iterable) -> Iterator[ItemRecord]:
+    """Build the records of every result of several search pages, lazily.
+
+    Args:
+        responses (Iterable): Decoded search pages.
+
+    Yields:
+        ItemRecord: One record per result.
+    """
+    for response in responses:
+        yield from records(response)
+
+def _intern(value):
+    """Intern a string, leaving any other value untouched."""
+    return sys.intern(value) if type(value) is str else value
@@ -0,0 +1,204 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from datetime import date
+from utils.exceptions import ConfigError
+from utils.lazy import lazy_import
+import os
+import re
+import threading
+import time
+
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+ds = lazy_import("pyarrow.dataset")
+feather = lazy_import("pyarrow.feather")
+pq = lazy_import("pyarrow.parquet")
+
+class ColumnarSink(ABC):
+    """Writes transformed DataFrames to columnar files partitioned by category and run date.
+
+    Each call to `write` appends one file under `<root>/category=<category>/date=<run date>/`, so the
+    chunks of a streaming transform are persisted as they are produced. The layout follows the Hive
+    convention, so readers such as pyarrow, pandas, DuckDB or Spark prune partitions and columns
+    instead of parsing JSON. Every column is stored as a string, and every column except
+    `PLAIN_COLUMNS` is dictionary-encoded. Attribute values repeat heavily across items.
+
+    Subclasses choose the file format by implementing `_write_table`. Requires pyarrow.
+
+    Attributes:
+        FORMAT (str): pyarrow dataset format name.
+        EXTENSION (str): File extension.
+        PLAIN_COLUMNS (tuple): Columns with mostly unique values, stored without dictionary encoding.
+        root (str): Root directory of the dataset.
+        run_date (date): Date partition of the files written by this sink.
+        files (int): Files written so far.
+        rows (int): Rows written so far.
+
+    Methods:
+        write(df: DataFrame, category: str) -> str or None: Append a DataFrame to its partition.
+        table(df: DataFrame) -> Table: Convert a DataFrame to an Arrow table with dictionary-encoded columns.
+        read(columns: list, category: str, run_date: date) -> DataFrame: Read the dataset back.
+        @abstractmethod _write_table(table: Table, path: str) -> None: Write an Arrow table in the format of the sink.
+    """
+
+    FORMAT: str = ""
+    EXTENSION: str = ""
+    PLAIN_COLUMNS: tuple = ('id', 'title', 'thumbnail_id')
+
+    def __init__(self, root: str, run_date: date = None) -> None:
+        """Initialize the sink.
+
+        Args:
+            root (str): Root directory of the dataset.
+            run_date (date, optional): Date partition of the files written. Today if omitted.
+
+        Raises:
+            ConfigError: If pyarrow is not installed.
+        """
+        if not pa.available:
+            raise ConfigError("Columnar sinks require pyarrow. Install it with `pip install pyarrow`.")
+        self.root = root
+        self.run_date = run_date or date.today()
+        self.files = 0
+        self.rows = 0
+        self._run = "{}-{}".format(time.strftime("%H%M%S"), os.getpid())
+        self._lock = threading.Lock()
+
+    def write(self, df: pd.DataFrame, category: str = None) -> str or None:
+        """Append a DataFrame to the partition of its category and the run date.
+
+        Args:
+            df (DataFrame): A DataFrame produced by the Transformer.
+            category (str, optional): Predicted category of the rows, "unknown" if omitted.
+
+        Returns:
+            str or None: The path of the written file, or None if the DataFrame was empty.
+        """
+        if df.empty:
+            return None
+        directory = os.path.join(self.root, "category={}".format(self._partition(category or "unknown")),
+                                 "date={}".format(self.run_date.isoformat()))
+        with self._lock:
+            self.files += 1
+            self.rows += len(df)
+            number = self.files
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "part-{}-{:05d}.{}".format(self._run, number, self.EXTENSION))
+        self._write_table(self.table(df), path)
+        return path
+
+    def table(self, df: pd.DataFrame) -> "pa.Table":
+        """Convert a DataFrame to an Arrow table of strings with dictionary-encoded repetitive columns.
+
+        Args:
+            df (DataFrame): A DataFrame produced by the Transformer.
+
+        Returns:
+            Table: The Arrow table.
+        """
+        arrays = []
+        for name in df.columns:
+            values = df[name].to_numpy(dtype=object)
+            array = pa.array(values, type=pa.string(), from_pandas=True)
+            if name not in self.PLAIN_COLUMNS:
+                array = array.dictionary_encode()
+            arrays.append(array)
+        return pa.Table.from_arrays(arrays, names=[str(name) for name in df.columns])
+
+    def read(self, columns: list = None, category: str = None, run_date: date = None) -> pd.DataFrame:
+        """Read the dataset back, reading only the requested columns and partitions.
+
+        Files written at different points of a stream may have different columns. Their schemas are
+        unified, and a column missing from a file reads as null.
+
+        Args:
+            columns (list, optional): Columns to read. Every column if omitted.
+            category (str, optional): Only this category.
+            run_date (date, optional): Only this run date.
+
+        Returns:
+            DataFrame: The rows read.
+        """
+        partitioning = ds.partitioning(pa.schema([("category", pa.string()), ("date", pa.string())]),
+                                       flavor="hive")
+        dataset = ds.dataset(self.root, format=self.FORMAT, partitioning=partitioning)
+        schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+        if not schemas:
+            return pd.DataFrame(columns=columns)
+        schema = pa.unify_schemas(schemas + [partitioning.schema])
+        dataset = ds.dataset(self.root, format=self.FORMAT, partitioning=partitioning, schema=schema)
+        condition = None
+        if category is not None:
+            condition = ds.field("category") == self._partition(category)
+        if run_date is not None:
+            on_date = ds.field("date") == run_date.isoformat()
+            condition = on_date if condition is None else condition & on_date
+        return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+    @abstractmethod
+    def _write_table(self, table: "pa.Table", path: str) -> None:
+        """Write an Arrow table to a file in the format of the sink.
+
+        Subclasses must implement this method for their file format.
+        """
+        pass
+
+    @staticmethod
+    def _partition(value: str) -> str:
+        """Make a value safe to use as a partition directory name."""
+        return re.sub(r"[^\w.-]", "_", str(value))
+
+
+class ParquetSink(ColumnarSink):
+    """Columnar sink writing Parquet files.
+
+    Attributes:
+        COMPRESSION (str): Default compression codec.
+    """
+
+    FORMAT: str = "parquet"
+    EXTENSION: str = "parquet"
+    COMPRESSION: str = "zstd"
+
+    def __init__(self, root: str, run_date: date = None, compression: str = None) -> None:
+        """Initialize the sink.
+
+        Args:
+            root (str): Root directory of the dataset.
+            run_date (date, optional): Date partition of the files written. Today if omitted.
+            compression (str, optional): Compression codec.
+        """
+        super().__init__(root, run_date=run_date)
+        self.compression = compression or self.COMPRESSION
+
+    def _write_table(self, table: "pa.Table", path: str) -> None:
+        pq.write_table(table, path, compression=self.compression, use_dictionary=True)
+
+
+class FeatherSink(ColumnarSink):
+    """Columnar sink writing Feather (Arrow IPC) files, which keep dictionary-encoded columns as such.
+
+    Attributes:
+        COMPRESSION (str): Default compression codec.
+    """
+
+    FORMAT: str = "feather"
+    EXTENSION: str = "feather"
+    COMPRESSION: str = "lz4"
+
+    def __init__(self, root: str, run_date: date = None, compression: str = None) -> None:
+        """Initialize the sink.
+
+        Args:
+            root (str): Root directory of the dataset.
+            run_date (date, optional): Date partition of the files written. Today if omitted.
+            compression (str, optional): Compression codec.
+        """
+        super().__init__(root, run_date=run_date)
+        self.compression = compression or self.COMPRESSION
+
+    def _write_table(self, table: "pa.Table", path: str) -> None:
+        feather.write_feather(table, path, compression=self.compression)
+
+
+SINKS = {"parquet": ParquetSink, "feather": FeatherSink}
@@ -1,40 +1,379 @@
-import pandas as pd
+from __future__ import annotations
+from etl.records import ItemRecord
+from typing import Iterable, Iterator
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+class ColumnRegistry:
+    """Column-oriented buffer used to build a DataFrame in a single pass.
+
+    Each column is a list of values indexed by row number, kept in a dict so that looking up
+    a column is constant time. Columns keep the order in which they were first seen, and
+    rows that lack a column are filled with NaN, as `pd.concat` would.
+
+    Attributes:
+        columns (dict): Mapping of column name to its list of values.
+        rows (int): Number of rows appended so far.
+
+    Methods:
+        append(record: dict): Append a row to the registry.
+        build() -> DataFrame: Build a DataFrame from the registered columns.
+        wide(frame: DataFrame) -> DataFrame: The built DataFrame in the wide layout.
+    """
+
+    MISSING = float("nan")
+
+    def __init__(self, columns: list = None) -> None:
+        """Initialize the ColumnRegistry.
+
+        Args:
+            columns (list, optional): Columns registered up front, in output order.
+        """
+        self.columns = {name: [] for name in columns or []}
+        self.rows = 0
+
+    def append(self, record: dict) -> None:
+        """Append a row to the registry.
+
+        Args:
+            record (dict): Mapping of column name to value for the new row.
+        """
+        for name, value in record.items():
+            column = self.columns.get(name)
+            if column is None:
+                column = self.columns[name] = [self.MISSING] * self.rows
+            column.append(value)
+        self.rows += 1
+        if len(record) < len(self.columns):
+            for column in self.columns.values():
+                if len(column) < self.rows:
+                    column.append(self.MISSING)
+
+    def build(self) -> pd.DataFrame:
+        """Build a DataFrame from the registered columns.
+
+        Returns:
+            DataFrame: A DataFrame with one column per registered name, in registration order.
+        """
+        return pd.DataFrame(self.columns, columns=list(self.columns))
+
+    def wide(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """The built DataFrame in the wide layout, one object column per attribute.
+
+        Args:
+            frame (DataFrame): A DataFrame built by this registry.
+
+        Returns:
+            DataFrame: The same DataFrame, which already is wide.
+        """
+        return frame
+
+
+class SparseRegistry(ColumnRegistry):
+    """Column registry that builds every attribute column as a pandas sparse column.
+
+    Only the values present are stored, with their positions, so the memory of an attribute column grows
+    with the items that have it rather than with every item.
+    """
+
+    def __init__(self, columns: list = None) -> None:
+        """Initialize the SparseRegistry.
+
+        Args:
+            columns (list, optional): Fixed columns, registered up front and kept dense.
+        """
+        super().__init__(columns)
+        self._fixed = set(columns or [])
+
+    def build(self) -> pd.DataFrame:
+        """Build a DataFrame with dense fixed columns and sparse attribute columns.
+
+        Returns:
+            DataFrame: A DataFrame with one column per registered name, in registration order.
+        """
+        dtype = pd.SparseDtype(object, np.nan)
+        return pd.DataFrame({
+            name: column if name in self._fixed else pd.arrays.SparseArray(column, fill_value=np.nan, dtype=dtype)
+            for name, column in self.columns.items()
+        }, columns=list(self.columns))
+
+    def wide(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """The built DataFrame with its sparse columns made dense.
+
+        Args:
+            frame (DataFrame): A DataFrame built by this registry.
+
+        Returns:
+            DataFrame: The wide DataFrame.
+        """
+        return pd.DataFrame({
+            name: frame[name] if name in self._fixed else frame[name].sparse.to_dense()
+            for name in frame.columns
+        }, columns=frame.columns)
+
+
+class LongRegistry:
+    """Registry that keeps attributes as a long table instead of one column per attribute.
+
+    Fixed columns are kept in a ColumnRegistry with one row per item. Attributes are kept as
+    (row, item_id, attribute, value) entries, with categorical `item_id`, `attribute` and `value` columns.
+    Each distinct name and value is then stored once, however many items share it.
+
+    Attributes:
+        items (ColumnRegistry): The fixed columns of every item.
+        order (dict): Attribute names in first-seen order.
+        rows (int): Number of items appended so far.
+
+    Methods:
+        append(record: dict): Append an item.
+        build() -> DataFrame: Build the long attributes table.
+        wide(frame: DataFrame) -> DataFrame: Pivot the long table back to the wide layout.
+    """
+
+    def __init__(self, columns: list = None) -> None:
+        """Initialize the LongRegistry.
+
+        Args:
+            columns (list, optional): Fixed columns, kept one row per item.
+        """
+        self.items = ColumnRegistry(columns)
+        self.order = {}
+        self._fixed = set(columns or [])
+        self._rows = []
+        self._names = []
+        self._values = []
+
+    @property
+    def rows(self) -> int:
+        """Number of items appended so far."""
+        return self.items.rows
+
+    @property
+    def columns(self) -> dict:
+        """Fixed column and attribute names, in the order of the wide layout."""
+        return dict.fromkeys(list(self.items.columns) + list(self.order))
+
+    def append(self, record: dict) -> None:
+        """Append an item.
+
+        Args:
+            record (dict): Mapping of column name to value for the item.
+        """
+        row = self.items.rows
+        fixed = {}
+        for name, value in record.items():
+            if name in self._fixed:
+                fixed[name] = value
+            else:
+                self.order.setdefault(name)
+                self._rows.append(row)
+                self._names.append(name)
+                self._values.append(value)
+        self.items.append(fixed)
+
+    def build(self) -> pd.DataFrame:
+        """Build the long attributes table.
+
+        Returns:
+            DataFrame: One row per attribute of each item, with its item row, item ID, attribute and value.
+        """
+        rows = np.asarray(self._rows, dtype=np.int32)
+        ids = self.items.columns.get('id')
+        return pd.DataFrame({
+            'row': rows,
+            'item_id': pd.Categorical([ids[row] for row in self._rows] if ids is not None else [None] * len(rows)),
+            'attribute': pd.Categorical(self._names, categories=list(self.order)),
+            'value': pd.Categorical(self._values)
+        })
+
+    def wide(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Pivot the long attributes table back to the wide layout.
+
+        Args:
+            frame (DataFrame): The long table built by this registry.
+
+        Returns:
+            DataFrame: The fixed columns followed by one object column per attribute, in first-seen order.
+        """
+        items = self.items.build()
+        names = list(frame['attribute'].cat.categories)
+        grid = np.full((len(items), len(names)), ColumnRegistry.MISSING, dtype=object)
+        grid[frame['row'].to_numpy(), frame['attribute'].cat.codes.to_numpy()] = frame['value'].astype(object).to_numpy()
+        attributes = pd.DataFrame(grid, columns=names, index=items.index)
+        return pd.concat([items, attributes], axis=1)
+
 
 class Transformer:
     """Data transformation class responsible for transforming MercadoLibre API response into a DataFrame.
 
-    This class takes a MercadoLibre API response and extracts relevant information to create a structured DataFrame.
+    This class takes MercadoLibre API responses and extracts relevant information to create a structured DataFrame.
+    Rows are accumulated column by column and the DataFrame is only built when it is read. For large crawls,
+    `stream` yields fixed-size chunks instead, so memory does not grow with the number of results.
+    Responses can be decoded search pages, typed SearchPages or sequences of compact ItemRecords.
+
+    The attributes are laid out according to `layout`. "wide", the default, gives one object column per
+    attribute. "sparse" gives the same columns as pandas sparse columns. "long" makes `df` a table of
+    (row, item_id, attribute, value) with categorical columns, and `items` holds the fixed columns.
+    `to_wide` returns the wide shape in every layout. `stream` always produces wide chunks.
 
     Attributes:
-        df (DataFrame): Pandas DataFrame to store the transformed data.
+        COLUMNS (list): Fixed columns taken from every search result.
+        LAYOUTS (dict): Registry class of each attribute layout.
+        layout (str): The attribute layout.
+        df (DataFrame): Pandas DataFrame with the transformed data.
+        items (DataFrame): The fixed columns of every item.
+        schema (dict): Every column seen by `stream`, in first-seen order.
 
     Methods:
-        transform(response): Transform the API response into a structured DataFrame.
+        feed(response): Add the results of an API response to the transformation.
+        transform(*responses): Transform one or more API responses into a structured DataFrame.
+        stream(responses, chunk_size): Transform API responses into DataFrame chunks of bounded size.
+        conform(chunk): Reindex a streamed chunk to the final schema.
+        to_wide(): The transformed data in the wide layout.
     """
 
-    def __init__(self) -> None:
+    COLUMNS: list = ['id', 'title', 'condition', 'thumbnail_id']
+    LAYOUTS: dict = {"wide": ColumnRegistry, "sparse": SparseRegistry, "long": LongRegistry}
+
+    def __init__(self, layout: str = "wide") -> None:
         """Initialize the Transformer.
 
-        Initializes an empty Pandas DataFrame for storing transformed data.
+        Initializes an empty column registry for storing transformed data.
 
         Args:
-            None
+            layout (str): The attribute layout: "wide", "sparse" or "long".
+
+        Raises:
+            ValueError: If the layout is unknown.
         """
-        self.df = pd.DataFrame()
+        if layout not in self.LAYOUTS:
+            raise ValueError("Unknown layout {!r}, expected one of {}.".format(layout, list(self.LAYOUTS)))
+        self.layout = layout
+        self._registry = self.LAYOUTS[layout](self.COLUMNS)
+        self._df = None
+        self.schema = dict.fromkeys(self.COLUMNS)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """DataFrame with every result fed so far, built once and cached until new data arrives."""
+        if self._df is None:
+            self._df = self._registry.build()
+        return self._df
 
-    def transform(self, response):
-        """Transform the API response into a structured DataFrame.
+    @property
+    def items(self) -> pd.DataFrame:
+        """The fixed columns of every item."""
+        if self.layout == "long":
+            return self._registry.items.build()
+        return self.df[self.COLUMNS]
+
+    def to_wide(self) -> pd.DataFrame:
+        """The transformed data in the wide layout, one object column per attribute.
+
+        Returns:
+            DataFrame: The same frame the "wide" layout builds.
+        """
+        return self._registry.wide(self.df)
 
-        This method processes the provided API response, extracts relevant information, and creates a structured DataFrame with specific columns.
+    def feed(self, response: dict) -> None:
+        """Add the results of an API response to the transformation.
 
         Args:
-            response (dict): The MercadoLibre API response.
+            response (dict, SearchPage or Iterable[ItemRecord]): The MercadoLibre API response, or its records.
 
         Returns:
             None
         """
-        columns = ['id', 'title', 'condition', 'thumbnail_id']
+        append = self._registry.append
+        for result_dict in self._records(response):
+            append(result_dict)
+        self._df = None
+
+    def transform(self, *responses):
+        """Transform one or more API responses into a structured DataFrame.
+
+        This method processes the provided API responses, extracts relevant information, and creates a structured DataFrame with specific columns.
+
+        Args:
+            *responses (dict): The MercadoLibre API responses.
+
+        Returns:
+            DataFrame: The transformed data, including results from earlier calls.
+        """
+        for response in responses:
+            self.feed(response)
 
+        print("\n", self.df)
+        return self.df
+
+    def stream(self, responses: Iterable[dict], chunk_size: int = 1000) -> Iterator[pd.DataFrame]:
+        """Transform API responses into DataFrame chunks of bounded size.
+
+        Responses are consumed lazily and at most `chunk_size` rows are buffered at a time, so peak memory
+        does not depend on the number of pages. Each chunk carries every column seen so far; attributes that
+        first appear in a later chunk are added to `schema`, and `conform` brings earlier chunks up to it.
+
+        Args:
+            responses (Iterable[dict]): The MercadoLibre API responses, typically a generator of search pages.
+            chunk_size (int): Maximum number of rows per chunk.
+
+        Yields:
+            DataFrame: The transformed rows of each chunk.
+        """
+        registry = ColumnRegistry(self.COLUMNS)
+        for response in responses:
+            for result_dict in self._records(response):
+                registry.append(result_dict)
+                if registry.rows >= chunk_size:
+                    yield self._flush(registry)
+                    registry = ColumnRegistry(self.COLUMNS)
+        if registry.rows:
+            yield self._flush(registry)
+
+    def conform(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Reindex a streamed chunk to the final schema.
+
+        Args:
+            chunk (DataFrame): A chunk yielded by `stream`.
+
+        Returns:
+            DataFrame: The chunk with every column of `schema`, in schema order.
+        """
+        return chunk.reindex(columns=list(self.schema))
+
+    def _flush(self, registry: ColumnRegistry) -> pd.DataFrame:
+        """Register the columns of a chunk in the schema and build it.
+
+        Args:
+            registry (ColumnRegistry): The registry holding the rows of the chunk.
+
+        Returns:
+            DataFrame: The chunk with every column seen so far, in schema order.
+        """
+        for name in registry.columns:
+            self.schema.setdefault(name)
+        return self.conform(registry.build())
+
+    def _records(self, response: dict) -> Iterator[dict]:
+        """Flatten the results of an API response into rows.
+
+        Each search result becomes a row with the fixed columns plus one column per attribute name.
+
+        Args:
+            response (dict, SearchPage or Iterable[ItemRecord]): The MercadoLibre API response, or its records.
+
+        Yields:
+            dict: Mapping of column name to value for each result.
+        """
+        if not isinstance(response, dict):
+            items = response.results if hasattr(response, 'results') else response
+            for item in items:
+                if not isinstance(item, ItemRecord):
+                    item = ItemRecord.from_result(item)
+                yield item.row()
+            return
         for result in response['results']:
             result_dict = {
                 'id': result['id'],
@@ -44,16 +383,6 @@ class Transformer:
             }
 
             for attribute in result['attributes']:
-                attribute_name = attribute['name']
-                attribute_value = attribute['value_name']
-                result_dict[attribute_name] = attribute_value
-
-                if attribute_name not in columns:
-                    columns.append(attribute_name)
+                result_dict[attribute['name']] = attribute['value_name']
 
-            self.df = pd.concat(
-                [self.df, pd.DataFrame([result_dict])], ignore_index=True)
-
-        self.df = self.df[columns]
-
-        print("\n", self.df)
+            yield result_dict
@@ -1,18 +1,44 @@
-from database.db import engine, Base  # Importing the database engine and Base
+from database.db import get_engine  # Importing the lazily created database engine
 from etl.etl_client import MeliClient  # Importing the ETL client
-import logging, sys  # Importing the logging and sys modules
+from etl.sinks import SINKS  # Importing the columnar sinks
+import argparse, logging, sys  # Importing the argparse, logging and sys modules
 from sqlalchemy.orm import sessionmaker  # Importing the sessionmaker
 
-# Loop through and remove existing log handlers
-for handler in logging.root.handlers[:]:
-    logging.root.removeHandler(handler)
+# Parse the command line: without --jobs the search is interactive
+parser = argparse.ArgumentParser(description="MercadoLibre search ETL")
+parser.add_argument("--jobs", help="JSONL file with one search job per line, run without user interaction")
+parser.add_argument("--workers", type=int, default=2, help="Number of batch jobs run at the same time")
+parser.add_argument("--shard", metavar="KEYWORD", help="Keyword searched in full by splitting it into filtered sub-queries run on --workers")
+parser.add_argument("--transform-workers", type=int, help="Processes the search pages are transformed on")
+parser.add_argument("--archive", help="Directory where the raw API responses are archived")
+parser.add_argument("--sink", help="Directory where every transformed batch is also written as columnar files")
+parser.add_argument("--sink-format", choices=sorted(SINKS), default="parquet", help="Format of the columnar files")
+parser.add_argument("--incremental", action="store_true", help="Only transform and load items that are new or changed since the last run of the same search")
+parser.add_argument("--replay", help="Directory of an archive to transform and load instead of querying the API")
 
-# Configure logging to display INFO-level log messages to the console
-logging.basicConfig(stream=sys.stdout, level=logging.INFO)
+# Run only as a script: the worker processes of the parallel transform import this module on platforms that spawn them
+if __name__ == "__main__":
+    args = parser.parse_args()
 
-# Create a new session using the sessionmaker and the database engine
-session = sessionmaker(engine)()
+    # Loop through and remove existing log handlers
+    for handler in logging.root.handlers[:]:
+        logging.root.removeHandler(handler)
 
-# Initialize the MeliClient with the session and start the ETL process
-meli = MeliClient(session=session)
-meli.start()
+    # Configure logging to display INFO-level log messages to the console
+    logging.basicConfig(stream=sys.stdout, level=logging.INFO)
+
+    # Create a new session using the sessionmaker and the database engine
+    session = sessionmaker(get_engine())()
+
+    # Initialize the MeliClient with the session and start the ETL process
+    sink = SINKS[args.sink_format](args.sink) if args.sink else None
+    meli = MeliClient(session=session, archive_path=args.archive, sink=sink, incremental=args.incremental,
+                      transform_workers=args.transform_workers)
+    if args.replay:
+        meli.replay(args.replay)
+    elif args.jobs:
+        meli.run_batch(args.jobs, workers=args.workers)
+    elif args.shard:
+        meli.run_sharded(args.shard, workers=args.workers)
+    else:
+        meli.start()
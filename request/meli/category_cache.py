@@ -0,0 +1,352 @@
+from database.client import DataBaseClient
+from database.models.category_attributes import CategoryAttributesEntry
+from database.models.category_prediction import CategoryPrediction
+from datetime import datetime, timedelta
+from request.response_archive import ResponseArchive
+from utils.cache import TTLCache
+from utils.exceptions import DataBaseError
+from utils.http_request import CategoryAttributes, CategoryPredictor, validate
+from utils.time import _exceeded
+import copy
+import logging
+import time
+import unicodedata
+
+class CategoryCache:
+    """Two-tier cache in front of CategoryPredictor.
+
+    Predictions are looked up by normalized keyword first in an in-memory LRU cache and then in the
+    `category_prediction` table, so a warm restart does not need the domain discovery endpoint for
+    keywords seen in earlier runs. Only misses in both tiers reach the network. If the table is not
+    available the cache keeps working in memory only.
+
+    Attributes:
+        MEMORY_TTL (int): Seconds a prediction stays in memory.
+        PERSISTENT_TTL (timedelta): Age after which a stored prediction is fetched again.
+        memory (TTLCache): The in-memory tier.
+        persistent_hits (int): Lookups served by the persistent tier.
+
+    Methods:
+        normalize(keyword: str) -> str: Normalize a keyword into a cache key.
+        predict(keyword: str, credential: dict) -> list or None: Retrieve the domain discovery results of a keyword.
+        stats() -> dict: Hit counters of both tiers.
+    """
+
+    MEMORY_TTL: int = 3600
+    PERSISTENT_TTL: timedelta = timedelta(days=7)
+
+    def __init__(self, db: DataBaseClient = None, maxsize: int = 1024) -> None:
+        """Initialize the CategoryCache.
+
+        Args:
+            db (DataBaseClient, optional): Database client for the persistent tier; memory only if omitted.
+            maxsize (int): Maximum number of predictions kept in memory.
+        """
+        self._db = db
+        self.memory = TTLCache(maxsize=maxsize, ttl=self.MEMORY_TTL)
+        self.persistent_hits = 0
+
+    @staticmethod
+    def normalize(keyword: str) -> str:
+        """Normalize a keyword into a cache key.
+
+        Lowercases, strips accents and collapses whitespace, so "Celular  Motorola" and "celular motorola"
+        share an entry.
+
+        Args:
+            keyword (str): The user's keyword.
+
+        Returns:
+            str: The normalized keyword.
+        """
+        decomposed = unicodedata.normalize("NFKD", keyword.lower())
+        stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+        return " ".join(stripped.split())
+
+    def predict(self, keyword: str, credential: dict) -> list or None:
+        """Retrieve the domain discovery results of a keyword.
+
+        Args:
+            keyword (str): The user's keyword.
+            credential (dict): The API credentials.
+
+        Returns:
+            list or None: The domain discovery results, or None if the request failed.
+        """
+        key = self.normalize(keyword)
+        payload = self.memory.get(key)
+        if payload is not None:
+            return payload
+        payload = self._load(key)
+        if payload is not None:
+            self.persistent_hits += 1
+            self.memory.set(key, payload)
+            return payload
+        response = CategoryPredictor(keyword, credential).get()
+        if not validate(response):
+            return None
+        payload = response.json()
+        self.memory.set(key, payload)
+        self._store(key, payload)
+        return payload
+
+    def stats(self) -> dict:
+        """Hit counters of both tiers.
+
+        Returns:
+            dict: Lookups, memory hits, persistent hits, network fetches and the overall hit rate.
+        """
+        memory_hits = self.memory.hits
+        lookups = memory_hits + self.memory.misses
+        fetches = self.memory.misses - self.persistent_hits
+        return {
+            "lookups": lookups,
+            "memory_hits": memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "fetches": fetches,
+            "hit_rate": (memory_hits + self.persistent_hits) / lookups if lookups else 0.0
+        }
+
+    def _load(self, key: str) -> list or None:
+        """Read a fresh prediction from the persistent tier.
+
+        Args:
+            key (str): The normalized keyword.
+
+        Returns:
+            list or None: The stored prediction, or None if missing, stale or unavailable.
+        """
+        if self._db is None:
+            return None
+        try:
+            stored = self._db._get_by_key(CategoryPrediction, keyword=key)
+        except DataBaseError as e:
+            self._disable(e)
+            return None
+        if stored is None or _exceeded(t1=stored.date, t2=datetime.now(), threshold=self.PERSISTENT_TTL):
+            return None
+        return stored.payload
+
+    def _store(self, key: str, payload: list) -> None:
+        """Write a prediction to the persistent tier.
+
+        Args:
+            key (str): The normalized keyword.
+            payload (list): The domain discovery results.
+
+        Returns:
+            None
+        """
+        if self._db is None:
+            return
+        try:
+            self._db.upsert(CategoryPrediction, [{"keyword": key, "date": datetime.now(), "payload": payload}],
+                            key="keyword")
+        except DataBaseError as e:
+            self._disable(e)
+
+    def _disable(self, error: Exception) -> None:
+        """Fall back to memory only after a database error.
+
+        Args:
+            error (Exception): The database error.
+
+        Returns:
+            None
+        """
+        logging.warning("Category cache persistent tier disabled: {}".format(error))
+        self._db.session_rollback()
+        self._db = None
+
+
+class AttributesCache:
+    """Conditional-request cache for CategoryAttributes payloads.
+
+    Attribute lists are kept in memory and in the `category_attributes` table together with the `ETag`
+    and `Last-Modified` headers they were served with. Once an entry is older than `FRESH_FOR`, it is
+    revalidated with `If-None-Match`/`If-Modified-Since`; a 304 answer keeps the local copy, so the
+    payload is neither downloaded nor parsed again. In offline mode entries are served without any
+    request, however old they are, and a failed request also falls back to the stored copy.
+
+    Attributes:
+        FRESH_FOR (int): Seconds an entry is served without revalidation.
+        MEMORY_TTL (int): Seconds an entry stays in memory.
+        offline (bool): Whether to serve stored entries without contacting the API.
+        memory (TTLCache): The in-memory tier.
+        archive (ResponseArchive): Archive downloaded payloads are written to, if any.
+
+    Methods:
+        get(category_id: str, credential: dict) -> list or None: Retrieve the attributes of a category.
+        stats() -> dict: Request, revalidation and transfer counters.
+    """
+
+    FRESH_FOR: int = 600
+    MEMORY_TTL: int = 86400
+
+    def __init__(self, db: DataBaseClient = None, maxsize: int = 256, offline: bool = False,
+                 archive: ResponseArchive = None) -> None:
+        """Initialize the AttributesCache.
+
+        Args:
+            db (DataBaseClient, optional): Database client for the persistent tier; memory only if omitted.
+            maxsize (int): Maximum number of categories kept in memory.
+            offline (bool): Whether to serve stored entries without contacting the API.
+            archive (ResponseArchive, optional): Archive for the downloaded payloads.
+        """
+        self._db = db
+        self.offline = offline
+        self.archive = archive
+        self.memory = TTLCache(maxsize=maxsize, ttl=self.MEMORY_TTL)
+        self._stats = {"requests": 0, "downloads": 0, "not_modified": 0, "stale_served": 0,
+                       "bytes_downloaded": 0, "bytes_saved": 0}
+
+    def get(self, category_id: str, credential: dict) -> list or None:
+        """Retrieve the attributes of a category.
+
+        The returned list is a copy, since callers such as SelectionHandler mark filters and options as
+        selected in place.
+
+        Args:
+            category_id (str): The category ID.
+            credential (dict): The API credentials.
+
+        Returns:
+            list or None: The category attributes, or None if they are neither cached nor retrievable.
+        """
+        entry = self.memory.get(category_id) or self._load(category_id)
+        if entry and (self.offline or time.monotonic() - entry["checked"] < self.FRESH_FOR):
+            if self.offline:
+                self._stats["stale_served"] += 1
+            return copy.deepcopy(entry["payload"])
+        if self.offline:
+            return None
+        entry = self._revalidate(category_id, credential, entry)
+        return copy.deepcopy(entry["payload"]) if entry else None
+
+    def stats(self) -> dict:
+        """Request, revalidation and transfer counters.
+
+        Returns:
+            dict: Requests sent, full downloads, 304 answers, stale entries served, bytes downloaded and
+                bytes saved by 304 answers.
+        """
+        return dict(self._stats)
+
+    def _revalidate(self, category_id: str, credential: dict, entry: dict or None) -> dict or None:
+        """Request the attributes of a category, conditionally if an entry is cached.
+
+        Args:
+            category_id (str): The category ID.
+            credential (dict): The API credentials.
+            entry (dict or None): The cached entry.
+
+        Returns:
+            dict or None: The up to date entry, the stale entry if the request failed, or None.
+        """
+        headers = dict(credential or {})
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        self._stats["requests"] += 1
+        try:
+            response = CategoryAttributes(category_id, headers).get()
+        except Exception as e:
+            if not entry:
+                raise
+            logging.warning("Serving stale attributes of {}: {}".format(category_id, e))
+            self._stats["stale_served"] += 1
+            return entry
+        if response.status_code == 304 and entry:
+            self._stats["not_modified"] += 1
+            self._stats["bytes_saved"] += entry["size"] or 0
+            entry["checked"] = time.monotonic()
+            self.memory.set(category_id, entry)
+            self._store(category_id, entry)
+            return entry
+        if not validate(response):
+            if entry:
+                self._stats["stale_served"] += 1
+            return entry
+        self._stats["downloads"] += 1
+        self._stats["bytes_downloaded"] += len(response.content)
+        if self.archive is not None:
+            self.archive.store(response.url, response)
+        entry = {
+            "payload": response.json(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "size": len(response.content),
+            "checked": time.monotonic()
+        }
+        self.memory.set(category_id, entry)
+        self._store(category_id, entry)
+        return entry
+
+    def _load(self, category_id: str) -> dict or None:
+        """Read an entry from the persistent tier.
+
+        Stored entries are considered fresh for `FRESH_FOR` seconds after the date they were last checked.
+
+        Args:
+            category_id (str): The category ID.
+
+        Returns:
+            dict or None: The stored entry, or None if missing or unavailable.
+        """
+        if self._db is None:
+            return None
+        try:
+            stored = self._db._get_by_key(CategoryAttributesEntry, category_id=category_id)
+        except DataBaseError as e:
+            self._disable(e)
+            return None
+        if stored is None:
+            return None
+        age = (datetime.now() - stored.date).total_seconds()
+        entry = {
+            "payload": stored.payload,
+            "etag": stored.etag,
+            "last_modified": stored.last_modified,
+            "size": stored.size,
+            "checked": time.monotonic() - max(age, 0)
+        }
+        self.memory.set(category_id, entry)
+        return entry
+
+    def _store(self, category_id: str, entry: dict) -> None:
+        """Write an entry to the persistent tier.
+
+        Args:
+            category_id (str): The category ID.
+            entry (dict): The entry to store.
+
+        Returns:
+            None
+        """
+        if self._db is None:
+            return
+        try:
+            self._db.upsert(CategoryAttributesEntry, [{
+                "category_id": category_id,
+                "date": datetime.now(),
+                "etag": entry["etag"],
+                "last_modified": entry["last_modified"],
+                "size": entry["size"],
+                "payload": entry["payload"]
+            }], key="category_id")
+        except DataBaseError as e:
+            self._disable(e)
+
+    def _disable(self, error: Exception) -> None:
+        """Fall back to memory only after a database error.
+
+        Args:
+            error (Exception): The database error.
+
+        Returns:
+            None
+        """
+        logging.warning("Attributes cache persistent tier disabled: {}".format(error))
+        self._db.session_rollback()
+        self._db = None
@@ -1,31 +1,66 @@
+from __future__ import annotations
 from database.client import DataBaseClient
 from database.models.connection import Connection
-from database.models.request import RequestModel
-from requests import Response
+from database.request_log import RequestLog
+from request.meli.category_cache import AttributesCache, CategoryCache
 from request.meli.user_controls.console_uc import ConsoleUserControl
+from request.meli.request_paginator import Paginator
 from request.meli.request_settings import Credential, RequestSettings
+from request.meli.request_user_control import UserControl
+from request.request_async import AsyncResponse, AsyncTransport
+from request.response_archive import ResponseArchive
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
 from utils.http_request import validate
+import threading
+
+if TYPE_CHECKING:
+    from requests import Response
 
 class RequestClient:
     """Handles MercadoLibre product search requests and manages the database.
 
     Attributes:
         _db (DataBaseClient): An instance of the database client used for data storage.
+        max_workers (int): Number of search pages fetched at the same time.
+        category_cache (CategoryCache): Cache of category predictions shared by every search.
+        attributes_cache (AttributesCache): Cache of category attributes shared by every search.
+        request_log (RequestLog): Write-behind log of the search requests.
+        archive (ResponseArchive): Archive the raw search and attributes responses are written to, if any.
+        user_control (UserControl): User control of the latest search started by `search_pages`.
 
     Methods:
         search(access_token: str) -> Response or None: Initiates a product search request, manages database records, and returns the response.
+        search_pages(access_token: str, user_control: UserControl, raw: bool) -> Iterator[dict]: Initiates a product search request and yields every page of results.
+        search_pages_async(access_token: str, concurrency: int) -> AsyncIterator[dict]: Asynchronous version of search_pages.
+        probe(access_token: str, user_control: UserControl) -> dict or None: Request only the first page of a search.
+        connection() -> Connection: The connection requests are logged with.
 
     Args:
         db (DataBaseClient): An instance of the database client used for data storage.
+        max_workers (int): Number of search pages fetched at the same time.
+        offline (bool): Whether category attributes are served from the cache without contacting the API.
+        archive (ResponseArchive, optional): Archive for the raw search and attributes responses.
     """
 
-    def __init__(self, db: DataBaseClient) -> None:
+    def __init__(self, db: DataBaseClient, max_workers: int = 4, offline: bool = False,
+                 archive: ResponseArchive = None) -> None:
         """Initializes a RequestClient instance.
 
         Args:
             db (DataBaseClient): An instance of the database client used for data storage.
+            max_workers (int): Number of search pages fetched at the same time.
+            offline (bool): Whether category attributes are served from the cache without contacting the API.
+            archive (ResponseArchive, optional): Archive for the raw search and attributes responses.
         """
         self._db = db
+        self.max_workers = max_workers
+        self.archive = archive
+        self.user_control = None
+        self.category_cache = CategoryCache(db=db)
+        self.attributes_cache = AttributesCache(db=db, offline=offline, archive=archive)
+        self.request_log = RequestLog(db=db)
+        self._connection = None
+        self._connection_lock = threading.Lock()
 
     def search(self, access_token: str) -> Response or None:
         """Initiates a product search request and manages database records.
@@ -39,14 +74,135 @@ class RequestClient:
         print("\nWelcome to Intelicom")
         credential = Credential(access_token)
         request_settings = RequestSettings(credential)
-        _r_usercontrol = ConsoleUserControl()
+        _r_usercontrol = ConsoleUserControl(category_cache=self.category_cache,
+                                            attributes_cache=self.attributes_cache)
         response, url = _r_usercontrol.user_request(request_settings)
         if not response and not url:
             return None
         connection = self._db._last(Connection)
-        req_bd = RequestModel(url=url, session=connection.id,
-                              status_code=response.status_code)
-        self._db._save(req_bd)
+        self._log(url, response, connection)
         if validate(response):
             return response.json()
         return None
+
+    def search_pages(self, access_token: str, user_control: UserControl = None, raw: bool = False) -> Iterator[dict]:
+        """Initiates a product search request and yields every page of results.
+
+        The first page is requested through the user control, exactly like `search`. The
+        remaining pages are walked with offset/limit by a Paginator over the same URL and
+        yielded in offset order as soon as they are available.
+
+        Args:
+            access_token (str): The access token used for authentication.
+            user_control (UserControl, optional): The user control that requests the first page. The
+                console user control is used if omitted.
+            raw (bool): Yield the raw body of every page but the first as bytes, left for the consumer to
+                decode, e.g. in another process.
+
+        Yields:
+            dict: The decoded response of each valid search page.
+        """
+        first = self._first_page(access_token, user_control)
+        if not first:
+            return
+        page, paginator, connection = first
+        yield page
+        for response in paginator.pages(page.get("paging", {})):
+            self._log(response.url, response, connection)
+            if validate(response):
+                yield response.content if raw else response.json()
+
+    async def search_pages_async(self, access_token: str, concurrency: int = None) -> AsyncIterator[dict]:
+        """Asynchronous version of search_pages.
+
+        The first page is requested through the user control as usual; the remaining pages are fetched
+        concurrently from the running event loop, with at most `concurrency` requests in flight.
+
+        Args:
+            access_token (str): The access token used for authentication.
+            concurrency (int, optional): Maximum number of in-flight requests.
+
+        Yields:
+            dict: The decoded response of each valid search page.
+        """
+        first = self._first_page(access_token)
+        if not first:
+            return
+        page, paginator, connection = first
+        yield page
+        async with AsyncTransport(limit=concurrency) as transport:
+            async for response in paginator.pages_async(page.get("paging", {}), transport):
+                self._log(response.url, response, connection)
+                if validate(response):
+                    yield response.json()
+
+    def probe(self, access_token: str, user_control: UserControl) -> dict or None:
+        """Request only the first page of a search, to read its result count and available filters.
+
+        Args:
+            access_token (str): The access token used for authentication.
+            user_control (UserControl): The user control that requests the page.
+
+        Returns:
+            dict or None: The decoded first page, or None if the search was unsuccessful.
+        """
+        first = self._first_page(access_token, user_control)
+        return first[0] if first else None
+
+    def _first_page(self, access_token: str, user_control: UserControl = None) -> tuple or None:
+        """Request the first page of a search through the user control.
+
+        Args:
+            access_token (str): The access token used for authentication.
+            user_control (UserControl, optional): The user control that requests the first page. The
+                console user control is used if omitted.
+
+        Returns:
+            tuple or None: The decoded first page, a Paginator over the search URL and the connection
+                used, or None if the search was cancelled or unsuccessful.
+        """
+        credential = Credential(access_token)
+        request_settings = RequestSettings(credential)
+        if user_control is None:
+            print("\nWelcome to Intelicom")
+            user_control = ConsoleUserControl(category_cache=self.category_cache,
+                                              attributes_cache=self.attributes_cache)
+        self.user_control = user_control
+        response, url = user_control.user_request(request_settings)
+        if not response and not url:
+            return None
+        connection = self.connection()
+        self._log(url, response, connection)
+        if not validate(response):
+            return None
+        paginator = Paginator(url=url, headers=request_settings.credential,
+                              max_workers=self.max_workers)
+        return response.json(), paginator, connection
+
+    def connection(self) -> Connection:
+        """The connection requests are logged with, looked up once and shared by every search.
+
+        Returns:
+            Connection: The last stored connection.
+        """
+        with self._connection_lock:
+            if self._connection is None:
+                self._connection = self._db._last(Connection)
+            return self._connection
+
+    def _log(self, url: str, response: Response or AsyncResponse, connection: Connection) -> None:
+        """Queue a search request record, written to the database in the background, and archive the response.
+
+        Responses served by the SearchCache instead of a request of their own are neither logged nor
+        archived again.
+
+        Args:
+            url (str): The URL used for the request.
+            response (Response or AsyncResponse): The response received from the API.
+            connection (Connection): The connection the request was made with.
+        """
+        if getattr(response, "from_cache", False):
+            return
+        self.request_log.record(url, response, session=connection.id)
+        if self.archive is not None:
+            self.archive.store(url, response)
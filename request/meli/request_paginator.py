@@ -0,0 +1,144 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from request.meli.search_query import SearchQuery
+from request.request_async import AsyncRequest, AsyncResponse, AsyncTransport
+from request.request_base import Request
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, List
+import asyncio
+import logging
+import time
+
+if TYPE_CHECKING:
+    from requests import Response
+
+class Paginator:
+    """Walks the offset/limit pages of a MercadoLibre search concurrently.
+
+    Pages are fetched by a bounded worker pool but always yielded in offset order, so the
+    output of a crawl does not depend on which request happens to finish first.
+
+    Attributes:
+        MAX_OFFSET (int): Highest offset served by the search endpoint.
+        url (str): The search URL, as built by the user control.
+        query (SearchQuery): The search, parsed from the URL.
+        headers (dict): Request headers, including the authorization header.
+        max_workers (int): Number of pages fetched at the same time.
+        pages_per_second (float): Throughput of the last completed walk.
+
+    Methods:
+        offsets(paging: dict) -> List[int]: Offsets of the pages still to fetch.
+        fetch(offset: int, limit: int) -> Response: Fetch a single page.
+        pages(paging: dict) -> Iterator[Response]: Fetch the remaining pages in order.
+        pages_async(paging: dict, transport: AsyncTransport) -> AsyncIterator[AsyncResponse]: Fetch the remaining pages in order from an event loop.
+    """
+
+    MAX_OFFSET: int = 1000
+
+    def __init__(self, url: str, headers: dict, max_workers: int = 4) -> None:
+        """Initializes a Paginator instance.
+
+        Args:
+            url (str): The search URL, as built by the user control.
+            headers (dict): Request headers, including the authorization header.
+            max_workers (int): Number of pages fetched at the same time.
+        """
+        self.url = url
+        self.query = SearchQuery.from_url(url)
+        self.headers = headers
+        self.max_workers = max_workers
+        self.pages_per_second = 0.0
+
+    @classmethod
+    def offsets(cls, paging: dict) -> List[int]:
+        """Compute the offsets of the pages that follow the first one.
+
+        Args:
+            paging (dict): The `paging` block of the first search response.
+
+        Returns:
+            List[int]: Offsets of the remaining pages, in ascending order.
+        """
+        limit = paging.get("limit") or 50
+        start = paging.get("offset", 0) + limit
+        end = min(paging.get("total", 0), cls.MAX_OFFSET)
+        return list(range(start, end, limit))
+
+    def fetch(self, offset: int, limit: int) -> Response:
+        """Fetch a single page of the search.
+
+        Args:
+            offset (int): Offset of the first item of the page.
+            limit (int): Number of items per page.
+
+        Returns:
+            Response: The response object received from the API.
+        """
+        request = Request(url=self.query.page(offset, limit).url(self.url), headers=self.headers)
+        return request.get()
+
+    def pages(self, paging: dict) -> Iterator[Response]:
+        """Fetch the pages that follow the first one, yielding them in offset order.
+
+        At most `max_workers` pages are in flight, plus as many already fetched pages waiting
+        for an earlier one to complete, so memory stays bounded for long searches.
+
+        Args:
+            paging (dict): The `paging` block of the first search response.
+
+        Yields:
+            Response: The response of each page.
+        """
+        limit = paging.get("limit") or 50
+        offsets = self.offsets(paging)
+        if not offsets:
+            return
+        started = time.perf_counter()
+        fetched = 0
+        window = self.max_workers * 2
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for offset in offsets:
+                pending.append(executor.submit(self.fetch, offset, limit))
+                if len(pending) >= window:
+                    fetched += 1
+                    yield pending.popleft().result()
+            while pending:
+                fetched += 1
+                yield pending.popleft().result()
+        elapsed = time.perf_counter() - started
+        self.pages_per_second = fetched / elapsed if elapsed > 0 else 0.0
+        logging.info("Fetched {} pages in {:.2f}s ({:.2f} pages/sec, {} workers)."
+                     .format(fetched, elapsed, self.pages_per_second, self.max_workers))
+
+    async def pages_async(self, paging: dict, transport: AsyncTransport) -> AsyncIterator[AsyncResponse]:
+        """Fetch the pages that follow the first one from an event loop, yielding them in offset order.
+
+        Every page is scheduled at once and the transport bounds how many are in flight, so a single
+        event loop can keep hundreds of requests open without a thread per request.
+
+        Args:
+            paging (dict): The `paging` block of the first search response.
+            transport (AsyncTransport): The transport the pages are fetched through.
+
+        Yields:
+            AsyncResponse: The response of each page.
+        """
+        limit = paging.get("limit") or 50
+        offsets = self.offsets(paging)
+        if not offsets:
+            return
+        started = time.perf_counter()
+        tasks = [asyncio.ensure_future(AsyncRequest(url=self.query.page(offset, limit).url(self.url),
+                                                    transport=transport, headers=self.headers).get())
+                 for offset in offsets]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+        elapsed = time.perf_counter() - started
+        self.pages_per_second = len(tasks) / elapsed if elapsed > 0 else 0.0
+        logging.info("Fetched {} pages in {:.2f}s ({:.2f} pages/sec, {} in flight)."
+                     .format(len(tasks), elapsed, self.pages_per_second, transport.limit))
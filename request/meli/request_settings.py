@@ -1,3 +1,5 @@
+from utils.config import Config
+
 class Credential:
     """Represents user credentials with an access token.
 
@@ -48,4 +50,4 @@ class RequestSettings:
             credential (Credential): An instance of the Credential class.
         """
         self.credential = credential.generate()
-        self.url = "https://api.mercadolibre.com/sites/MLA/search"
+        self.url = Config.api_url("/sites/MLA/search")
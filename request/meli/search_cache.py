@@ -0,0 +1,139 @@
+from __future__ import annotations
+from request.meli.search_query import SearchQuery
+from request.request_base import Request
+from request.request_transport import ParsedResponse
+from typing import TYPE_CHECKING
+from utils.cache import SingleFlight, TTLCache
+import copy
+import os
+import threading
+
+if TYPE_CHECKING:
+    from requests import Response
+
+class SearchCache:
+    """Deduplicates search requests, in flight and recently completed.
+
+    Requests are keyed by the canonical URL of their SearchQuery and the credential they are sent with.
+    Identical searches issued at the same time share a single HTTP call, and a successful response is
+    served again for `ttl` seconds, so a search repeated by another job or control, or a shard planner
+    probe followed by the first page of the same shard, costs no extra request. It is meant for first
+    pages and probes: the pages of a Paginator walk are never requested twice and bypass it.
+
+    Only responses with status 200 are kept, without their decoded body. A response the caller did not
+    send itself, taken from the cache or from another caller's request, is a separate copy with
+    `from_cache` set, so request logs and archives can skip it.
+
+    Attributes:
+        TTL (float): Default seconds a response is served again.
+        ttl (float): Seconds a response is served again; 0 only collapses concurrent requests.
+        responses (TTLCache): Recent responses by key.
+        flights (SingleFlight): Requests in flight by key.
+
+    Methods:
+        get(query: SearchQuery, base: str, headers: dict) -> Response: Send a search, or reuse an identical one.
+        stats() -> dict: Cache and in-flight counters.
+    """
+
+    TTL: float = 30
+
+    def __init__(self, ttl: float = None, maxsize: int = 128) -> None:
+        """Initialize the SearchCache.
+
+        Args:
+            ttl (float, optional): Seconds a response is served again. TTL if omitted.
+            maxsize (int): Maximum number of responses kept.
+        """
+        self.ttl = self.TTL if ttl is None else ttl
+        self.responses = TTLCache(maxsize=maxsize, ttl=self.ttl)
+        self.flights = SingleFlight()
+
+    def get(self, query: SearchQuery, base: str, headers: dict = None) -> Response:
+        """Send a search, or reuse the response of an identical one.
+
+        Args:
+            query (SearchQuery): The search.
+            base (str): URL of the search endpoint.
+            headers (dict, optional): Request headers, including the authorization header.
+
+        Returns:
+            Response: The response of the search.
+        """
+        url = query.url(base)
+        key = (url, (headers or {}).get("Authorization"))
+        if self.ttl > 0:
+            response = self.responses.get(key)
+            if response is not None:
+                return self._copy(response)
+        response, shared = self.flights.do(key, lambda: self._send(key, url, headers))
+        return self._copy(response) if shared else response
+
+    def _send(self, key: tuple, url: str, headers: dict) -> Response:
+        """Send a search and keep its response if successful.
+
+        Args:
+            key (tuple): The cache key of the search.
+            url (str): The search URL.
+            headers (dict): Request headers.
+
+        Returns:
+            Response: The response of the search.
+        """
+        response = Request(url=url, headers=headers).get()
+        if self.ttl > 0 and response is not None and response.status_code == 200:
+            self.responses.set(key, self._copy(response))
+        return response
+
+    @staticmethod
+    def _copy(response: Response) -> Response:
+        """A copy of a response marked as served from the cache, without the decoded body of the original.
+
+        Args:
+            response (Response): The response.
+
+        Returns:
+            Response: The copy, with `from_cache` set.
+        """
+        served = ParsedResponse(response.response) if isinstance(response, ParsedResponse) else copy.copy(response)
+        served.from_cache = True
+        return served
+
+    def stats(self) -> dict:
+        """Cache and in-flight counters.
+
+        Returns:
+            dict: Counters of the response cache and of the requests shared while in flight.
+        """
+        return {**self.responses.stats(), **self.flights.stats()}
+
+_search_cache: SearchCache = None
+_search_cache_lock = threading.Lock()
+
+def get_search_cache() -> SearchCache:
+    """Return the shared search cache, creating it on first use.
+
+    Its time to live is read from the `SEARCH_CACHE_TTL` environment variable, in seconds, when set.
+
+    Returns:
+        SearchCache: The cache every search goes through.
+    """
+    global _search_cache
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                ttl = os.getenv("SEARCH_CACHE_TTL")
+                _search_cache = SearchCache(ttl=float(ttl) if ttl else None)
+    return _search_cache
+
+def set_search_cache(search_cache: SearchCache) -> None:
+    """Replace the shared search cache.
+
+    Args:
+        search_cache (SearchCache): The cache every search should go through.
+
+    Returns:
+        None
+    """
+    global _search_cache
+    with _search_cache_lock:
+        _search_cache = search_cache
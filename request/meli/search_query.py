@@ -0,0 +1,136 @@
+from typing import Iterable, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+class SearchQuery:
+    """Immutable, canonical form of a MercadoLibre search.
+
+    A search is its keyword, its selected filters and, for a single page, its offset and limit. Filters are
+    kept sorted by ID and their values sorted and deduplicated, and the keyword has its whitespace collapsed,
+    so the same search always renders the same URL and the same cache `key`, whatever order the filters were
+    selected in. Queries compare and hash by that key.
+
+    Attributes:
+        keyword (str): The search keyword.
+        filters (Tuple[Tuple[str, Tuple[str, ...]], ...]): Filter IDs and their selected value IDs, sorted.
+        offset (int): Offset of the page, or None for the first page with the API default.
+        limit (int): Items per page, or None for the API default.
+        key (str): The canonical query string, used as cache key.
+
+    Methods:
+        from_filters(keyword: str, filters: List[dict]) -> SearchQuery: Build a query from selected filters.
+        from_url(url: str) -> SearchQuery: Parse a search URL.
+        page(offset: int, limit: int) -> SearchQuery: The same search at another page.
+        params() -> List[Tuple[str, str]]: The query parameters, in canonical order.
+        url(base: str) -> str: The search URL.
+    """
+
+    __slots__ = ("keyword", "filters", "offset", "limit", "key")
+
+    def __init__(self, keyword: str, filters: Iterable[Tuple[str, Iterable]] = (), offset: int = None,
+                 limit: int = None) -> None:
+        """Initialize the SearchQuery.
+
+        Args:
+            keyword (str): The search keyword.
+            filters (Iterable[Tuple[str, Iterable]]): Filter IDs and their selected value IDs. Filters
+                without values are dropped.
+            offset (int, optional): Offset of the page.
+            limit (int, optional): Items per page.
+        """
+        canonical = {}
+        for filter_id, values in filters:
+            canonical.setdefault(str(filter_id), set()).update(str(value) for value in values)
+        assign = object.__setattr__
+        assign(self, "keyword", " ".join(str(keyword).split()))
+        assign(self, "filters", tuple((filter_id, tuple(sorted(values)))
+                                    for filter_id, values in sorted(canonical.items()) if values))
+        assign(self, "offset", None if offset is None else int(offset))
+        assign(self, "limit", None if limit is None else int(limit))
+        assign(self, "key", urlencode(self.params(), safe=","))
+
+    @classmethod
+    def from_filters(cls, keyword: str, filters: List[dict]) -> "SearchQuery":
+        """Build a query from filters in the shape returned by CategoryAttributes.
+
+        Only the values marked as `selected` are part of the query, as in `generate_query`.
+
+        Args:
+            keyword (str): The search keyword.
+            filters (List[dict]): The filters, with their values.
+
+        Returns:
+            SearchQuery: The query.
+        """
+        return cls(keyword, [(f["id"], [value["id"] for value in f.get("values", []) if value.get("selected")])
+                             for f in filters or []])
+
+    @classmethod
+    def from_url(cls, url: str) -> "SearchQuery":
+        """Parse a search URL, e.g. one built before queries were canonical.
+
+        Args:
+            url (str): The search URL.
+
+        Returns:
+            SearchQuery: The query.
+        """
+        keyword, offset, limit, filters = "", None, None, []
+        for name, value in parse_qsl(urlsplit(url).query, keep_blank_values=True):
+            if name == "q":
+                keyword = value
+            elif name == "offset":
+                offset = value
+            elif name == "limit":
+                limit = value
+            else:
+                filters.append((name, [v for v in value.split(",") if v]))
+        return cls(keyword, filters, offset, limit)
+
+    def page(self, offset: int, limit: int) -> "SearchQuery":
+        """The same search at another page.
+
+        Args:
+            offset (int): Offset of the page.
+            limit (int): Items per page.
+
+        Returns:
+            SearchQuery: The query of the page.
+        """
+        return SearchQuery(self.keyword, self.filters, offset, limit)
+
+    def params(self) -> List[Tuple[str, str]]:
+        """The query parameters in canonical order: filters by ID, then the keyword, then paging.
+
+        Returns:
+            List[Tuple[str, str]]: The parameters, values of a filter joined by commas.
+        """
+        params = [(filter_id, ",".join(values)) for filter_id, values in self.filters]
+        params.append(("q", self.keyword))
+        if self.offset is not None:
+            params.append(("offset", str(self.offset)))
+        if self.limit is not None:
+            params.append(("limit", str(self.limit)))
+        return params
+
+    def url(self, base: str) -> str:
+        """The search URL.
+
+        Args:
+            base (str): URL of the search endpoint, e.g. `RequestSettings.url`.
+
+        Returns:
+            str: The URL, its query string being the `key` of the query.
+        """
+        return "{}?{}".format(base.split("?", 1)[0], self.key)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("SearchQuery is immutable")
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SearchQuery) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return "SearchQuery({!r})".format(self.key)
@@ -0,0 +1,114 @@
+"""Typed shape of a MercadoLibre search page.
+
+Only the fields the client reads are declared. When msgspec is installed, the types are msgspec Structs
+and `decode_search` decodes the raw body straight into them, skipping every other field without building
+intermediate dicts. Without msgspec, they are plain slotted classes built from the decoded dict.
+"""
+from typing import List, Optional
+from utils.json_decoder import loads, msgspec
+
+if msgspec is not None:
+
+    class Attribute(msgspec.Struct):
+        """An attribute of a search result."""
+        id: str
+        name: str
+        value_name: Optional[str] = None
+
+    class SearchResult(msgspec.Struct):
+        """A search result."""
+        id: str
+        title: str
+        condition: Optional[str] = None
+        thumbnail_id: Optional[str] = None
+        attributes: List[Attribute] = []
+
+    class Paging(msgspec.Struct):
+        """Paging of a search."""
+        total: int = 0
+        offset: int = 0
+        limit: int = 50
+        primary_results: Optional[int] = None
+
+    class SearchPage(msgspec.Struct):
+        """A page of search results."""
+        paging: Paging = msgspec.field(default_factory=Paging)
+        results: List[SearchResult] = []
+
+    _decoder = msgspec.json.Decoder(SearchPage)
+
+    def decode_search(data: bytes) -> SearchPage:
+        """Decode the raw body of a search response into typed structs.
+
+        Args:
+            data (bytes): The raw response body.
+
+        Returns:
+            SearchPage: The decoded page.
+        """
+        return _decoder.decode(data)
+
+else:
+
+    class Attribute:
+        """An attribute of a search result."""
+        __slots__ = ("id", "name", "value_name")
+
+        def __init__(self, id: str, name: str, value_name: str = None) -> None:
+            self.id = id
+            self.name = name
+            self.value_name = value_name
+
+    class SearchResult:
+        """A search result."""
+        __slots__ = ("id", "title", "condition", "thumbnail_id", "attributes")
+
+        def __init__(self, id: str, title: str, condition: str = None, thumbnail_id: str = None,
+                     attributes: list = None) -> None:
+            self.id = id
+            self.title = title
+            self.condition = condition
+            self.thumbnail_id = thumbnail_id
+            self.attributes = attributes or []
+
+    class Paging:
+        """Paging of a search."""
+        __slots__ = ("total", "offset", "limit", "primary_results")
+
+        def __init__(self, total: int = 0, offset: int = 0, limit: int = 50, primary_results: int = None) -> None:
+            self.total = total
+            self.offset = offset
+            self.limit = limit
+            self.primary_results = primary_results
+
+    class SearchPage:
+        """A page of search results."""
+        __slots__ = ("paging", "results")
+
+        def __init__(self, paging: Paging = None, results: list = None) -> None:
+            self.paging = paging or Paging()
+            self.results = results or []
+
+    def decode_search(data: bytes) -> SearchPage:
+        """Decode the raw body of a search response into typed objects.
+
+        Args:
+            data (bytes): The raw response body.
+
+        Returns:
+            SearchPage: The decoded page.
+        """
+        page = loads(data)
+        paging = page.get("paging") or {}
+        return SearchPage(
+            paging=Paging(**{key: paging[key] for key in Paging.__slots__ if key in paging}),
+            results=[SearchResult(
+                id=result["id"],
+                title=result["title"],
+                condition=result.get("condition"),
+                thumbnail_id=result.get("thumbnail_id"),
+                attributes=[Attribute(id=attribute["id"], name=attribute["name"],
+                                      value_name=attribute.get("value_name"))
+                            for attribute in result.get("attributes", [])]
+            ) for result in page.get("results", [])]
+        )
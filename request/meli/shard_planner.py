@@ -0,0 +1,233 @@
+from request.meli.request_paginator import Paginator
+from typing import Callable, List
+import heapq
+import logging
+
+class Shard:
+    """A sub-query of a search, small enough to be paged fully.
+
+    Attributes:
+        filters (dict): Mapping of filter ID to the selected value IDs, in the shape of a batch job.
+        size (int): Number of results reported for the sub-query.
+        truncated (bool): Whether the sub-query is still larger than the offset cap, because no filter
+            was left to split it.
+
+    Methods:
+        job(keyword: str, category_id: str) -> dict: The batch job of the shard.
+    """
+
+    __slots__ = ("filters", "size", "truncated")
+
+    def __init__(self, filters: dict, size: int, truncated: bool = False) -> None:
+        """Initialize a Shard.
+
+        Args:
+            filters (dict): Mapping of filter ID to the selected value IDs.
+            size (int): Number of results reported for the sub-query.
+            truncated (bool): Whether the sub-query is larger than the offset cap.
+        """
+        self.filters = filters
+        self.size = size
+        self.truncated = truncated
+
+    def job(self, keyword: str, category_id: str = None) -> dict:
+        """The batch job of the shard, as read by BatchUserControl.
+
+        Args:
+            keyword (str): The keyword of the search.
+            category_id (str, optional): The category of the search.
+
+        Returns:
+            dict: The job.
+        """
+        return {"keyword": keyword, "filters": self.filters, "category_id": category_id}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.filters!r}, {self.size!r})"
+
+
+class ShardPlanner:
+    """Splits a search larger than the offset cap into disjoint sub-queries that can each be paged fully.
+
+    The search endpoint stops paging at `Paginator.MAX_OFFSET`. The planner probes the first page of the
+    search and splits it on one of its `available_filters`, using the result count of each value. It picks
+    a filter whose counts add up to at most the total, since such a filter partitions the results, covering
+    as many results as possible and preferring the filters listed by CategoryAttributes. Values small enough
+    are packed together into shards of up to `max_results` (values of a filter are ORed, as in
+    `generate_query`); larger ones are probed and split again on another filter. When the search response
+    has no `available_filters`, the values listed by CategoryAttributes are probed one by one instead.
+
+    Results without any value of the chosen filter are not reached by the shards; their number is logged.
+
+    Attributes:
+        probe (Callable[[dict], dict]): Requests the first page of a batch job, returning the decoded page
+            or None.
+        attributes (list): The filters of the category, as returned by CategoryAttributes.
+        max_results (int): Largest shard, in results.
+        probes (int): Probe requests made so far.
+        uncovered (int): Results of the last plan not reached by any shard.
+
+    Methods:
+        plan(keyword: str, filters: dict, category_id: str) -> List[Shard]: Split a search into shards.
+        schedule(shards: List[Shard], workers: int) -> List[List[Shard]]: Assign shards to workers.
+    """
+
+    def __init__(self, probe: Callable[[dict], dict], attributes: list = None, max_results: int = None) -> None:
+        """Initialize the ShardPlanner.
+
+        Args:
+            probe (Callable[[dict], dict]): Requests the first page of a batch job.
+            attributes (list, optional): The filters of the category, as returned by CategoryAttributes.
+            max_results (int, optional): Largest shard, in results. `Paginator.MAX_OFFSET` if omitted.
+        """
+        self.probe = probe
+        self.attributes = attributes or []
+        self.max_results = max_results or Paginator.MAX_OFFSET
+        self.probes = 0
+        self.uncovered = 0
+
+    def plan(self, keyword: str, filters: dict = None, category_id: str = None) -> List[Shard]:
+        """Split a search into disjoint shards of at most `max_results` results.
+
+        Args:
+            keyword (str): The keyword of the search.
+            filters (dict, optional): Filters already selected, as a mapping of filter ID to value IDs.
+            category_id (str, optional): The category of the search.
+
+        Returns:
+            List[Shard]: The shards, largest first.
+        """
+        self._keyword = keyword
+        self._category_id = category_id
+        self.uncovered = 0
+        filters = dict(filters or {})
+        page = self._probe(filters)
+        if page is None:
+            return []
+        shards = self._split(filters, page)
+        shards.sort(key=lambda shard: shard.size, reverse=True)
+        logging.info("Planned {} shards with {} results ({} not covered) after {} probes.".format(
+            len(shards), sum(shard.size for shard in shards), self.uncovered, self.probes))
+        return shards
+
+    @staticmethod
+    def schedule(shards: List[Shard], workers: int) -> List[List[Shard]]:
+        """Assign shards to workers with the longest-processing-time-first rule.
+
+        Shards are taken largest first and each one goes to the least loaded worker, so no worker is left
+        with a long tail. A worker pool fed with the shards in that order behaves the same way.
+
+        Args:
+            shards (List[Shard]): The shards.
+            workers (int): Number of workers.
+
+        Returns:
+            List[List[Shard]]: The shards of each worker.
+        """
+        assignment = [[] for _ in range(max(workers, 1))]
+        loads = [(0, worker) for worker in range(len(assignment))]
+        for shard in sorted(shards, key=lambda shard: shard.size, reverse=True):
+            load, worker = heapq.heappop(loads)
+            assignment[worker].append(shard)
+            heapq.heappush(loads, (load + shard.size, worker))
+        return assignment
+
+    def _split(self, filters: dict, page: dict) -> List[Shard]:
+        """Split a probed sub-query into shards, recursively.
+
+        Args:
+            filters (dict): Filters of the sub-query.
+            page (dict): First page of the sub-query.
+
+        Returns:
+            List[Shard]: The shards of the sub-query.
+        """
+        total = (page.get("paging") or {}).get("total", 0)
+        if total <= self.max_results:
+            return [Shard(filters, total)] if total else []
+        counts = self._counts(filters, page, total)
+        if counts is None:
+            logging.warning("No filter left to split {} ({} results); only the first {} are reachable.".format(
+                filters or self._keyword, total, self.max_results))
+            return [Shard(filters, total, truncated=True)]
+        filter_id, values = counts
+        self.uncovered += max(total - sum(count for _, count, _ in values), 0)
+        shards = []
+        small = []
+        for value, count, probed in values:
+            sub = dict(filters, **{filter_id: [value]})
+            if count > self.max_results:
+                probed = probed or self._probe(sub)
+                if probed is not None:
+                    shards.extend(self._split(sub, probed))
+            elif count:
+                small.append((value, count))
+        for bin_values, size in self._pack(small):
+            shards.append(Shard(dict(filters, **{filter_id: bin_values}), size))
+        return shards
+
+    def _counts(self, filters: dict, page: dict, total: int) -> tuple or None:
+        """Choose the filter to split a sub-query on, with the result count of each of its values.
+
+        Args:
+            filters (dict): Filters of the sub-query.
+            page (dict): First page of the sub-query.
+            total (int): Results of the sub-query.
+
+        Returns:
+            tuple or None: The filter ID and a list of (value ID, count, probed page or None), or None if
+                no filter can split the sub-query.
+        """
+        known = {attribute.get("id") for attribute in self.attributes}
+        best = None
+        for available in page.get("available_filters") or []:
+            if available.get("id") in filters:
+                continue
+            values = [(str(value["id"]), value.get("results") or 0) for value in available.get("values", [])]
+            covered = sum(count for _, count in values)
+            if len(values) < 2 or covered > total:
+                continue
+            score = (covered, available["id"] in known, -max(count for _, count in values))
+            if best is None or score > best[0]:
+                best = (score, available["id"], values)
+        if best is not None:
+            return best[1], [(value, count, None) for value, count in best[2]]
+        for attribute in self.attributes:
+            if attribute.get("id") in filters or len(attribute.get("values") or []) < 2:
+                continue
+            values = []
+            for value in attribute["values"]:
+                sub = dict(filters, **{attribute["id"]: [str(value["id"])]})
+                probed = self._probe(sub)
+                count = (probed.get("paging") or {}).get("total", 0) if probed else 0
+                values.append((str(value["id"]), count, probed))
+            if sum(count for _, count, _ in values) <= total:
+                return attribute["id"], values
+        return None
+
+    def _pack(self, values: list) -> List[tuple]:
+        """Pack small values into as few shards of at most `max_results` results as possible.
+
+        First-fit decreasing: values are taken largest first and placed into the first shard with room.
+
+        Args:
+            values (list): (value ID, count) pairs.
+
+        Returns:
+            List[tuple]: The value IDs and the size of each shard.
+        """
+        bins = []
+        for value, count in sorted(values, key=lambda pair: pair[1], reverse=True):
+            for entry in bins:
+                if entry[1] + count <= self.max_results:
+                    entry[0].append(value)
+                    entry[1] += count
+                    break
+            else:
+                bins.append([[value], count])
+        return [(entry[0], entry[1]) for entry in bins]
+
+    def _probe(self, filters: dict) -> dict or None:
+        """Request the first page of a sub-query."""
+        self.probes += 1
+        return self.probe(Shard(filters, 0).job(self._keyword, self._category_id))
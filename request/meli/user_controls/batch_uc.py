@@ -0,0 +1,92 @@
+from request.meli.request_settings import RequestSettings
+from request.meli.search_query import SearchQuery
+from request.meli.user_controls.console_uc import ConsoleUserControl
+from utils.exceptions import SelectionError
+from typing import List
+import json
+
+class BatchUserControl(ConsoleUserControl):
+    """Non-interactive user control for a single search job.
+
+    Each job is read from a line of a JSONL file with a keyword and, optionally, the selected filters
+    as a mapping of filter id to value ids, e.g. `{"keyword": "celular", "filters": {"BRAND": ["206"]}}`,
+    and the `category_id` of the search.
+    The filters are turned into a SearchQuery the same way the console control turns its selection, so
+    identical jobs share one request.
+
+    Attributes:
+        job (dict): The search job.
+
+    Methods:
+        from_file(path: str) -> List[BatchUserControl]: Read one user control per job from a JSONL file.
+        user_request(request_settings: RequestSettings): Run the search of the job.
+        filters() -> List[dict]: The job filters in the shape returned by CategoryAttributes.
+    """
+
+    def __init__(self, job: dict) -> None:
+        """Initialize the BatchUserControl.
+
+        Args:
+            job (dict): The search job, with a `keyword` and optional `filters`.
+
+        Raises:
+            SelectionError: If the job has no keyword.
+        """
+        super().__init__()
+        if not job.get("keyword"):
+            raise SelectionError("Job without keyword: {}".format(job))
+        self.job = job
+        self.category_id = job.get("category_id")
+
+    @classmethod
+    def from_file(cls, path: str) -> List["BatchUserControl"]:
+        """Read one user control per job from a JSONL file.
+
+        Blank lines and lines starting with `#` are skipped.
+
+        Args:
+            path (str): Path of the JSONL job file.
+
+        Returns:
+            List[BatchUserControl]: The user controls, in file order.
+
+        Raises:
+            SelectionError: If a line is not a valid job.
+        """
+        controls = []
+        with open(path, encoding="utf-8") as file:
+            for number, line in enumerate(file, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    controls.append(cls(json.loads(line)))
+                except (ValueError, SelectionError) as e:
+                    raise SelectionError("Invalid job at line {}: {}".format(number, e))
+        return controls
+
+    def user_request(self, request_settings: RequestSettings):
+        """Run the search of the job.
+
+        Args:
+            request_settings (RequestSettings): The request settings object.
+
+        Returns:
+            Response or None: The API response or None if no response is available.
+            str: The URL used for the request.
+        """
+        try:
+            return self._search(SearchQuery.from_filters(self.job["keyword"], self.filters()), request_settings)
+        except Exception as e:
+            raise SelectionError(e)
+
+    def filters(self) -> List[dict]:
+        """The job filters in the shape returned by CategoryAttributes, with every value selected.
+
+        Returns:
+            List[dict]: The filters of the job.
+        """
+        return [
+            {"id": filter_id, "values": [{"id": str(value), "selected": True} for value in values]}
+            for filter_id, values in (self.job.get("filters") or {}).items()
+        ]
@@ -1,10 +1,12 @@
 from filter.filter_selection import SelectionHandler
 import json
-from request.request_base import Request
+from request.meli.category_cache import AttributesCache, CategoryCache
 from request.meli.request_settings import RequestSettings
 from request.meli.request_user_control import UserControl
-from utils.http_request import CategoryPredictor, CategoryAttributes
+from request.meli.search_cache import get_search_cache
+from request.meli.search_query import SearchQuery
 from utils.exceptions import SelectionError
+from utils.metrics import get_metrics
 from typing import List
 
 class ConsoleUserControl(UserControl):
@@ -15,6 +17,11 @@ class ConsoleUserControl(UserControl):
 
     Attributes:
         sel_handler (SelectionHandler): An instance of SelectionHandler to manage filter selections.
+        category_cache (CategoryCache): Cache of category predictions by keyword.
+        attributes_cache (AttributesCache): Cache of category attributes by category ID.
+        category_id (str): ID of the category predicted for the latest request, if any.
+        query (SearchQuery): The latest search, if any.
+        url (str): URL of the latest request, if any.
 
     Methods:
         user_request(request_settings: RequestSettings): Handles user requests and interacts with the user.
@@ -22,21 +29,31 @@ class ConsoleUserControl(UserControl):
         generate_query(filters: List[dict]): Generates a query based on selected filters.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, category_cache: CategoryCache = None, attributes_cache: AttributesCache = None) -> None:
         """Initialize the ConsoleUserControl.
 
         Initializes an instance of SelectionHandler.
 
         Args:
-            None
+            category_cache (CategoryCache, optional): Cache of category predictions by keyword. An in-memory
+                cache is used if omitted.
+            attributes_cache (AttributesCache, optional): Cache of category attributes by category ID. An
+                in-memory cache is used if omitted.
         """
         self.sel_handler: SelectionHandler
+        self.category_cache = category_cache or CategoryCache()
+        self.attributes_cache = attributes_cache or AttributesCache()
+        self.category_id = None
+        self.query = None
+        self.url = None
 
     def user_request(self, request_settings: RequestSettings):
         """Handle user requests and interact with the user.
 
         This method allows users to input requests and interact with the MercadoLibre system.
-        It implements the user_request method from the UserControl abstract class.
+        It implements the user_request method from the UserControl abstract class. The search is built as
+        a SearchQuery, so `request_settings.url` is left untouched, and is sent through the shared
+        SearchCache.
 
         Args:
             request_settings (RequestSettings): The request settings object.
@@ -53,23 +70,35 @@ class ConsoleUserControl(UserControl):
                 if keyword == "q":
                     return None, None
                 attrs = self.get_attrs(keyword, request_settings.credential)
+                selected = []
                 if attrs:
                     selection = self.sel_handler.choose(attrs)
                     if selection:
-                        query = self.generate_query(attrs)
-                        request_settings.url += query
-                request_settings.url += "&q={}".format(keyword)
-                request = Request(url=request_settings.url,
-                                  headers=request_settings.credential)
-                return request.get(), request_settings.url
+                        selected = attrs
+                return self._search(SearchQuery.from_filters(keyword, selected), request_settings)
             except Exception as e:
                 raise SelectionError(e)
 
+    def _search(self, query: SearchQuery, request_settings: RequestSettings):
+        """Send a search through the shared SearchCache.
+
+        Args:
+            query (SearchQuery): The search.
+            request_settings (RequestSettings): The request settings object.
+
+        Returns:
+            Response or None: The API response or None if no response is available.
+            str: The URL used for the request.
+        """
+        self.query = query
+        self.url = query.url(request_settings.url)
+        return get_search_cache().get(query, request_settings.url, request_settings.credential), self.url
+
     def get_attrs(self, key, credential) -> json or None:
         """Retrieve category attributes based on user input.
 
-        This method uses the CategoryPredictor and CategoryAttributes classes to predict categories
-        and retrieve their attributes based on user input.
+        This method uses the category cache, backed by CategoryPredictor, and the attributes cache, backed by
+        CategoryAttributes, to predict categories and retrieve their attributes based on user input.
 
         Args:
             key (str): The user's input keyword.
@@ -78,14 +107,16 @@ class ConsoleUserControl(UserControl):
         Returns:
             json or None: The retrieved category attributes or None if no attributes are available.
         """
-        category_predictor = CategoryPredictor(key, credential)
         try:
-            category = category_predictor.get()
-            category_name = category.json()[0].get("domain_name", "")
-            category_id = category.json()[0].get("category_id", "")
+            metrics = get_metrics()
+            with metrics.timer("stage_seconds", stage="category_prediction"):
+                category = self.category_cache.predict(key, credential)
+            category_name = category[0].get("domain_name", "")
+            category_id = category[0].get("category_id", "")
+            self.category_id = category_id or None
             print("Category predict {}" .format(category_name))
-            category_attr = CategoryAttributes(category_id, credential)
-            attrs = category_attr.get().json()
+            with metrics.timer("stage_seconds", stage="attributes"):
+                attrs = self.attributes_cache.get(category_id, credential)
             return attrs
         except Exception:
             return None
@@ -0,0 +1,243 @@
+from __future__ import annotations
+from request.request_moderator import endpoint_family, get_moderator
+from utils.json_decoder import loads
+from utils.lazy import lazy_import
+from utils.metrics import get_metrics
+import asyncio
+import time
+
+aiohttp = lazy_import("aiohttp")
+
+class AsyncResponse:
+    """Response of an asynchronous request.
+
+    Exposes the subset of `requests.Response` used across the project, so asynchronous responses can be
+    validated and decoded like synchronous ones.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+        headers (dict): The response headers.
+        content (bytes): The raw response body.
+        url (str): The URL the response was received from.
+        latency (float): Wall-clock seconds the request took.
+
+    Methods:
+        json() -> dict: Decode the response body as JSON, once.
+        search() -> SearchPage: Decode the response body into the typed search page shape.
+    """
+
+    def __init__(self, status_code: int, headers: dict, content: bytes, url: str, latency: float = 0.0) -> None:
+        """Initializes an AsyncResponse instance.
+
+        Args:
+            status_code (int): The HTTP status code.
+            headers (dict): The response headers.
+            content (bytes): The raw response body.
+            url (str): The URL the response was received from.
+            latency (float): Wall-clock seconds the request took.
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.latency = latency
+        self._decoded = None
+
+    @property
+    def text(self) -> str:
+        """The response body decoded as UTF-8."""
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        """Decode the response body as JSON, on the first call only.
+
+        Returns:
+            dict: The decoded response body.
+        """
+        if self._decoded is None:
+            self._decoded = loads(self.content)
+        return self._decoded
+
+    def search(self):
+        """Decode the response body straight into the typed search page shape.
+
+        Returns:
+            SearchPage: The decoded page.
+        """
+        from request.meli.search_types import decode_search
+        return decode_search(self.content)
+
+
+class AsyncTransport:
+    """Asynchronous HTTP transport with a bounded number of in-flight requests.
+
+    Owns an `aiohttp.ClientSession` with a keep-alive connection pool and a semaphore that caps the number
+    of concurrent requests. It must be created and used inside a running event loop, preferably as an
+    async context manager.
+
+    Attributes:
+        LIMIT (int): Default maximum number of in-flight requests.
+        limit (int): Maximum number of in-flight requests.
+        limit_per_host (int): Maximum number of open connections per host.
+
+    Methods:
+        request(method: str, url: str, **kwargs) -> AsyncResponse: Send a request once a slot is free.
+        close() -> None: Close the session and its connections.
+    """
+
+    LIMIT: int = 100
+
+    def __init__(self, limit: int = None, limit_per_host: int = 0) -> None:
+        """Initializes an AsyncTransport instance.
+
+        Args:
+            limit (int, optional): Maximum number of in-flight requests.
+            limit_per_host (int): Maximum number of open connections per host, 0 for no limit.
+        """
+        self.limit = limit or self.LIMIT
+        self.limit_per_host = limit_per_host
+        self._semaphore = asyncio.Semaphore(self.limit)
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncTransport":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The underlying session, created on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def request(self, method: str, url: str, **kwargs) -> AsyncResponse:
+        """Send a request once one of the `limit` slots is free.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to send the request to.
+            **kwargs: Keyword arguments accepted by `aiohttp.ClientSession.request`.
+
+        Returns:
+            AsyncResponse: The response received from the request.
+        """
+        metrics = get_metrics()
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                async with self.session.request(method, url, **kwargs) as response:
+                    content = await response.read()
+                    result = AsyncResponse(status_code=response.status, headers=dict(response.headers),
+                                           content=content, url=str(response.url),
+                                           latency=time.perf_counter() - started)
+            except Exception:
+                metrics.inc("http_requests_total", method=method, endpoint=endpoint_family(url), status="error")
+                raise
+        if metrics.enabled:
+            endpoint = endpoint_family(url)
+            metrics.observe("http_request_seconds", result.latency, method=method, endpoint=endpoint)
+            metrics.inc("http_requests_total", method=method, endpoint=endpoint, status=result.status_code)
+        return result
+
+    async def close(self) -> None:
+        """Close the session and its connections.
+
+        Returns:
+            None
+        """
+        if self._session is not None:
+            await self._session.close()
+
+
+class AsyncRequest:
+    """Asynchronous counterpart of Request.
+
+    Sends GET and POST requests through an AsyncTransport, with the same request details as Request,
+    paced and retried by the shared Moderator.
+
+    Attributes:
+        url (str): The URL to send the request to.
+        headers (dict): HTTP headers to include in the request.
+        cookies (dict): Cookies to include in the request.
+        data (dict): Data to include in the request, used for POST requests.
+        params (dict): URL parameters to include in the request.
+        transport (AsyncTransport): The transport the request is sent through.
+
+    Methods:
+        get() -> AsyncResponse: Send a GET request and return the response object.
+        post() -> AsyncResponse: Send a POST request with JSON data and return the response object.
+        to_dict() -> dict: Convert the request details to a dictionary.
+    """
+
+    def __init__(self, url: str, transport: AsyncTransport, headers: dict = None, cookies: dict = None, data: dict = None, params: dict = None) -> None:
+        """Initialize the AsyncRequest object with request details.
+
+        Args:
+            url (str): The URL to send the request to.
+            transport (AsyncTransport): The transport the request is sent through.
+            headers (dict): HTTP headers to include in the request.
+            cookies (dict): Cookies to include in the request.
+            data (dict): Data to include in the request, used for POST requests.
+            params (dict): URL parameters to include in the request.
+        """
+        self.url = url
+        self.transport = transport
+        self.headers = headers
+        self.cookies = cookies
+        self.data = data
+        self.params = params
+
+    async def get(self) -> AsyncResponse:
+        """Send a GET request and return the response object.
+
+        Returns:
+            AsyncResponse: The response object received from the GET request.
+        """
+        return await self._send("GET", params=self.params)
+
+    async def post(self) -> AsyncResponse:
+        """Send a POST request with JSON data and return the response object.
+
+        Returns:
+            AsyncResponse: The response object received from the POST request.
+        """
+        return await self._send("POST", json=self.data)
+
+    async def _send(self, method: str, **kwargs) -> AsyncResponse:
+        """Send the request once the Moderator allows it, retrying throttled or failed attempts.
+
+        Args:
+            method (str): The HTTP method.
+            **kwargs: Additional keyword arguments for the transport.
+
+        Returns:
+            AsyncResponse: The response object of the last attempt.
+        """
+        moderator = get_moderator()
+        metrics = get_metrics()
+        endpoint = endpoint_family(self.url)
+        for attempt in range(moderator.MAX_RETRIES + 1):
+            if attempt:
+                metrics.inc("request_retries_total", endpoint=endpoint)
+            with metrics.timer("moderator_wait_seconds", endpoint=endpoint):
+                await moderator.acquire_async(self.url, self.headers)
+            response = await self.transport.request(method, self.url, headers=self.headers,
+                                                    cookies=self.cookies, **kwargs)
+            if not moderator.observe(self.url, self.headers, response):
+                break
+        return response
+
+    def to_dict(self) -> dict:
+        """Convert the request details to a dictionary.
+
+        Returns:
+            dict: A dictionary containing the request details.
+        """
+        return {
+            'url': self.url,
+            'headers': self.headers,
+            'data': self.data,
+        }
@@ -1,11 +1,19 @@
-from requests import Response
-import requests
+from __future__ import annotations
+from request.request_moderator import endpoint_family, get_moderator
+from request.request_transport import get_transport
+from typing import TYPE_CHECKING
+from utils.metrics import get_metrics
+
+if TYPE_CHECKING:
+    from requests import Response
 
 class Request:
     """HTTP request utility class for making API requests.
 
     This class provides methods to send GET and POST requests to a specified URL.
     It also allows for specifying headers, cookies, data, and parameters.
+    Every request goes through the shared, pooled Transport so connections are reused, and is paced
+    by the shared Moderator, which also retries throttled or failed requests.
 
     Attributes:
         url (str): The URL to send the request to.
@@ -42,7 +50,7 @@ class Request:
         Returns:
             Response: The response object received from the GET request.
         """
-        return requests.get(self.url, headers=self.headers, cookies=self.cookies, params=self.params)
+        return self._send("GET", params=self.params)
 
     def post(self) -> Response:
         """Send a POST request with JSON data and return the response object.
@@ -50,7 +58,31 @@ class Request:
         Returns:
             Response: The response object received from the POST request.
         """
-        return requests.post(self.url, json=self.data, headers=self.headers, cookies=self.cookies)
+        return self._send("POST", json=self.data)
+
+    def _send(self, method: str, **kwargs) -> Response:
+        """Send the request once the Moderator allows it, retrying throttled or failed attempts.
+
+        Args:
+            method (str): The HTTP method.
+            **kwargs: Additional keyword arguments for the transport.
+
+        Returns:
+            Response: The response object of the last attempt.
+        """
+        moderator = get_moderator()
+        metrics = get_metrics()
+        endpoint = endpoint_family(self.url)
+        for attempt in range(moderator.MAX_RETRIES + 1):
+            if attempt:
+                metrics.inc("request_retries_total", endpoint=endpoint)
+            with metrics.timer("moderator_wait_seconds", endpoint=endpoint):
+                moderator.acquire(self.url, self.headers)
+            response = get_transport().request(method, self.url, headers=self.headers,
+                                               cookies=self.cookies, **kwargs)
+            if not moderator.observe(self.url, self.headers, response):
+                break
+        return response
 
     def to_dict(self) -> dict:
         """Convert the request details to a dictionary.
@@ -0,0 +1,285 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import threading
+import time
+
+def endpoint_family(url: str) -> str:
+    """Endpoint family of a URL.
+
+    Args:
+        url (str): The URL of the request.
+
+    Returns:
+        str: "search", "domain_discovery", "categories", "oauth" or the first path segment.
+    """
+    segments = [segment for segment in urlparse(url).path.split("/") if segment]
+    if not segments:
+        return "root"
+    if segments[0] == "sites" and len(segments) > 2:
+        return segments[2]
+    return segments[0]
+
+class TokenBucket:
+    """Token bucket whose refill rate adapts to the responses of the API.
+
+    Attributes:
+        rate (float): Tokens added per second, i.e. the allowed request rate.
+        tokens (float): Tokens currently available; negative while requests are queued.
+        blocked_until (float): Monotonic time before which no request may be sent.
+        waiting (int): Number of requests currently waiting for a token.
+    """
+
+    def __init__(self, rate: float) -> None:
+        """Initializes a TokenBucket instance.
+
+        Args:
+            rate (float): Initial tokens added per second.
+        """
+        self.rate = rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.waiting = 0
+
+    @property
+    def capacity(self) -> float:
+        """Maximum burst size, one second worth of requests."""
+        return max(1.0, self.rate)
+
+    def reserve(self, now: float) -> float:
+        """Reserve a token and compute how long to wait before using it.
+
+        Args:
+            now (float): The current monotonic time.
+
+        Returns:
+            float: Seconds to wait before sending the request.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+
+class Moderator:
+    """Adaptive rate limiter for the requests sent to the MercadoLibre API.
+
+    Keeps one token bucket per access token and endpoint family. Each successful response raises the
+    allowed rate by a small step, while a 429 or 5xx response cuts it by a factor and, when present,
+    blocks the bucket for the duration given by `Retry-After`. Requests that receive one of those
+    statuses may be retried up to `MAX_RETRIES` times.
+
+    Attributes:
+        RATE (float): Initial requests per second of a new bucket.
+        MIN_RATE (float): Lowest rate a bucket can back off to.
+        MAX_RATE (float): Highest rate a bucket can speed up to.
+        INCREASE (float): Requests per second added after each successful response.
+        DECREASE (float): Factor applied to the rate after a throttled or failed response.
+        MAX_RETRIES (int): Times a throttled or failed request is retried.
+        RETRY_STATUS (tuple): Status codes, besides 5xx, that trigger a back off.
+
+    Methods:
+        acquire(url: str, headers: dict) -> None: Wait until a request may be sent.
+        acquire_async(url: str, headers: dict) -> None: Asynchronous version of acquire.
+        observe(url: str, headers: dict, response) -> bool: Adapt the rate to a response.
+        stats() -> dict: Current rate and queue depth of every bucket.
+    """
+
+    RATE: float = 10.0
+    MIN_RATE: float = 0.5
+    MAX_RATE: float = 50.0
+    INCREASE: float = 0.1
+    DECREASE: float = 0.5
+    MAX_RETRIES: int = 3
+    RETRY_STATUS: tuple = (429,)
+
+    def __init__(self, rate: float = None, max_rate: float = None) -> None:
+        """Initializes a Moderator instance.
+
+        Args:
+            rate (float, optional): Initial requests per second of a new bucket.
+            max_rate (float, optional): Highest rate a bucket can speed up to.
+        """
+        self.rate = rate or self.RATE
+        self.max_rate = max_rate or self.MAX_RATE
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str, headers: dict) -> None:
+        """Wait until a request may be sent.
+
+        Args:
+            url (str): The URL of the request.
+            headers (dict): The headers of the request, used to identify its access token.
+
+        Returns:
+            None
+        """
+        bucket, wait = self._reserve(url, headers)
+        try:
+            if wait > 0:
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                bucket.waiting -= 1
+
+    async def acquire_async(self, url: str, headers: dict) -> None:
+        """Wait, without blocking the event loop, until a request may be sent.
+
+        Args:
+            url (str): The URL of the request.
+            headers (dict): The headers of the request, used to identify its access token.
+
+        Returns:
+            None
+        """
+        bucket, wait = self._reserve(url, headers)
+        try:
+            if wait > 0:
+                await asyncio.sleep(wait)
+        finally:
+            with self._lock:
+                bucket.waiting -= 1
+
+    def observe(self, url: str, headers: dict, response) -> bool:
+        """Adapt the rate of a bucket to the response of a request.
+
+        Args:
+            url (str): The URL of the request.
+            headers (dict): The headers of the request, used to identify its access token.
+            response (Response or AsyncResponse): The response received.
+
+        Returns:
+            bool: True if the request was throttled or failed and should be retried.
+        """
+        status_code = response.status_code
+        throttled = status_code in self.RETRY_STATUS or status_code >= 500
+        with self._lock:
+            bucket = self._bucket(url, headers)
+            if throttled:
+                bucket.rate = max(self.MIN_RATE, bucket.rate * self.DECREASE)
+                retry_after = self._retry_after(response.headers.get("Retry-After"))
+                if retry_after:
+                    bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + retry_after)
+            else:
+                bucket.rate = min(self.max_rate, bucket.rate + self.INCREASE)
+        return throttled
+
+    def stats(self) -> dict:
+        """Current rate and queue depth of every bucket.
+
+        Returns:
+            dict: Mapping of `family:token` to the rate, queue depth and blocked time of its bucket.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "{}:{}".format(family, token): {
+                    "rate": round(bucket.rate, 3),
+                    "queue_depth": bucket.waiting,
+                    "blocked_for": round(max(0.0, bucket.blocked_until - now), 3)
+                }
+                for (token, family), bucket in self._buckets.items()
+            }
+
+    def _reserve(self, url: str, headers: dict) -> tuple:
+        """Reserve a token in the bucket of a request.
+
+        Args:
+            url (str): The URL of the request.
+            headers (dict): The headers of the request.
+
+        Returns:
+            tuple: The bucket and the seconds to wait before sending the request.
+        """
+        with self._lock:
+            bucket = self._bucket(url, headers)
+            bucket.waiting += 1
+            return bucket, bucket.reserve(time.monotonic())
+
+    def _bucket(self, url: str, headers: dict) -> TokenBucket:
+        """Find or create the bucket of a request. Must be called holding the lock.
+
+        Args:
+            url (str): The URL of the request.
+            headers (dict): The headers of the request.
+
+        Returns:
+            TokenBucket: The bucket for the access token and endpoint family of the request.
+        """
+        key = (self._token(headers), endpoint_family(url))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(rate=self.rate)
+        return bucket
+
+    @staticmethod
+    def _token(headers: dict) -> str:
+        """Short fingerprint of the access token of a request, so tokens never appear in stats.
+
+        Args:
+            headers (dict): The headers of the request.
+
+        Returns:
+            str: The fingerprint, or "anonymous" for requests without authorization.
+        """
+        authorization = (headers or {}).get("Authorization")
+        if not authorization:
+            return "anonymous"
+        return hashlib.sha256(authorization.encode()).hexdigest()[:8]
+
+    @staticmethod
+    def _retry_after(value: str) -> float:
+        """Parse a `Retry-After` header.
+
+        Args:
+            value (str): The header value, in seconds or as an HTTP date.
+
+        Returns:
+            float: Seconds to wait, or 0 if the header is missing or invalid.
+        """
+        if not value:
+            return 0.0
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+            return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return 0.0
+
+
+_moderator: Moderator = None
+_moderator_lock = threading.Lock()
+
+def get_moderator() -> Moderator:
+    """Return the shared moderator, creating it on first use.
+
+    Returns:
+        Moderator: The moderator every request goes through.
+    """
+    global _moderator
+    if _moderator is None:
+        with _moderator_lock:
+            if _moderator is None:
+                _moderator = Moderator()
+    return _moderator
+
+def set_moderator(moderator: Moderator) -> None:
+    """Replace the shared moderator.
+
+    Args:
+        moderator (Moderator): The moderator every request should go through.
+
+    Returns:
+        None
+    """
+    global _moderator
+    with _moderator_lock:
+        _moderator = moderator
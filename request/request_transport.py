@@ -0,0 +1,249 @@
+from __future__ import annotations
+from request.request_moderator import endpoint_family
+from utils.config import Config
+from typing import TYPE_CHECKING
+from utils.exceptions import VariableNotFound
+from utils.json_decoder import loads
+from utils.lazy import lazy_import
+from utils.metrics import get_metrics
+import threading
+import time
+
+requests = lazy_import("requests")
+
+if TYPE_CHECKING:
+    from requests import Response
+
+_UNSET = object()
+
+class ParsedResponse:
+    """Response whose body is decoded at most once.
+
+    Wraps a `requests.Response` and delegates every attribute to it, except `json`, which decodes the
+    body with the fastest decoder available on the first call and returns the same object afterwards.
+
+    Attributes:
+        response (Response): The wrapped response.
+
+    Methods:
+        json(): The decoded body.
+        search() -> SearchPage: The body decoded into the typed search page shape.
+    """
+
+    def __init__(self, response: Response) -> None:
+        """Initializes a ParsedResponse instance.
+
+        Args:
+            response (Response): The response to wrap.
+        """
+        self.response = response
+        self._decoded = _UNSET
+
+    def __getattr__(self, name: str):
+        return getattr(self.response, name)
+
+    def __bool__(self) -> bool:
+        return bool(self.response)
+
+    def __repr__(self) -> str:
+        return repr(self.response)
+
+    def json(self):
+        """The decoded body, decoded on the first call only.
+
+        Returns:
+            The decoded JSON document.
+        """
+        if self._decoded is _UNSET:
+            self._decoded = loads(self.response.content)
+        return self._decoded
+
+    def search(self):
+        """The body decoded straight into the typed search page shape.
+
+        Returns:
+            SearchPage: The decoded page.
+        """
+        from request.meli.search_types import decode_search
+        return decode_search(self.response.content)
+
+
+class Transport(Config):
+    """Pooled HTTP transport shared by every request to the MercadoLibre API.
+
+    Wraps a `requests.Session` whose adapters keep a bounded pool of keep-alive connections per host,
+    so consecutive calls to the same host reuse an open TCP+TLS connection instead of performing a new
+    handshake each time. Pool sizes can be overridden with the `HTTP_POOL_CONNECTIONS`,
+    `HTTP_POOL_MAXSIZE` and `HTTP_POOL_BLOCK` environment variables.
+
+    Attributes:
+        POOL_CONNECTIONS (int): Default number of hosts whose pools are kept.
+        POOL_MAXSIZE (int): Default number of connections kept per host.
+        POOL_BLOCK (bool): Default for blocking when a host has no free connection.
+        session (requests.Session): The underlying session.
+
+    Methods:
+        request(method: str, url: str, **kwargs) -> ParsedResponse: Send a request through the pool.
+        get(url: str, **kwargs) -> ParsedResponse: Send a GET request through the pool.
+        post(url: str, **kwargs) -> ParsedResponse: Send a POST request through the pool.
+        stats() -> dict: Connection pool hit and miss counters.
+        close() -> None: Close every pooled connection.
+    """
+
+    POOL_CONNECTIONS: int = 10
+    POOL_MAXSIZE: int = 16
+    POOL_BLOCK: bool = False
+
+    def __init__(self, pool_connections: int = None, pool_maxsize: int = None, pool_block: bool = None) -> None:
+        """Initializes a Transport instance.
+
+        Args:
+            pool_connections (int, optional): Number of hosts whose pools are kept.
+            pool_maxsize (int, optional): Maximum number of connections kept per host.
+            pool_block (bool, optional): Whether to wait for a free connection once a host reaches
+                `pool_maxsize`, enforcing it as a hard per-host limit.
+        """
+        self.pool_connections = pool_connections or self._setting("HTTP_POOL_CONNECTIONS", self.POOL_CONNECTIONS)
+        self.pool_maxsize = pool_maxsize or self._setting("HTTP_POOL_MAXSIZE", self.POOL_MAXSIZE)
+        self.pool_block = pool_block if pool_block is not None else bool(
+            self._setting("HTTP_POOL_BLOCK", int(self.POOL_BLOCK)))
+        self.session = requests.Session()
+        self._adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_connections,
+                                    pool_maxsize=self.pool_maxsize,
+                                    pool_block=self.pool_block)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> ParsedResponse:
+        """Send a request through the connection pool.
+
+        The wall-clock time of the call, including reading the body, is set as `latency` on the response
+        and observed in the `http_request_seconds` histogram, and the call is counted in `http_requests_total`
+        by status code.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to send the request to.
+            **kwargs: Keyword arguments accepted by `requests.Session.request`.
+
+        Returns:
+            ParsedResponse: The response object received from the request.
+        """
+        metrics = get_metrics()
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            metrics.inc("http_requests_total", method=method, endpoint=endpoint_family(url), status="error")
+            raise
+        response.latency = time.perf_counter() - started
+        if metrics.enabled:
+            endpoint = endpoint_family(url)
+            metrics.observe("http_request_seconds", response.latency, method=method, endpoint=endpoint)
+            metrics.inc("http_requests_total", method=method, endpoint=endpoint, status=response.status_code)
+        return ParsedResponse(response)
+
+    def get(self, url: str, **kwargs) -> ParsedResponse:
+        """Send a GET request through the connection pool.
+
+        Args:
+            url (str): The URL to send the request to.
+            **kwargs: Keyword arguments accepted by `requests.Session.request`.
+
+        Returns:
+            ParsedResponse: The response object received from the request.
+        """
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> ParsedResponse:
+        """Send a POST request through the connection pool.
+
+        Args:
+            url (str): The URL to send the request to.
+            **kwargs: Keyword arguments accepted by `requests.Session.request`.
+
+        Returns:
+            ParsedResponse: The response object received from the request.
+        """
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        """Connection pool hit and miss counters.
+
+        A hit is a request served over an already open connection; a miss is a request that had to
+        open a new one.
+
+        Returns:
+            dict: Totals of requests, hits, misses and the hit rate across every host pool.
+        """
+        pools = self._adapter.poolmanager.pools
+        requests_sent = 0
+        misses = 0
+        for key in pools.keys():
+            pool = pools[key]
+            requests_sent += pool.num_requests
+            misses += pool.num_connections
+        hits = max(requests_sent - misses, 0)
+        return {
+            "hosts": len(pools),
+            "requests": requests_sent,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / requests_sent if requests_sent else 0.0
+        }
+
+    def close(self) -> None:
+        """Close every pooled connection.
+
+        Returns:
+            None
+        """
+        self.session.close()
+
+    @classmethod
+    def _setting(cls, name: str, default: int) -> int:
+        """Read an integer setting from the environment.
+
+        Args:
+            name (str): The name of the environment variable.
+            default (int): The value used when the variable is not set.
+
+        Returns:
+            int: The configured value.
+        """
+        try:
+            return int(cls.get_var(name))
+        except VariableNotFound:
+            return default
+
+
+_transport: Transport = None
+_transport_lock = threading.Lock()
+
+def get_transport() -> Transport:
+    """Return the shared transport, creating it on first use.
+
+    Returns:
+        Transport: The transport every request goes through.
+    """
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = Transport()
+    return _transport
+
+def set_transport(transport: Transport) -> None:
+    """Replace the shared transport, closing the previous one.
+
+    Args:
+        transport (Transport): The transport every request should go through.
+
+    Returns:
+        None
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is not None and _transport is not transport:
+            _transport.close()
+        _transport = transport
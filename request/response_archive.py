@@ -0,0 +1,170 @@
+from datetime import datetime
+from request.request_moderator import endpoint_family
+from typing import Iterator
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+
+class ResponseArchive:
+    """Compressed, content-addressed on-disk archive of raw API responses.
+
+    Each response body is gzip-compressed and stored once under the SHA-256 of its content, in
+    `objects/<first two hex digits>/<digest>.json.gz`, so identical payloads take the space of one. Every
+    archived response appends a line to `index.jsonl` with its URL, timestamp, endpoint family, status
+    code, size and digest. `replay` reads the archived bodies back in index order, which allows
+    re-running the transformation and the load without contacting the API.
+
+    Attributes:
+        COMPRESS_LEVEL (int): gzip compression level of the stored bodies.
+        root (str): Directory of the archive.
+        stored (int): Bodies written by this instance.
+        deduplicated (int): Responses whose body was already archived.
+
+    Methods:
+        store(url: str, response) -> str or None: Archive the body of a successful response.
+        entries(endpoint: str, url: str, since: datetime, until: datetime) -> Iterator[dict]: Read the index.
+        load(digest: str) -> bytes: Read an archived body.
+        replay(endpoint: str, since: datetime, until: datetime, latest: bool) -> Iterator[dict]: Decode archived bodies.
+        stats() -> dict: Write and deduplication counters.
+    """
+
+    COMPRESS_LEVEL: int = 6
+
+    def __init__(self, root: str) -> None:
+        """Initializes a ResponseArchive instance, creating its directory if needed.
+
+        Args:
+            root (str): Directory of the archive.
+        """
+        self.root = root
+        self.stored = 0
+        self.deduplicated = 0
+        self._index_path = os.path.join(root, "index.jsonl")
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+
+    def store(self, url: str, response) -> str or None:
+        """Archive the body of a successful response.
+
+        Args:
+            url (str): The URL used for the request.
+            response (Response or AsyncResponse): The response received from the API.
+
+        Returns:
+            str or None: The digest of the body, or None if the response was not a 200.
+        """
+        if response.status_code != 200:
+            return None
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._path(digest)
+        entry = json.dumps({
+            "url": url,
+            "date": datetime.now().isoformat(),
+            "endpoint": endpoint_family(url),
+            "status_code": response.status_code,
+            "bytes": len(content),
+            "sha256": digest
+        })
+        with self._lock:
+            if os.path.exists(path):
+                self.deduplicated += 1
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temporary = "{}.{}.tmp".format(path, threading.get_ident())
+                with open(temporary, "wb") as file:
+                    file.write(gzip.compress(content, compresslevel=self.COMPRESS_LEVEL))
+                os.replace(temporary, path)
+                self.stored += 1
+            with open(self._index_path, "a", encoding="utf-8") as index:
+                index.write(entry + "\n")
+        return digest
+
+    def entries(self, endpoint: str = None, url: str = None, since: datetime = None,
+                until: datetime = None) -> Iterator[dict]:
+        """Read the index, in the order responses were archived.
+
+        Args:
+            endpoint (str, optional): Only entries of this endpoint family, e.g. "search" or "categories".
+            url (str, optional): Only entries of this exact URL.
+            since (datetime, optional): Only entries archived at or after this time.
+            until (datetime, optional): Only entries archived before this time.
+
+        Yields:
+            dict: The URL, date, endpoint, status code, size and digest of each entry.
+        """
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, encoding="utf-8") as index:
+            for line in index:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logging.warning("Skipping corrupt archive index line: {!r}".format(line[:80]))
+                    continue
+                date = datetime.fromisoformat(entry["date"])
+                if endpoint and entry["endpoint"] != endpoint:
+                    continue
+                if url and entry["url"] != url:
+                    continue
+                if (since and date < since) or (until and date >= until):
+                    continue
+                entry["date"] = date
+                yield entry
+
+    def load(self, digest: str) -> bytes:
+        """Read an archived body.
+
+        Args:
+            digest (str): The SHA-256 of the body.
+
+        Returns:
+            bytes: The decompressed body.
+        """
+        with open(self._path(digest), "rb") as file:
+            return gzip.decompress(file.read())
+
+    def replay(self, endpoint: str = "search", since: datetime = None, until: datetime = None,
+               latest: bool = True) -> Iterator[dict]:
+        """Decode archived bodies, as the API would have returned them.
+
+        Args:
+            endpoint (str): The endpoint family to replay.
+            since (datetime, optional): Only responses archived at or after this time.
+            until (datetime, optional): Only responses archived before this time.
+            latest (bool): Whether to replay only the most recent response of each URL, in the order the
+                URLs were first archived.
+
+        Yields:
+            dict: The decoded body of each archived response.
+        """
+        entries = self.entries(endpoint=endpoint, since=since, until=until)
+        if latest:
+            by_url = {}
+            for entry in entries:
+                by_url[entry["url"]] = entry
+            entries = by_url.values()
+        for entry in entries:
+            yield json.loads(self.load(entry["sha256"]))
+
+    def stats(self) -> dict:
+        """Write and deduplication counters.
+
+        Returns:
+            dict: Bodies stored and responses deduplicated by this instance.
+        """
+        return {"stored": self.stored, "deduplicated": self.deduplicated}
+
+    def _path(self, digest: str) -> str:
+        """Path of an archived body.
+
+        Args:
+            digest (str): The SHA-256 of the body.
+
+        Returns:
+            str: The path of the compressed body.
+        """
+        return os.path.join(self.root, "objects", digest[:2], digest + ".json.gz")
@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+import threading
+import time
+
+class TTLCache:
+    """Thread-safe in-memory LRU cache whose entries expire after a time to live.
+
+    Attributes:
+        maxsize (int): Maximum number of entries; the least recently used one is evicted beyond it.
+        ttl (float): Seconds an entry stays valid.
+        hits (int): Number of lookups that found a valid entry.
+        misses (int): Number of lookups that found no valid entry.
+
+    Methods:
+        get(key, default=None): Retrieve a valid entry.
+        set(key, value): Store an entry.
+        pop(key): Remove an entry.
+        stats() -> dict: Hit and miss counters.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600) -> None:
+        """Initialize the TTLCache.
+
+        Args:
+            maxsize (int): Maximum number of entries.
+            ttl (float): Seconds an entry stays valid.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Retrieve a valid entry, marking it as recently used.
+
+        Args:
+            key: The key of the entry.
+            default: The value returned when there is no valid entry.
+
+        Returns:
+            The cached value, or `default`.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value) -> None:
+        """Store an entry, evicting the least recently used one if the cache is full.
+
+        Args:
+            key: The key of the entry.
+            value: The value to cache.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key) -> None:
+        """Remove an entry, if present.
+
+        Args:
+            key: The key of the entry.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        """Hit and miss counters.
+
+        Returns:
+            dict: Entries, hits, misses and hit rate of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+class SingleFlight:
+    """Collapses concurrent calls for the same key into one.
+
+    The first caller of a key runs the function; callers arriving while it runs wait for it and get the same
+    result, or the same exception. Nothing is kept once the call completes, so a later call runs again.
+
+    Attributes:
+        calls (int): Number of calls that ran the function.
+        shared (int): Number of calls that waited for another caller instead.
+
+    Methods:
+        do(key, function) -> tuple: Run the function, or wait for the call already running for the key.
+        stats() -> dict: Call counters.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the SingleFlight."""
+        self.calls = 0
+        self.shared = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function):
+        """Run the function, or wait for the call already running for the key.
+
+        Args:
+            key: The key identifying the call.
+            function (Callable): The function to run, without arguments.
+
+        Returns:
+            tuple: The result of the function, and whether it came from a call made by another caller.
+
+        Raises:
+            Exception: Whatever the function raised.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            return flight.result(), True
+        try:
+            result = function()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def stats(self) -> dict:
+        """Call counters.
+
+        Returns:
+            dict: Calls run, calls shared and calls in flight.
+        """
+        return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._flights)}
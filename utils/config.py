@@ -8,11 +8,17 @@ class Config:
     This class provides methods for retrieving environment variables and
     appending an encoded secret key to a file.
 
+    Attributes:
+        API_URL (str): Default base URL of the MercadoLibre API, overridden by `MELI_API_URL`.
+
     Methods:
         get_var(name: str) -> str: Retrieve the value of an environment variable.
+        api_url(path: str) -> str: Build the URL of a MercadoLibre API path.
         _append_encoded_key(encoded_key: str) -> None: Append an encoded secret key to a file.
     """
 
+    API_URL: str = "https://api.mercadolibre.com"
+
     @classmethod
     def get_var(self, name: str) -> str:
         """Retrieve the value of an environment variable.
@@ -31,6 +37,21 @@ class Config:
             raise VariableNotFound(f"Variable {name} not found.")
         return v
 
+    @classmethod
+    def api_url(cls, path: str = "") -> str:
+        """Build the URL of a MercadoLibre API path.
+
+        The host is read from the `MELI_API_URL` environment variable when set, e.g. to point the
+        client at a local stand-in server, and defaults to API_URL.
+
+        Args:
+            path (str): The path of the endpoint, starting with a slash.
+
+        Returns:
+            str: The full URL.
+        """
+        return (os.getenv("MELI_API_URL") or cls.API_URL).rstrip("/") + path
+
     async def _append_encoded_key(self, encoded_key: str) -> None:
         """Append an encoded secret key to a file.
 
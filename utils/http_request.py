@@ -1,5 +1,10 @@
-from requests import Response
+from __future__ import annotations
 from request.request_base import Request
+from typing import TYPE_CHECKING
+from utils.config import Config
+
+if TYPE_CHECKING:
+    from requests import Response
 
 class CategoryPredictor(Request):
     """Category predictor request class for MercadoLibre API.
@@ -18,7 +23,7 @@ class CategoryPredictor(Request):
     """
 
     def __init__(self, key: str, credentials: dict) -> None:
-        self.url = f"https://api.mercadolibre.com/sites/MLA/domain_discovery/search?q={key}"
+        self.url = Config.api_url(f"/sites/MLA/domain_discovery/search?q={key}")
         self.headers = credentials
         self.cookies = None
         self.params = None
@@ -40,7 +45,7 @@ class CategoryAttributes(Request):
     """
 
     def __init__(self, category: str, credentials: dict) -> None:
-        self.url = f"https://api.mercadolibre.com/categories/{category}/attributes"
+        self.url = Config.api_url(f"/categories/{category}/attributes")
         self.headers = credentials
         self.cookies = None
         self.params = None
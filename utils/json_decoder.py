@@ -0,0 +1,45 @@
+"""JSON decoding with the fastest decoder available.
+
+orjson is used when installed, then msgspec, then the standard library, so the client works with no extra
+dependency and gets faster when one is added.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    DECODER = "orjson"
+    _loads = orjson.loads
+elif msgspec is not None:
+    DECODER = "msgspec"
+    _loads = msgspec.json.decode
+else:
+    DECODER = "json"
+    _loads = json.loads
+
+def loads(data: bytes or str):
+    """Decode a JSON document.
+
+    Args:
+        data (bytes or str): The JSON document.
+
+    Returns:
+        The decoded document, made of dicts, lists and scalars.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    try:
+        return _loads(data)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(e)
@@ -0,0 +1,75 @@
+"""Deferred imports of heavy modules.
+
+pandas, numpy, pyarrow, aiohttp and cryptography take most of the startup time of the client, and many runs
+never touch some of them. `lazy_import` returns a stand-in that imports the real module the first time one
+of its attributes is read, so importing a module of the client stays cheap. Modules using it declare
+`from __future__ import annotations`, so their annotations do not trigger the import.
+"""
+import importlib
+import importlib.util
+import threading
+
+class LazyModule:
+    """Stand-in for a module, imported on first attribute access.
+
+    Attributes read are cached on the stand-in, so later reads cost no more than on the module itself.
+
+    Attributes:
+        name (str): Name of the module.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize the LazyModule.
+
+        Args:
+            name (str): Name of the module.
+        """
+        self.name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether the module can be imported, checked without importing it."""
+        if self._module is not None:
+            return True
+        try:
+            return importlib.util.find_spec(self.name) is not None
+        except ModuleNotFoundError:
+            return False
+
+    def load(self):
+        """Import the module, once.
+
+        Returns:
+            module: The imported module.
+
+        Raises:
+            ImportError: If the module is not installed.
+        """
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.name)
+        return self._module
+
+    def __getattr__(self, attribute: str):
+        if attribute.startswith("__") and attribute.endswith("__"):
+            raise AttributeError(attribute)
+        value = getattr(self.load(), attribute)
+        setattr(self, attribute, value)
+        return value
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.name!r}{' (loaded)' if self._module is not None else ''}>"
+
+def lazy_import(name: str) -> LazyModule:
+    """A stand-in for a module that imports it on first use.
+
+    Args:
+        name (str): Name of the module, e.g. "pandas" or "pyarrow.parquet".
+
+    Returns:
+        LazyModule: The stand-in.
+    """
+    return LazyModule(name)
@@ -0,0 +1,356 @@
+from contextlib import nullcontext
+from typing import Iterable, Iterator
+import bisect
+import json
+import os
+import threading
+import time
+
+class Histogram:
+    """Distribution of observed values over fixed buckets.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the buckets, in increasing order.
+        counts (list): Observations per bucket; the last entry counts values above every bound.
+        count (int): Number of observations.
+        sum (float): Sum of the observations.
+        max (float): Largest observation.
+    """
+
+    def __init__(self, buckets: tuple) -> None:
+        """Initializes a Histogram instance.
+
+        Args:
+            buckets (tuple): Upper bounds of the buckets, in increasing order.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add an observation.
+
+        Args:
+            value (float): The observed value.
+
+        Returns:
+            None
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated quantile, never above the largest observation.
+        """
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(bound, self.max)
+        return self.max
+
+
+class TimedIterator:
+    """Iterator that times every step of another iterator.
+
+    Attributes:
+        elapsed (float): Seconds spent so far waiting for items, excluding the time spent in `exclude`.
+    """
+
+    def __init__(self, metrics: "Metrics", iterable: Iterable, name: str, labels: dict,
+                 exclude: "TimedIterator" = None) -> None:
+        """Initializes a TimedIterator instance.
+
+        Args:
+            metrics (Metrics): The registry the steps are observed in.
+            iterable (Iterable): The iterable to time.
+            name (str): The name of the histogram.
+            labels (dict): The labels of the histogram.
+            exclude (TimedIterator, optional): An inner timed iterator whose time is not counted.
+        """
+        self._metrics = metrics
+        self._iterator = iter(iterable)
+        self._name = name
+        self._labels = labels
+        self._exclude = exclude
+        self.elapsed = 0.0
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        inner = self._exclude.elapsed if self._exclude is not None else 0.0
+        started = time.perf_counter()
+        try:
+            item = next(self._iterator)
+        finally:
+            spent = time.perf_counter() - started
+            if self._exclude is not None:
+                spent -= self._exclude.elapsed - inner
+            self.elapsed += spent
+        self._metrics.observe(self._name, spent, **self._labels)
+        return item
+
+
+class _Timer:
+    """Context manager that observes the seconds spent in its block."""
+
+    __slots__ = ("_metrics", "_name", "_labels", "_started")
+
+    def __init__(self, metrics: "Metrics", name: str, labels: dict) -> None:
+        self._metrics = metrics
+        self._name = name
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._metrics.observe(self._name, time.perf_counter() - self._started, **self._labels)
+
+
+class Metrics:
+    """Registry of counters and latency histograms for a run of the client.
+
+    Metrics are identified by a name and a set of labels, e.g. `stage_seconds{stage="auth"}`, and can be
+    exported in the Prometheus text format or as a JSON summary. When disabled every method returns right
+    away, so instrumented code pays no more than a method call.
+
+    Attributes:
+        PREFIX (str): Prefix of every exported metric name.
+        BUCKETS (tuple): Default histogram buckets, in seconds.
+        enabled (bool): Whether observations are recorded.
+
+    Methods:
+        inc(name: str, value: float, **labels) -> None: Increase a counter.
+        observe(name: str, value: float, **labels) -> None: Add an observation to a histogram.
+        timer(name: str, **labels): Context manager that observes the seconds spent in its block.
+        timed(iterable: Iterable, name: str, exclude: TimedIterator, **labels) -> Iterable: Time every step of an iterable.
+        summary() -> dict: JSON-serializable summary of every metric.
+        prometheus() -> str: Every metric in the Prometheus text format.
+        write(path: str) -> None: Write the metrics to a file.
+        reset() -> None: Discard every metric.
+    """
+
+    PREFIX: str = "meli_"
+    BUCKETS: tuple = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, enabled: bool = True, buckets: tuple = None) -> None:
+        """Initializes a Metrics instance.
+
+        Args:
+            enabled (bool): Whether observations are recorded.
+            buckets (tuple, optional): Histogram buckets, in seconds.
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets or self.BUCKETS)
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Increase a counter.
+
+        Args:
+            name (str): The name of the counter.
+            value (float): The amount to add.
+            **labels: The labels of the counter.
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Add an observation to a histogram.
+
+        Args:
+            name (str): The name of the histogram.
+            value (float): The observed value, in seconds for latencies.
+            **labels: The labels of the histogram.
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def timer(self, name: str, **labels):
+        """Context manager that observes the seconds spent in its block.
+
+        Args:
+            name (str): The name of the histogram.
+            **labels: The labels of the histogram.
+
+        Returns:
+            A context manager.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def timed(self, iterable: Iterable, name: str, exclude: TimedIterator = None, **labels) -> Iterable:
+        """Time every step of an iterable, e.g. the wait for each page of a search.
+
+        Args:
+            iterable (Iterable): The iterable to time.
+            name (str): The name of the histogram.
+            exclude (TimedIterator, optional): An inner timed iterator, consumed by this one, whose time is
+                not counted.
+            **labels: The labels of the histogram.
+
+        Returns:
+            Iterable: A TimedIterator, or the iterable itself when disabled.
+        """
+        if not self.enabled:
+            return iterable
+        return TimedIterator(self, iterable, name, labels, exclude=exclude)
+
+    def summary(self) -> dict:
+        """JSON-serializable summary of every metric.
+
+        Returns:
+            dict: Counters with their values and histograms with their count, sum, mean, p50, p95 and max.
+        """
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [{
+                        "labels": dict(key),
+                        "count": histogram.count,
+                        "sum": round(histogram.sum, 6),
+                        "mean": round(histogram.sum / histogram.count, 6),
+                        "p50": round(histogram.quantile(0.5), 6),
+                        "p95": round(histogram.quantile(0.95), 6),
+                        "max": round(histogram.max, 6)
+                    } for key, histogram in series.items()]
+                    for name, series in self._histograms.items()
+                }
+            }
+
+    def prometheus(self) -> str:
+        """Every metric in the Prometheus text format.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = self.PREFIX + name
+                lines.append("# TYPE {} counter".format(metric))
+                for key, value in series.items():
+                    lines.append("{}{} {}".format(metric, self._labels(key), value))
+            for name, series in sorted(self._histograms.items()):
+                metric = self.PREFIX + name
+                lines.append("# TYPE {} histogram".format(metric))
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + ("+Inf",), histogram.counts):
+                        cumulative += count
+                        lines.append("{}_bucket{} {}".format(metric, self._labels(key + (("le", bound),)), cumulative))
+                    lines.append("{}_sum{} {}".format(metric, self._labels(key), histogram.sum))
+                    lines.append("{}_count{} {}".format(metric, self._labels(key), histogram.count))
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write the metrics to a file: a JSON summary if the path ends in `.json`, Prometheus text otherwise.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            None
+        """
+        with open(path, "w") as file:
+            if path.endswith(".json"):
+                json.dump(self.summary(), file, indent=2)
+            else:
+                file.write(self.prometheus())
+
+    def reset(self) -> None:
+        """Discard every metric.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+
+    @staticmethod
+    def _labels(key: tuple) -> str:
+        """Format the labels of a series for the Prometheus text format.
+
+        Args:
+            key (tuple): The label pairs of the series.
+
+        Returns:
+            str: The labels between braces, or an empty string.
+        """
+        if not key:
+            return ""
+        return "{" + ",".join('{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"')
+                                                .replace("\n", "\\n")) for name, value in key) + "}"
+
+
+_NULL_TIMER = nullcontext()
+
+_metrics: Metrics = None
+_metrics_lock = threading.Lock()
+
+def get_metrics() -> Metrics:
+    """Return the shared metrics registry, creating it on first use.
+
+    The registry is enabled unless the `METRICS_ENABLED` environment variable is set to 0.
+
+    Returns:
+        Metrics: The registry every component reports to.
+    """
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = Metrics(enabled=os.getenv("METRICS_ENABLED", "1") != "0")
+    return _metrics
+
+def set_metrics(metrics: Metrics) -> None:
+    """Replace the shared metrics registry.
+
+    Args:
+        metrics (Metrics): The registry every component should report to.
+
+    Returns:
+        None
+    """
+    global _metrics
+    with _metrics_lock:
+        _metrics = metrics